@@ -0,0 +1,407 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""bench.py: Reproducible benchmarks for the conway system.
+
+Every benchmark is run for each board size using a fixed seed and the results
+are written as JSON so that runs can be compared over time. Rendering runs on
+SDL's dummy video driver so no window is needed.
+
+Usage:
+    python benchmarks/bench.py run [-o results.json] [--sizes 64,256,1024,4096]
+    python benchmarks/bench.py compare base.json new.json [--threshold 0.1]
+
+compare exits with status 1 if any benchmark is slower than the base by more
+than the threshold.
+"""
+
+import os, sys, time, json, random, itertools, platform, argparse, statistics
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+import pygame
+from conway import conway, camera
+from conway.tiles import tilemap, pixelmap
+from conway.engines import vectorized, bitboard
+
+default_sizes = [64, 256, 1024, 4096]
+default_seed = 1
+default_repeat = 3
+
+_tile_size = (4, 4)
+
+def _board(size: int, seed: int) -> list:
+    """Return a random size x size conway list."""
+    rng = numpy.random.default_rng(seed)
+    return rng.integers(0, 2, (size, size), dtype=numpy.uint8).tolist()
+
+def bench_increment(size: int, seed: int) -> tuple:
+    """Step a generation with the pure Python engine.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    grid = _board(size, seed)
+    return (lambda: conway.increment(grid), None)
+
+def bench_increment_numpy(size: int, seed: int) -> tuple:
+    """Step a generation with the numpy engine.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    arr = vectorized.as_array(_board(size, seed))
+    return (lambda: vectorized.increment(arr), None)
+
+def bench_increment_bitboard(size: int, seed: int) -> tuple:
+    """Step a generation with the bitboard engine.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    board = bitboard.pack(_board(size, seed))
+    return (lambda: bitboard.increment(board), None)
+
+def bench_increment_numpy_highlife(size: int, seed: int) -> tuple:
+    """Step a generation of HighLife with the numpy engine.
+
+    Any rule other than Conway's goes through the lookup table, so this should
+    match increment_numpy.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    arr = vectorized.as_array(_board(size, seed))
+    table = conway.Rule('highlife').table
+    return (lambda: vectorized.increment(arr, table), None)
+
+def bench_increment_bitboard_highlife(size: int, seed: int) -> tuple:
+    """Step a generation of HighLife with the bitboard engine.
+
+    Any rule other than Conway's goes through an expression compiled from its
+    lookup table, so this should match increment_bitboard.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    board = bitboard.pack(_board(size, seed))
+    table = conway.Rule('highlife').table
+    return (lambda: bitboard.increment(board, table), None)
+
+def bench_seed(size: int, seed: int) -> tuple:
+    """Seed a random board.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    return (lambda: conway._seed(size, size, seed), None)
+
+def bench_colorize(size: int, seed: int) -> tuple:
+    """Color a generation into a tile map.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    grid = _board(size, seed)
+    tm = tilemap.TileMap(size, size, 1, _tile_size, conway.dead_cell)
+    return (lambda: conway.colorize(grid, tm), None)
+
+def bench_colorize_lut(size: int, seed: int) -> tuple:
+    """Age a generation and color it through the palette lookup table.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    arr = vectorized.as_array(_board(size, seed))
+    lut = conway.palette()
+    ages = numpy.zeros(arr.shape, dtype=numpy.uint16)
+    out = numpy.empty(arr.shape + (4,), dtype=numpy.uint8)
+
+    def run():
+        conway.age(arr, ages, len(lut) - 1)
+        conway.pixels(ages, lut, out)
+
+    return (run, None)
+
+def bench_tilemap_init(size: int, seed: int) -> tuple:
+    """Create a tile map.
+
+    Chunks are allocated on first access, so allocating the first is included.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    def run():
+        tilemap.TileMap(size, size, 1, _tile_size, conway.living_cell).get_current_chunk()
+
+    return (run, None)
+
+def bench_tilemap_render(size: int, seed: int) -> tuple:
+    """Render every tile of a tile map to a screen the size of the map.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    tm = tilemap.TileMap(size, size, 1, _tile_size, conway.dead_cell)
+    conway.colorize(_board(size, seed), tm)
+
+    screen = pygame.display.set_mode((size * _tile_size[0], size * _tile_size[1]))
+    cam = camera.Camera([0, 0], [size * _tile_size[0], size * _tile_size[1]])
+
+    def dirty():
+        for row in tm.get_current_chunk():
+            for t in row:
+                t.redraw = True
+
+    return (lambda: tm.render(screen, cam), dirty)
+
+def bench_pixelmap_render(size: int, seed: int) -> tuple:
+    """Render a pixel map to a 1024x1024 screen.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    pm = pixelmap.PixelMap(size, size, _tile_size, conway.palette())
+    conway.colorize_pixels(_board(size, seed), pm)
+
+    screen = pygame.display.set_mode((1024, 1024))
+    cam = camera.Camera([0, 0], [1024, 1024])
+
+    def dirty():
+        pm.redraw = True
+
+    return (lambda: pm.render(screen, cam), dirty)
+
+def bench_pixelmap_overview(size: int, seed: int) -> tuple:
+    """Render the whole board to a 1024x1024 screen.
+
+    Once the board has more cells than pixels it is drawn from a density
+    level.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    pm = pixelmap.PixelMap(size, size, (1, 1), conway.palette())
+    cam = camera.Camera([0, 0], [1024, 1024], min(1.0, 1024 / size))
+    pm.level = pm.level_for(cam.zoom)
+    conway.colorize_pixels(vectorized.as_array(_board(size, seed)), pm)
+
+    screen = pygame.display.set_mode((1024, 1024))
+
+    def dirty():
+        pm.redraw = True
+
+    return (lambda: pm.render(screen, cam), dirty)
+
+def bench_colorize_overview(size: int, seed: int) -> tuple:
+    """Color a generation of the whole board for the overview.
+
+    Only the density levels are updated. Two generations are colored in turn,
+    so every run has births and deaths.
+
+    Args:
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+    Returns:
+        tuple: (run, reset) as taken by measure.
+    """
+    pm = pixelmap.PixelMap(size, size, (1, 1), conway.palette())
+    pm.level = pm.level_for(min(1.0, 1024 / size))
+    boards = [vectorized.as_array(_board(size, seed))]
+    boards.append(boards[0].copy())
+    vectorized.increment(boards[1])
+    conway.colorize_pixels(boards[0], pm)
+    turn = itertools.cycle([1, 0])
+
+    return (lambda: conway.colorize_pixels(boards[next(turn)], pm), None)
+
+# name: (setup, largest size run by default)
+benchmarks = {
+    'increment': (bench_increment, 256),
+    'increment_numpy': (bench_increment_numpy, 4096),
+    'increment_bitboard': (bench_increment_bitboard, 4096),
+    'increment_numpy_highlife': (bench_increment_numpy_highlife, 4096),
+    'increment_bitboard_highlife': (bench_increment_bitboard_highlife, 4096),
+    '_seed': (bench_seed, 4096),
+    'colorize': (bench_colorize, 256),
+    'colorize_lut': (bench_colorize_lut, 4096),
+    'tilemap_init': (bench_tilemap_init, 256),
+    'tilemap_render': (bench_tilemap_render, 256),
+    'pixelmap_render': (bench_pixelmap_render, 4096),
+    'pixelmap_overview': (bench_pixelmap_overview, 4096),
+    'colorize_overview': (bench_colorize_overview, 4096),
+}
+
+def measure(setup, size: int, seed: int, repeat: int) -> list:
+    """Time a benchmark.
+
+    Args:
+        setup (callable): Returns (run, reset); reset is called untimed before
+                          every run and may be None.
+        size (int): The width and height of the board.
+        seed (int): Seed for the board.
+        repeat (int): The number of timed runs.
+    Returns:
+        list: Seconds taken by each run.
+    """
+    random.seed(seed)
+    run, reset = setup(size, seed)
+
+    times = []
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    return times
+
+def run(args) -> int:
+    """Run the benchmarks and write the results as JSON.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments of the run command.
+    Returns:
+        int: Exit status.
+    """
+    sizes = [int(i) for i in args.sizes.split(',')]
+    names = args.only.split(',') if args.only else list(benchmarks)
+
+    pygame.display.init()
+    results = []
+    for name in names:
+        setup, max_size = benchmarks[name]
+        for size in sizes:
+            # The pure Python paths (increment, colorize, TileMap) take minutes
+            # and TileMap needs gigabytes at the larger sizes, so by default
+            # they are capped. Use --max-size to lift the caps.
+            if size > (args.max_size or max_size):
+                print("{0:20} {1:>5}  skipped".format(name, size), file=sys.stderr)
+                continue
+
+            times = measure(setup, size, args.seed, args.repeat)
+            results.append({'name': name, 'size': size, 'best': min(times),
+                            'median': statistics.median(times), 'times': times})
+            print("{0:20} {1:>5}  {2:.6f} s".format(name, size, min(times)),
+                  file=sys.stderr)
+    pygame.display.quit()
+
+    report = {'meta': {'python': platform.python_version(),
+                       'platform': platform.platform(),
+                       'numpy': numpy.__version__,
+                       'pygame': pygame.version.ver,
+                       'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                       'seed': args.seed,
+                       'repeat': args.repeat},
+              'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+
+    return 0
+
+def compare(args) -> int:
+    """Print the change of each benchmark between two results files.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments of the compare command.
+    Returns:
+        int: 1 if any benchmark regressed by more than the threshold, else 0.
+    """
+    with open(args.base) as f:
+        base = {(r['name'], r['size']): r for r in json.load(f)['results']}
+    with open(args.new) as f:
+        new = {(r['name'], r['size']): r for r in json.load(f)['results']}
+
+    regressions = 0
+    for key in sorted(base.keys() & new.keys()):
+        change = new[key]['best'] / base[key]['best'] - 1 if base[key]['best'] > 0 else 0
+        flag = ''
+        if change > args.threshold:
+            flag = 'REGRESSION'
+            regressions += 1
+        print("{0:20} {1:>5}  {2:.6f} -> {3:.6f}  {4:+7.1%}  {5}".format(
+            key[0], key[1], base[key]['best'], new[key]['best'], change, flag))
+
+    for key in sorted(base.keys() ^ new.keys()):
+        print("{0:20} {1:>5}  only in {2}".format(key[0], key[1],
+              'base' if key in base else 'new'))
+
+    return 1 if regressions else 0
+
+def main(argv: list) -> int:
+    """Entry point for python benchmarks/bench.py.
+
+    Args:
+        argv (list): Command line arguments.
+    Returns:
+        int: Exit status.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the conway system.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('run', help='Run the benchmarks')
+    p.add_argument('-o', '--output', help='JSON file for the results (default stdout)')
+    p.add_argument('--sizes', default=','.join(map(str, default_sizes)),
+                   help='Board sizes [size,...]')
+    p.add_argument('--only', help='Benchmarks to run [name,...]')
+    p.add_argument('--seed', type=int, default=default_seed)
+    p.add_argument('--repeat', type=int, default=default_repeat)
+    p.add_argument('--max-size', type=int,
+                   help='Largest size for every benchmark, overriding the caps')
+    p.set_defaults(func=run)
+
+    p = sub.add_parser('compare', help='Compare two result files')
+    p.add_argument('base')
+    p.add_argument('new')
+    p.add_argument('--threshold', type=float, default=0.1,
+                   help='Slowdown that counts as a regression (default 0.1)')
+    p.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
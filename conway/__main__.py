@@ -2,9 +2,15 @@
 # -*- coding: utf-8 -*-
 
 import sys, argparse
+
+# The headless runner must not import pygame.
+if len(sys.argv) > 1 and sys.argv[1] == 'run':
+    import runner
+    sys.exit(runner.main(sys.argv[2:]))
+
 import pygame
-import system_manager, camera, conway
-from tiles import tilemap
+import system_manager, camera, conway, runner, patterns, history, worker, timing
+from tiles import tilemap, pixelmap
 from ui import container, label
 
 BLACK = pygame.Color('black')
@@ -14,6 +20,21 @@ WHITE = pygame.Color('white')
 parser = argparse.ArgumentParser(description='Run Conway\'s Game of Life.')
 parser.add_argument('-w', help='Window Size [width,height]')
 parser.add_argument('-c', help='Conway Size [width,height]')
+parser.add_argument('-e', help='Stepping engine', default='python',
+                    choices=runner.engines)
+parser.add_argument('-r', help='Renderer [pixels,tiles]', default='pixels',
+                    choices=['pixels', 'tiles'])
+parser.add_argument('-p', help='RLE or plaintext pattern to start from, centred')
+parser.add_argument('--rule', help='Rule in B/S notation or a name in '
+                                   'conway.rules; defaults to the rule of -p, '
+                                   'or B3/S23')
+parser.add_argument('--boundary', help='How cells beyond the edges are treated',
+                    default='dead', choices=conway.boundaries)
+parser.add_argument('--cycles', help='Stop looping once the system repeats itself',
+                    action='store_true')
+parser.add_argument('-t', help='Show phase timings', action='store_true')
+parser.add_argument('--trace', help='Write phase timings to a Chrome trace, or '
+                                    'JSON lines if the name ends in .jsonl')
 
 args = parser.parse_args()
 window = args.w.split(',')
@@ -26,9 +47,8 @@ window[1] = int(window[1])
 
 tile_size = 32 # Adjust tile size. Only one var needed since tiles are square.
 
-# TODO Remove and replace with movement (camera) system.
-# Scaling drops FPS to ~30.
-# Scale tiles so they fit the entire Surface.
+# Scale tiles so they fit the entire Surface. Boards still too large at a
+# pixel per cell are zoomed out, which draws them from their density levels.
 width = cw[0] * tile_size
 height = cw[1] * tile_size
 if width < window[0] or height < window[1]:
@@ -40,8 +60,8 @@ if width < window[0] or height < window[1]:
         height = cw[1] * tile_size
 elif width > window[0] or height > window[1]:
     # Tiles are going to be square so only one check for limit.
-    while (width > window[0] and height > window[1]) and tile_size > 4:
-        tile_size = tile_size / 4
+    while (width > window[0] and height > window[1]) and tile_size > 1:
+        tile_size = tile_size // 2
 
         width = cw[0] * tile_size
         height = cw[1] * tile_size
@@ -51,14 +71,78 @@ sm = system_manager.SystemManager((window[0], window[1]), pygame.RESIZABLE, "Con
 sm.add_font("freesansbold", pygame.font.Font('freesansbold.ttf', 18))
 font = sm.get_font("freesansbold")
 
-conway_offset = 20
+timer = timing.PhaseTimer(args.t, tracing=args.trace is not None)
+sm.timer = timer
+
+# The phase timings take a second row of the UI.
+conway_offset = 40 if args.t else 20
 yw_offset = window[1] - conway_offset
-camera = camera.Camera([0, 0], [window[0], yw_offset])
+zoom = min(1.0, window[0] / width, yw_offset / height)
+camera = camera.Camera([0, 0], [window[0], yw_offset], zoom)
 
 # Setup and configure Conway state.
-cw_state = conway.State(cw[0], cw[1])
-tm = tilemap.TileMap(cw[0], cw[1], 1, (int(tile_size), int(tile_size)), conway.living_cell)
-conway.colorize(cw_state.conway, tm)
+cw_grid = None
+rule = args.rule or 'B3/S23'
+if args.p is not None:
+    with open(args.p) as f:
+        pattern = patterns.read(f)
+        cw_grid = [[0] * cw[0] for _ in range(cw[1])]
+        patterns.load(pattern, cw_grid, ((cw[0] - pattern.width) // 2,
+                                         (cw[1] - pattern.height) // 2))
+        rule = args.rule or pattern.rule
+try:
+    cw_state = conway.State(cw[0], cw[1], cw_grid, rule=rule, boundary=args.boundary)
+    if args.cycles:
+        cw_state.track_cycles()
+    engine = runner.make_engine(cw_state, args.e)
+except ValueError as e:
+    parser.error(str(e))
+# Pixels are colored by the stepping worker; tiles are not thread safe and
+# are colored by the loop below.
+if args.r == 'pixels':
+    tm = pixelmap.PixelMap(cw[0], cw[1], (int(tile_size), int(tile_size)),
+                           conway.palette())
+    tm.level = tm.level_for(camera.zoom)
+    colorizer = conway.colorize_pixels
+else:
+    tm = tilemap.TileMap(cw[0], cw[1], 1, (int(tile_size), int(tile_size)),
+                         conway.living_cell)
+    colorizer = None
+
+# The sparse universe is unbounded, so its past cannot be held as boards.
+past = history.History() if args.e != 'sparse' else None
+
+def record(state):
+    if past is not None:
+        past.record(state.conway, state.generations)
+
+def rewind():
+    global cw_state, engine
+    stepper.wait(cancel=True)
+    generation = cw_state.generations - 1
+    if past is None or generation not in past:
+        return
+
+    if args.e == 'parallel':
+        cw_state.conway = None
+        engine.close()
+    cw_state = conway.State(cw[0], cw[1], past.get(generation).tolist(),
+                            generation=generation, rule=cw_state.rule,
+                            boundary=cw_state.boundary)
+    if args.cycles:
+        cw_state.track_cycles()
+    engine = runner.make_engine(cw_state, args.e)
+    stepper.state = cw_state
+    stepper.engine = engine
+    stepper.publish()
+
+record(cw_state)
+
+# Generations are stepped in the background; the loop below draws the latest
+# one finished.
+stepper = worker.SteppingWorker(cw_state, engine, record, timer, colorizer,
+                                tm if colorizer is not None else None)
+stepper.publish()
 
 # Create UI
 ui_container = container.SurfaceContainer((0, 0, window[0], conway_offset))
@@ -72,15 +156,25 @@ gen_label = label.Label(str(cw_state.generations), (125, 0, 16, 16), font,
                         WHITE, BLACK)
 liv_label = label.Label(str(cw_state.living), (400, 0, 16, 16), font,
                         WHITE, BLACK)
-fps_label = label.Label(str(sm.clock.get_fps()), (650, 0, 16, 16), font,
+fps_label = label.Label("%.1f" % sm.clock.get_fps(), (650, 0, 16, 16), font,
                         WHITE, BLACK)
 
 ui_container.add(gen_label)
 ui_container.add(liv_label)
 ui_container.add(fps_label)
 
+# p50/p95/max of each phase in milliseconds, refreshed every second.
+hud_label = None
+if args.t:
+    hud_label = label.Label("", (0, 20, 16, 16), font, WHITE, BLACK)
+    ui_container.add(hud_label)
+    pygame.time.set_timer(pygame.USEREVENT+2, 1000)
+
 sm.add_ui_objects(ui_container, cw_container)
 
+pan = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0),
+       pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+
 loop = False
 while sm.running:
     for event in pygame.event.get():
@@ -89,12 +183,16 @@ while sm.running:
         elif event.type == pygame.VIDEORESIZE:
             sm.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
             camera.resize((event.w, event.h))
+            sm.redraw_all()
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 sm.running = False
             elif event.key == pygame.K_RETURN:
                 if not loop:
-                    conway.update(cw_state, tm)
+                    stepper.request()
+            elif event.key == pygame.K_BACKSPACE:
+                if not loop:
+                    rewind()
             elif event.key == pygame.K_SPACE:
                 if not loop:
                     loop = True
@@ -102,24 +200,53 @@ while sm.running:
                 else:
                     loop = False
                     pygame.time.set_timer(pygame.USEREVENT+1, 0)
-                conway.update(cw_state, tm)
+                stepper.request()
+            elif event.key in pan and args.e == 'sparse':
+                stepper.wait(cancel=True)
+                view = cw_state.conway.view
+                cw_state.conway.move_view(view[0] + pan[event.key][0],
+                                          view[1] + pan[event.key][1])
+                stepper.publish()
         elif event.type == pygame.USEREVENT+1:
-            if loop:
-                conway.update(cw_state, tm)
-
-    if cw_state.living == 0:
-        loop = False
-
-    gen_label.text = str(cw_state.generations)
-    liv_label.text = str(cw_state.living)
-    fps_label.text = str(sm.clock.get_fps())
+            # Skip a tick rather than queue generations behind a slow one.
+            if loop and stepper.idle:
+                stepper.request()
+        elif event.type == pygame.USEREVENT+2:
+            hud_label.text = timer.summary()
+
+    frame = stepper.latest()
+    if frame is not None:
+        if frame.colors is not None:
+            tm.show(frame.colors)
+        else:
+            with timer.time('colorize'):
+                conway.colorize(frame.cells, tm)
+        gen_label.text = str(frame.generation)
+        liv_label.text = str(frame.living)
+
+        # Stop once the system has died out or, with --cycles, settled into a
+        # still life or oscillator.
+        if frame.living == 0 or frame.period:
+            loop = False
+
+    # Labels only redraw when their text changes, which get_fps does every
+    # ten frames.
+    fps_label.text = "%.1f" % sm.clock.get_fps()
 
     # Current, version of Tilemap handles rendering. Therefore, render must
     # be performed before main render which handles the bliting.
-    tm.render(cw_container.surface, camera)
+    with timer.time('render'):
+        cw_container.add_dirty(tm.render(cw_container.surface, camera))
 
     sm.render()
     sm.clock.tick(sm.fps)
 
+stepper.close()
+if args.trace is not None:
+    timer.export(args.trace)
+if args.e == 'parallel':
+    cw_state.conway = None
+    engine.close()
+
 sm.quit()
 sys.exit()
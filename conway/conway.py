@@ -1,16 +1,92 @@
 # -*- coding: utf-8 -*-
 """conway.py: Implementation of Conway's Game of Life.
 
+The module does not depend on pygame so that it can be used without a display;
+colors are RGBA tuples which tiles.tile.Tile converts to pygame.Color.
+
 Attributes:
-    living_cell (pygame.Color): The initial color of a cell when it becomes alive.
-    dead_cell (pygame.Color): The color of a non-living cell.
+    living_cell (tuple): The initial RGBA color of a cell when it becomes alive.
+    dead_cell (tuple): The RGBA color of a non-living cell.
+    rules (dict): Names of well known rules and their B/S notation.
+    life (Rule): Conway's rule, B3/S23.
+    boundaries (list): How cells beyond the edges of the board are treated:
+                       'dead' cells, 'torus' wrapping round to the opposite
+                       edge, or 'reflect' mirroring the edge cells.
 """
 
-import sys, random
-import pygame
+import random, collections, re
+import numpy
+
+living_cell = (150, 0, 0, 0)
+dead_cell = (0, 0, 0, 0)
+
+rules = {'life': 'B3/S23', 'highlife': 'B36/S23', 'daynight': 'B3678/S34678',
+         'seeds': 'B2/S', 'replicator': 'B1357/S1357', 'maze': 'B3/S12345',
+         'lifewithoutdeath': 'B3/S012345678'}
+
+boundaries = ['dead', 'torus', 'reflect']
+
+_halves = 0.5 ** numpy.arange(9)
+_bs = re.compile(r'^B([0-8]*)/S([0-8]*)$|^S([0-8]*)/B([0-8]*)$', re.IGNORECASE)
+_sb = re.compile(r'^([0-8]*)/([0-8]*)$')
+
+class Rule(object):
+    """An outer-totalistic rule.
+
+    The rule is compiled once into a lookup table indexed by the state of a
+    cell and its number of living neighbors, which every engine indexes in
+    place of hard-coded comparisons.
+
+    Attributes:
+        birth (frozenset): Neighbor counts at which a dead cell is born.
+        survival (frozenset): Neighbor counts at which a living cell survives.
+        table (numpy.ndarray): Read-only uint8 array of shape (2, 9);
+                               table[alive][count] is the next state of a cell.
+        lookup (list): table as nested lists for the pure Python engines.
+
+    Args:
+        notation (str): B/S notation such as 'B36/S23' in either order and any
+                        case, S/B notation such as '23/36', or a name in rules.
+    Errors:
+        ValueError: If notation is not a rule.
+    """
+
+    def __init__(self, notation: str):
+        spec = rules.get(notation.strip().lower(), notation).strip()
+        match = _bs.match(spec)
+        if match is not None:
+            birth = match.group(1) if match.group(1) is not None else match.group(4)
+            survival = match.group(2) if match.group(2) is not None else match.group(3)
+        else:
+            match = _sb.match(spec)
+            if match is None:
+                raise ValueError(notation + " is not a rule.")
+            survival, birth = match.groups()
+
+        self.birth = frozenset(int(i) for i in birth)
+        self.survival = frozenset(int(i) for i in survival)
+
+        self.table = numpy.zeros((2, 9), dtype=numpy.uint8)
+        self.table[0, list(self.birth)] = 1
+        self.table[1, list(self.survival)] = 1
+        self.table.flags.writeable = False
+        self.lookup = self.table.tolist()
 
-living_cell = pygame.Color(150, 0, 0, 0)
-dead_cell = pygame.Color(0, 0, 0, 0)
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Rule) and self.birth == other.birth and \
+               self.survival == other.survival
+
+    def __hash__(self) -> int:
+        return hash((self.birth, self.survival))
+
+    def __str__(self) -> str:
+        return 'B' + ''.join(str(i) for i in sorted(self.birth)) + \
+               '/S' + ''.join(str(i) for i in sorted(self.survival))
+
+    def __repr__(self) -> str:
+        return 'Rule(' + repr(str(self)) + ')'
+
+life = Rule('B3/S23')
 
 class State(object):
     """Class to hold the state of the environment.
@@ -19,20 +95,40 @@ class State(object):
         conway (list): 2D list containing the current state of the conway en-
                        vironment.
         living (int): The number of living cells.
+        cycles (Cycles): The cycle detector, None until track_cycles is called.
+        rule (Rule): The rule the system is stepped with.
+        boundary (str): How cells beyond the edges are treated; one of
+                        boundaries.
     Args:
         width  (int): The width for the conway data.
         height (int): The height for the conway data.
+        conway (list, numpy.ndarray): Initial conway data; if None a random
+                                      environment is created with _seed.
+        seed   (int): Seed used for the random environment.
+        generation (int): The generation of the initial conway data.
+        rule (Rule, str): The rule, or its notation as accepted by Rule.
+        boundary (str): One of boundaries.
+    Errors:
+        ValueError: If rule is not a rule or boundary not a boundary.
     """
 
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, conway=None,
+                 seed: int = None, generation: int = 1, rule=life,
+                 boundary: str = 'dead'):
+        if boundary not in boundaries:
+            raise ValueError(str(boundary) + " is not a boundary.")
+
         self._width = width
         self._height = height
-        self._generations = 1
+        self._generations = generation
         self.living = 0
-        self.conway = _seed(self._width, self._height)
+        self.cycles = None
+        self.rule = rule if isinstance(rule, Rule) else Rule(rule)
+        self.boundary = boundary
+        self.conway = conway if conway is not None else \
+                      _seed(self._width, self._height, seed)
 
-        for i in self.conway:
-            self.living += i.count(1)
+        self.living = int(numpy.count_nonzero(self.conway))
 
     @property
     def width(self) -> int:
@@ -61,14 +157,189 @@ class State(object):
         """
         return self._generations
 
-    def inc_generation(self):
+    @property
+    def period(self) -> int:
+        """Return the period the system is repeating with.
+
+        1 for a still life, 0 if no repeat has been seen or cycles are not
+        tracked.
+
+        Returns:
+          int
+        """
+        return self.cycles.period if self.cycles is not None else 0
+
+    def track_cycles(self, history: int = 64):
+        """Start detecting when the system repeats itself.
+
+        Post:
+            cycles is set.
+
+        Args:
+            history (int): The number of recent generations remembered; cycles
+                           with a longer period are not detected.
+        """
+        self.cycles = Cycles(self._width, self._height, history)
+        self.cycles.update(self.conway, self._generations)
+
+    def inc_generation(self, amount: int = 1):
         """Increment the generation counter.
 
         Post:
             _generations is modified.
+            cycles is updated if tracking.
+
+        Args:
+            amount (int): The number of generations that have passed.
         """
-        self._generations += 1
+        self._generations += amount
+
+        if self.cycles is not None:
+            # Generations skipped over were never hashed.
+            if amount != 1:
+                self.cycles.clear()
+            self.cycles.update(self.conway, self._generations)
+
+class Cycles(object):
+    """Detects still lifes and oscillators with a board hash.
+
+    Every cell has a 64 bit Zobrist key and the hash of a board is the XOR of
+    the keys of its living cells. Keys are not stored: the key of the cell at
+    (x, y) is the output of splitmix64 for its coordinates, so the detector
+    uses memory in proportion to its history rather than the board. A bounded
+    history of recent hashes gives the period when a hash repeats.
+
+    Engines report the cells born or died in a generation through flip, which
+    XORs only their keys into the hash; runner.make_engine hands flip to the
+    engine of a state tracking cycles. A board whose changes were not reported
+    is hashed whole.
 
+    Boards with a coordinates() method returning the (xs, ys) of every living
+    cell, such as engines.sparse.SparseUniverse, are hashed from those, which
+    covers the whole of an unbounded universe and not just its view.
+
+    Attributes:
+        hash (int): The hash of the last board seen.
+        period (int): The number of generations since the last board was last
+                      seen, or 0 if it is not in the history.
+        found (tuple): (generation, period) of the first repeat seen, or None.
+
+    Args:
+        width  (int): The width of the conway data.
+        height (int): The height of the conway data.
+        history (int): The number of recent generations remembered.
+        seed (int): Seed for the Zobrist keys.
+    """
+
+    def __init__(self, width: int, height: int, history: int = 64,
+                 seed: int = 0):
+        self._width = width
+        self._seed = seed
+        self._history = history
+        self._seen = {}
+        self._order = collections.deque()
+        self.hash = 0
+        self.period = 0
+        self.found = None
+        self._flipped = False
+
+    def keys(self, xs: numpy.ndarray, ys: numpy.ndarray) -> numpy.ndarray:
+        """Return the Zobrist keys of cells.
+
+        Args:
+            xs (numpy.ndarray): Integer x of the cells.
+            ys (numpy.ndarray): Integer y of the cells.
+        Returns:
+            numpy.ndarray: uint64 array the shape of xs.
+        """
+        mask = numpy.uint64(0xffffffff)
+        xy = (numpy.asarray(ys).astype(numpy.uint64) & mask) << numpy.uint64(32)
+        xy |= numpy.asarray(xs).astype(numpy.uint64) & mask
+        return _splitmix64(xy, self._seed)
+
+    def flip(self, xs: numpy.ndarray, ys: numpy.ndarray):
+        """XOR the keys of cells that were born or died into the hash.
+
+        Post:
+            hash is modified.
+
+        Args:
+            xs (numpy.ndarray): Integer x of the cells.
+            ys (numpy.ndarray): Integer y of the cells.
+        """
+        self.hash ^= _xor(self.keys(xs, ys))
+        self._flipped = True
+
+    def update(self, conway, generation: int) -> int:
+        """Record the board of a new generation and look for a repeat.
+
+        The hash is taken as is if the changes since the last board were
+        flipped into it, and computed from conway otherwise.
+
+        Args:
+            conway (list, numpy.ndarray): conway data; any board numpy can
+                                          convert, or with coordinates(), will
+                                          do.
+            generation (int): The generation of the board.
+        Returns:
+            int: period is returned.
+        """
+        if self._flipped:
+            self._flipped = False
+        elif hasattr(conway, 'coordinates'):
+            self.hash = _xor(self.keys(*conway.coordinates()))
+        else:
+            ys, xs = numpy.divmod(numpy.flatnonzero(numpy.asarray(conway)), self._width)
+            self.hash = _xor(self.keys(xs, ys))
+
+        seen = self._seen.get(self.hash)
+        self.period = generation - seen if seen is not None else 0
+        if self.period and self.found is None:
+            self.found = (generation, self.period)
+
+        self._seen[self.hash] = generation
+        self._order.append((generation, self.hash))
+        if len(self._order) > self._history:
+            old, key = self._order.popleft()
+            if self._seen.get(key) == old:
+                del self._seen[key]
+
+        return self.period
+
+    def clear(self):
+        """Forget the history, keeping the hash and found.
+
+        Post:
+            period is 0.
+        """
+        self._seen.clear()
+        self._order.clear()
+        self.period = 0
+
+
+def _splitmix64(values: numpy.ndarray, seed: int = 0) -> numpy.ndarray:
+    """Return the splitmix64 outputs for values of its counter.
+
+    Args:
+        values (numpy.ndarray): uint64 counter values.
+        seed (int): Seed of the generator.
+    Returns:
+        numpy.ndarray: uint64 array the shape of values.
+    """
+    z = (values + numpy.uint64(1)) * numpy.uint64(0x9E3779B97F4A7C15) + numpy.uint64(seed)
+    z = (z ^ (z >> numpy.uint64(30))) * numpy.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> numpy.uint64(27))) * numpy.uint64(0x94D049BB133111EB)
+    return z ^ (z >> numpy.uint64(31))
+
+def _xor(keys: numpy.ndarray) -> int:
+    """Return the XOR of keys.
+
+    Args:
+        keys (numpy.ndarray): uint64 array.
+    Returns:
+        int: 0 if keys is empty.
+    """
+    return int(numpy.bitwise_xor.reduce(keys)) if keys.size else 0
 
 def colorize(conway: list, color_grid: list) -> list:
     """Sets colors for the conway system.
@@ -84,164 +355,392 @@ def colorize(conway: list, color_grid: list) -> list:
     Returns:
         list: color_grid is returned
     """
+    chunk = color_grid.get_current_chunk()
     for y in range(0, len(conway)):
-        for x in range(0, len(conway[y])):
-            current = color_grid.get_current_chunk()[y][x]
-            if conway[y][x] == 0:
-                if current.color != dead_cell:
+        row = conway[y]
+        for x in range(0, len(row)):
+            current = chunk[y][x]
+            # Tiles are compared by their RGBA key, not a new pygame.Color.
+            r, g, b, a = current.key
+            if row[x] == 0:
+                if current.key != dead_cell:
                     current.color = dead_cell
             else:
-                if current.color == dead_cell:
+                if current.key == dead_cell:
                     current.color = living_cell
-                else:
-                    color = current.color
-                    if color.r < 255:
-                        ncolor = pygame.Color(color.r+1, color.g, color.b, color.a)
-                        current.color = ncolor
-                    elif color.g < 255:
-                        ncolor = pygame.Color(color.r, color.g+1, color.b, color.a)
-                        current.color = ncolor
-                    elif color.b < 255:
-                        ncolor = pygame.Color(color.r, color.g, color.b+1, color.a)
-                        current.color = ncolor
+                elif r < 255:
+                    current.color = (r+1, g, b, a)
+                elif g < 255:
+                    current.color = (r, g+1, b, a)
+                elif b < 255:
+                    current.color = (r, g, b+1, a)
 
     return color_grid
 
-def increment(conway: list) -> int:
-    """Increment conway by one.
+def palette(living: tuple = living_cell, dead: tuple = dead_cell) -> numpy.ndarray:
+    """Build the lookup table mapping the age of a cell to its color.
 
-    Post
-        Arg conway is modified.
+    Index 0 holds the dead color and index 1 the color of a newly born cell.
+    Each further generation raises red, then green, then blue by one, as
+    colorize does, until all three reach 255.
 
     Args:
-      conway (list): conway list
+        living (tuple): RGBA color of a newly born cell.
+        dead (tuple): RGBA color of a dead cell.
     Returns:
-      int: The number of living cells.
+        numpy.ndarray: uint8 array of shape (ages, 4).
     """
-    def alive(arr: list, xy: tuple) -> bool:
-        """Check if a cell is alive.
+    steps = [255 - living[0], 255 - living[1], 255 - living[2]]
+    age = numpy.arange(0, sum(steps) + 1)
 
-        Alive is defined as currently living (1) or dying (-1); where dying
-        indicates a temporary indicator.
+    lut = numpy.empty((len(age) + 1, 4), dtype=numpy.uint8)
+    lut[0] = dead
+    lut[1:, 0] = living[0] + numpy.minimum(age, steps[0])
+    lut[1:, 1] = living[1] + numpy.clip(age - steps[0], 0, steps[1])
+    lut[1:, 2] = living[2] + numpy.clip(age - steps[0] - steps[1], 0, steps[2])
+    lut[1:, 3] = living[3]
 
-        Args:
-            arr (list): conway list
-            xy (tuple): Position in arr defined in (x,y)
-        Returns:
-          boolean
-        """
-        return True if arr[xy[1]][xy[0]] == -1 or arr[xy[1]][xy[0]] == 1 else False
+    return lut
 
-    def num_neighbors(arr: list, xy: tuple) -> int:
-        """Return the number of living neighbors.
+def age(conway, ages: numpy.ndarray, oldest: int,
+        changed: numpy.ndarray = None) -> numpy.ndarray:
+    """Update the age of every cell.
 
-        Args:
-            arr (list): conway list
-            xy (tuple): Position in arr using (x,y) values.
-        Returns:
-          int
-        """
-        value = 0
+    Ages count the generations a cell has been alive, starting at 1, and stop
+    at oldest; dead cells have an age of 0.
 
-        for i in _moore_neighbors(arr, xy):
-            if alive(conway, i):
-                value += 1
+    Post:
+        Arg ages is modified.
+        Arg changed is modified.
 
-        return value
+    Args:
+        conway (list, numpy.ndarray): conway data
+        ages (numpy.ndarray): uint16 array the same shape as conway.
+        oldest (int): The largest age, normally len(palette()) - 1.
+        changed (numpy.ndarray): Optional bool array the same shape as conway;
+                                 cells whose age, and so color, changes are
+                                 set to True.
+    Returns:
+        numpy.ndarray: ages is returned.
+    """
+    alive = numpy.asarray(conway, dtype=bool)
+    if changed is not None:
+        changed |= numpy.where(alive, ages < oldest, ages > 0)
+    numpy.add(ages, 1, out=ages, where=alive & (ages < oldest))
+    ages[~alive] = 0
+
+    return ages
+
+def pixels(ages: numpy.ndarray, lut: numpy.ndarray, out: numpy.ndarray = None) -> numpy.ndarray:
+    """Map ages to colors.
+
+    Args:
+        ages (numpy.ndarray): uint16 array of ages.
+        lut (numpy.ndarray): Lookup table as built by palette.
+        out (numpy.ndarray): Optional uint8 array of shape (height, width, 4)
+                             to write into.
+    Returns:
+        numpy.ndarray: uint8 RGBA array of shape (height, width, 4).
+    """
+    return numpy.take(lut, ages, axis=0, out=out)
+
+def colorize_pixels(conway, pixel_map, colors=None) -> object:
+    """Sets colors for the conway system on a pixel map.
+
+    The counterpart of colorize for tiles.pixelmap.PixelMap; ages every cell,
+    maps the ages through the pixel map's palette and brings its density levels
+    up to date with the cells born and died. When the pixel map asks for a
+    density level, the counts of that level are copied instead and the cells
+    are neither aged nor colored; ages start over once it is zoomed back in.
+
+    Colors other than the pixel map's own can be filled, e.g. on a
+    worker.SteppingWorker's thread, and handed to the pixel map with
+    PixelMap.show. Their changes are only those of this generation, where the
+    pixel map's own gather changes until drawn.
+
+    Post:
+        Arg pixel_map is modified.
+        Arg colors is modified.
+
+    Args:
+        conway (list, numpy.ndarray): conway data
+        pixel_map (tiles.pixelmap.PixelMap)
+        colors (tiles.pixelmap.Colors): Colors to fill; None for the pixel
+                                        map's own, which are then redrawn.
+    Returns:
+        tiles.pixelmap.PixelMap: pixel_map is returned
+    """
+    own = colors is None
+    if own:
+        colors = pixel_map.colors
+        pixel_map.redraw = True
+
+    alive = numpy.asarray(conway, dtype=bool)
+    pixel_map.density.update(alive, pixel_map.alive)
+    pixel_map.alive[...] = alive
+
+    level = pixel_map.level
+    colors.level = level
+    if level > 0:
+        pixel_map.aged = False
+        counts = pixel_map.density.level(level)
+        if colors.counts is None or colors.counts.shape != counts.shape or \
+           colors.counts.dtype != counts.dtype:
+            colors.counts = counts.copy()
+        else:
+            colors.counts[...] = counts
+        return pixel_map
+
+    if not own:
+        colors.changed[...] = False
+    if not pixel_map.aged:
+        pixel_map.ages[...] = 0
+        colors.changed[...] = True
+        pixel_map.aged = True
+    age(alive, pixel_map.ages, len(pixel_map.lut) - 1, colors.changed)
+    pixels(pixel_map.ages, pixel_map.lut, colors.buffer)
+
+    return pixel_map
+
+def increment(conway: list, rule: Rule = life, boundary: str = 'dead',
+              on_change=None) -> int:
+    """Increment conway by one.
+
+    Post
+        Arg conway is modified.
+
+    Args:
+      conway (list): conway list
+      rule (Rule): The rule to step with.
+      boundary (str): How cells beyond the edges are treated; one of
+                      boundaries.
+      on_change (callable): Called with the xs and ys of the cells that were
+                            born or died, e.g. Cycles.flip.
+    Returns:
+      int: The number of living cells.
+    """
+    bordered = _bordered(conway, boundary)
+    lookup = rule.lookup
 
-    for y in range(0, len(conway)):
-        for x in range(0, len(conway[y])):
-            if alive(conway, (x, y)) and \
-               (num_neighbors(conway, (x, y)) <= 1 or num_neighbors(conway, (x, y)) > 3):
-                conway[y][x] = -1
-            elif not alive(conway, (x, y)) and num_neighbors(conway, (x, y)) == 3:
-                conway[y][x] = 2
-
-    # Check for number of living cells while flipping the cells to their proper
-    # states.
     living = 0
     for y in range(0, len(conway)):
-        for x in range(0, len(conway[y])):
-            if conway[y][x] == -1:
-                conway[y][x] = 0
-            elif conway[y][x] == 2:
-                conway[y][x] = 1
-                living += 1
-            elif conway[y][x] == 1:
-                living += 1
+        above, row, below = bordered[y], bordered[y+1], bordered[y+2]
+        out = conway[y]
+        for x in range(0, len(out)):
+            count = above[x] + above[x+1] + above[x+2] + row[x] + row[x+2] + \
+                    below[x] + below[x+1] + below[x+2]
+            cell = lookup[row[x+1]][count]
+            out[x] = cell
+            living += cell
+
+    if on_change is not None:
+        # The bordered rows still hold the last generation.
+        xs, ys = [], []
+        for y in range(0, len(conway)):
+            old, new = bordered[y+1][1:-1], conway[y]
+            if old != new:
+                changed = [x for x in range(len(new)) if old[x] != new[x]]
+                xs.extend(changed)
+                ys.extend([y] * len(changed))
+        on_change(numpy.array(xs, dtype=numpy.int64), numpy.array(ys, dtype=numpy.int64))
 
     return living
 
-def update(state: State, color_grid: list) -> tuple:
+def update(state: State, color_grid: list, engine=None,
+           colorizer=colorize) -> tuple:
     """Update the conway state.
 
     Pre:
-        color_grid must be the list as defined in tiles.tilemap.
+        color_grid must be of the type expected by colorizer.
+        state.conway must be of the type expected by engine.
     Post:
         state is modified
         color_grid is modified.
 
     Args:
         state (conway.State): The conway state
+        color_grid (list): color list.
+        engine (callable): Function that increments the conway data by one
+                           and returns the number of living cells, e.g. as
+                           returned by runner.make_engine. Default=increment
+                           with state.rule and state.boundary
+        colorizer (callable): Function that sets the colors of color_grid,
+                              colorize or colorize_pixels.
     Returns:
         tuple (conway.State, list): State and color_grid are returned.
     """
-    state.living = increment(state.conway)
-    colorize(state.conway, color_grid)
+    if engine is None:
+        state.living = increment(state.conway, state.rule, state.boundary)
+    else:
+        state.living = engine(state.conway)
+    colorizer(state.conway, color_grid)
     state.inc_generation()
 
     return (state, color_grid)
 
-def _moore_neighbors(arr: list, xy: tuple) -> tuple:
-    """Obtain a list of Moore's neighbours.
+def _bordered(conway: list, boundary: str) -> list:
+    """Copy conway with a border of one cell on every side.
 
-    Pre:
-        arr must be a 2D list.
+    The border holds what the neighbors beyond each edge are for the boundary:
+    dead cells, the cells at the opposite edge for torus, or the edge cells
+    themselves for reflect.
+
+    Args:
+        conway (list): conway list
+        boundary (str): One of boundaries.
+    Returns:
+        list: 2D list of height + 2 rows of width + 2 cells holding 0 or 1.
+    Errors:
+        ValueError: If boundary is not one of boundaries.
+    """
+    rows = [[0] + [1 if cell == 1 else 0 for cell in row] + [0] for row in conway]
+
+    if boundary == 'dead':
+        return [[0] * len(rows[0])] + rows + [[0] * len(rows[0])]
+    elif boundary == 'torus':
+        for row in rows:
+            row[0], row[-1] = row[-2], row[1]
+        return [rows[-1][:]] + rows + [rows[0][:]]
+    elif boundary == 'reflect':
+        for row in rows:
+            row[0], row[-1] = row[1], row[-2]
+        return [rows[0][:]] + rows + [rows[-1][:]]
+
+    raise ValueError(str(boundary) + " is not a boundary.")
+
+def soup(width: int, height: int, seed: int = None, band: int = 256):
+    """Generate a random environment in bands of rows.
+
+    The environment has the same statistics as the one originally built by
+    _seed: every cell draws a value in [0, 1), cells with a value <= 0.5 are
+    dead, and each neighbor holding a greater value kills a cell with
+    probability 0.5 unless that neighbor was itself killed first. _seed
+    visited cells column by column, so the order is modelled by two passes over
+    the neighbors visited earlier before the final pass over all neighbors,
+    giving a density of about 0.233.
+
+    Every row draws from its own stream derived from seed, so the result does
+    not depend on band and only band + 6 rows of values are held at a time.
+
+    Args:
+        width  (int): The width of the environment.
+        height (int): The height of the environment.
+        seed (int): Seed for the random number generator; None for a seed from
+                    the random module.
+        band (int): The number of rows per band.
+    Yields:
+        tuple (int, numpy.ndarray): The first row of the band and a uint8 array
+                                    of shape (rows, width).
+    """
+    if seed is None:
+        seed = random.getrandbits(63)
+
+    for y0 in range(0, height, band):
+        y1 = min(y0 + band, height)
+        top = max(y0 - 3, 0)
+        bottom = min(y1 + 3, height)
+
+        draws = numpy.stack([numpy.random.default_rng([seed, y]).random((4, width))
+                             for y in range(top, bottom)], axis=1)
+        values, first, second, final = draws
+
+        alive = numpy.ones(values.shape, dtype=bool)
+        alive = first < _halves[_greater(values, alive, True)]
+        alive = second < _halves[_greater(values, alive, True)]
+        alive = (values > 0.5) & (final < _halves[_greater(values, alive, False)])
+
+        yield (y0, alive[y0-top:y1-top].astype(numpy.uint8))
+
+def uniform(width: int, height: int, density: float, seed: int = None,
+            band: int = 256):
+    """Generate an environment where each cell is alive with a probability.
 
     Args:
-        arr (list): 2d list.
-        xy  (tuple): (x,y) values coresponding to the x,y values in arr.
+        width  (int): The width of the environment.
+        height (int): The height of the environment.
+        density (float): The probability of a cell being alive.
+        seed (int): Seed for the random number generator; None for a seed from
+                    the random module.
+        band (int): The number of rows per band.
+    Yields:
+        tuple (int, numpy.ndarray): The first row of the band and a uint8 array
+                                    of shape (rows, width).
+    """
+    if seed is None:
+        seed = random.getrandbits(63)
+
+    for y0 in range(0, height, band):
+        y1 = min(y0 + band, height)
+        rows = [numpy.random.default_rng([seed, y]).random(width) < density
+                for y in range(y0, y1)]
+
+        yield (y0, numpy.array(rows, dtype=numpy.uint8).reshape(y1 - y0, width))
+
+def stamp(conway, pattern, xy: tuple):
+    """Copy a pattern into conway with its top-left corner at xy.
+
+    Post:
+        Arg conway is modified.
+
+    Args:
+        conway (list, numpy.ndarray): conway list
+        pattern (list, numpy.ndarray): 2D data holding 0 or 1.
+        xy (tuple): (x,y) of the top-left corner of the pattern.
     Returns:
-        list: A list of tuples holding the neighbor's (x,y) values.
-     """
-    width = len(arr[0])-1
-    height = len(arr)-1
-    neighbors = []
+        conway is returned.
+    Errors:
+        ValueError: If the pattern does not fit in conway.
+    """
+    if xy[0] < 0 or xy[1] < 0 or xy[1] + len(pattern) > len(conway) or \
+       xy[0] + len(pattern[0]) > len(conway[0]):
+        raise ValueError("pattern does not fit at " + str(xy))
 
-    for x in range(xy[0]-1, xy[0]+2):
-        for y in range(xy[1]-1, xy[1]+2):
-            if (x >= 0 and y >= 0) and (x <= width and y <= height):
-                if not (xy[0] == x and xy[1] == y):
-                    neighbors.append((x, y))
+    for j in range(0, len(pattern)):
+        conway[xy[1]+j][xy[0]:xy[0]+len(pattern[j])] = pattern[j]
 
-    return neighbors
+    return conway
 
-def _seed(width: int, height: int) -> list:
+def _seed(width: int, height: int, seed: int = None) -> list:
     """Create the initial environment.
 
     Args:
         width  (int): The width of the environment.
         height (int): The height of the environment.
+        seed (int): Seed for the random number generator; None for a seed from
+                    the random module.
     Returns:
       list
     """
-    seeds = [[random.random() for _ in range(width)] for _ in range(height)]
-
-    # For each cell, get the neighbors.
-    # If the neighbor's value is <= 0.5 then remove else
-    # if random value is < 0 remove.
-    for x in range(0, width):
-        for y in range(0, height):
-            for i in _moore_neighbors(seeds, (x,y)):
-                if seeds[i[1]][i[0]] < seeds[y][x]:
-                    if seeds[i[1]][i[0]] <= 0.5:
-                        seeds[i[1]][i[0]] = 0
-                    elif random.random() < 0.5:
-                        seeds[i[1]][i[0]] = 0
-
-    # Final environment should only be 0 or 1.
-    for y in range(0, height):
-        for x in range(0, width):
-            seeds[y][x] = round(seeds[y][x])
+    seeds = []
+    for _, rows in soup(width, height, seed):
+        seeds.extend(rows.tolist())
 
     return seeds
+
+def _greater(values: numpy.ndarray, alive: numpy.ndarray, earlier: bool) -> numpy.ndarray:
+    """Count the living neighbors holding a greater value.
+
+    Args:
+        values (numpy.ndarray): 2D array of values.
+        alive (numpy.ndarray): 2D bool array of cells that may count.
+        earlier (bool): Only count the neighbors _seed visited before the cell.
+    Returns:
+        numpy.ndarray
+    """
+    height, width = values.shape
+    padded = numpy.zeros((height+2, width+2))
+    padded[1:-1, 1:-1] = values
+    mask = numpy.zeros((height+2, width+2), dtype=bool)
+    mask[1:-1, 1:-1] = alive
+
+    count = numpy.zeros((height, width), dtype=numpy.intp)
+    for dx in range(-1, 2):
+        for dy in range(-1, 2):
+            if (dx == 0 and dy == 0) or (earlier and dx > 0) or \
+               (earlier and dx == 0 and dy > 0):
+                continue
+
+            count += (padded[1+dy:1+dy+height, 1+dx:1+dx+width] > values) & \
+                     mask[1+dy:1+dy+height, 1+dx:1+dx+width]
+
+    return count
@@ -0,0 +1,7 @@
+__author__ = "Thomas Shaffer"
+__license__ = "MIT"
+
+__version__ = "0.1.0"
+
+__all__ = ['vectorized', 'bitboard', 'active', 'hashlife', 'sparse',
+           'parallel', 'mapped']
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""active.py: Active-region stepping engine for the conway system.
+
+The engine keeps a neighbor count for every cell and only re-evaluates the
+cells that changed in the previous generation and their Moore neighbors.
+Counts and the number of living cells are updated incrementally on every
+birth and death, so static parts of the board cost nothing. A cell whose
+neighborhood did not change would do what it did last generation, which was
+to stay as it is, so this holds for any rule.
+
+Boundaries other than 'dead' are handled by also adjusting the cells that see
+an edge cell through the boundary, e.g. the cells along the opposite edge of a
+torus.
+"""
+
+import numpy
+from . import vectorized
+
+_offsets = [(dx, dy) for dy in range(-1, 2) for dx in range(-1, 2)
+            if not (dx == 0 and dy == 0)]
+
+class ActiveRegion(object):
+    """Incremental stepping engine for the 2D list representation.
+
+    An ActiveRegion is bound to the conway list it was created with and is
+    called in place of conway.increment, e.g. conway.update(state, tm, engine).
+
+    Attributes:
+        counts (list): 2D list holding the number of living neighbors of each
+                       cell.
+        changed (set): The (x,y) values of the cells that changed in the last
+                       generation.
+        living (int): The number of living cells.
+        on_change (callable): Called with the xs and ys of the cells that were
+                              born or died every generation, or None.
+
+    Args:
+        conway (list): conway list holding 0 or 1.
+        table (numpy.ndarray): Lookup table of the rule, e.g. conway.Rule.table.
+        boundary (str): 'dead', 'torus' or 'reflect'.
+        on_change (callable): e.g. conway.Cycles.flip.
+    Errors:
+        ValueError: If boundary is not a boundary.
+    """
+
+    def __init__(self, conway: list, table=vectorized.life, boundary: str = 'dead',
+                 on_change=None):
+        self._lookup = [[int(i) for i in row] for row in table]
+        self._width = len(conway[0])
+        self._height = len(conway)
+        self._xs = _images(self._width, boundary)
+        self._ys = _images(self._height, boundary)
+        self.counts = [[0] * self._width for _ in range(self._height)]
+        self.changed = set()
+        self.living = 0
+        self.on_change = on_change
+
+        for y in range(0, self._height):
+            for x in range(0, self._width):
+                if conway[y][x] == 1:
+                    self.living += 1
+                    self._adjust((x, y), 1)
+
+        # Everything is a candidate on the first generation.
+        self.changed = {(x, y) for y in range(self._height) for x in range(self._width)}
+
+    def __call__(self, conway: list) -> int:
+        """Increment conway by one.
+
+        Post:
+            Arg conway is modified.
+            counts, changed and living are modified.
+
+        Args:
+            conway (list): The conway list the engine was created with.
+        Returns:
+            int: The number of living cells.
+        """
+        births = []
+        deaths = []
+        lookup = self._lookup
+        for xy in self._candidates():
+            count = self.counts[xy[1]][xy[0]]
+            if conway[xy[1]][xy[0]] == 1:
+                if not lookup[1][count]:
+                    deaths.append(xy)
+            elif lookup[0][count]:
+                births.append(xy)
+
+        for xy in births:
+            conway[xy[1]][xy[0]] = 1
+            self._adjust(xy, 1)
+        for xy in deaths:
+            conway[xy[1]][xy[0]] = 0
+            self._adjust(xy, -1)
+
+        self.changed = set(births)
+        self.changed.update(deaths)
+        self.living += len(births) - len(deaths)
+        if self.on_change is not None:
+            xys = numpy.array(births + deaths, dtype=numpy.int64).reshape(-1, 2)
+            self.on_change(xys[:, 0], xys[:, 1])
+
+        return self.living
+
+    def _adjust(self, xy: tuple, delta: int):
+        """Add delta to the neighbor counts around xy.
+
+        Post:
+            counts is modified.
+
+        Args:
+            xy (tuple): (x,y) of the cell that was born or died.
+            delta (int): 1 for a birth, -1 for a death.
+        """
+        counts = self.counts
+        for x, y in self._watchers(xy):
+            counts[y][x] += delta
+
+    def _candidates(self) -> set:
+        """Return the cells that may change this generation.
+
+        Returns:
+            set: (x,y) values of the changed cells and their neighbors.
+        """
+        candidates = set(self.changed)
+        for xy in self.changed:
+            candidates.update(self._watchers(xy))
+
+        return candidates
+
+    def _watchers(self, xy: tuple):
+        """Yield the cells that have xy as a neighbor.
+
+        A cell is yielded once for every neighbor of it that is xy, which can
+        be more than once through the boundary.
+
+        Args:
+            xy (tuple): (x,y) of a cell.
+        Yields:
+            tuple: (x,y) of a cell.
+        """
+        for sx in self._xs[xy[0]]:
+            for sy in self._ys[xy[1]]:
+                for dx, dy in _offsets:
+                    x = sx + dx
+                    y = sy + dy
+                    if 0 <= x < self._width and 0 <= y < self._height:
+                        yield (x, y)
+
+def _images(size: int, boundary: str) -> list:
+    """Return the positions along an axis that stand for each cell.
+
+    Position -1 and size lie beyond the edges; the boundary decides which
+    cell, if any, they stand for.
+
+    Args:
+        size (int): The number of cells along the axis.
+        boundary (str): 'dead', 'torus' or 'reflect'.
+    Returns:
+        list: For every cell the list of positions standing for it.
+    Errors:
+        ValueError: If boundary is not a boundary.
+    """
+    images = [[i] for i in range(size)]
+    if boundary == 'torus':
+        images[size-1].append(-1)
+        images[0].append(size)
+    elif boundary == 'reflect':
+        images[0].append(-1)
+        images[size-1].append(size)
+    elif boundary != 'dead':
+        raise ValueError(str(boundary) + " is not a boundary.")
+
+    return images
@@ -0,0 +1,564 @@
+# -*- coding: utf-8 -*-
+"""bitboard.py: Bit-packed stepping engine for the conway system.
+
+Each row of the board is packed into uint64 words; bit i of word w holds the
+cell at x = w * 64 + i. A generation is computed for 64 cells at a time using
+bitwise adders over the eight neighbor planes. The cells beyond the edges
+are given by the boundary as in conway.increment; they are carried into the
+edge bits of the shifted planes, so only the edge words and rows cost more.
+
+Every rule is evaluated with an expression over the cell and the outputs of
+the adders, compiled once per rule from its lookup table: the table is reduced
+to a minimal sum of products and factored so shared terms are evaluated once.
+Conway's rule compiles to ~carry1 & bit1 & (sum0 | cells).
+
+Attributes:
+    word_size (int): The number of cells stored in a word.
+    band_words (int): The number of words stepped at a time; the temporaries
+                      of a step take about 20 times this many words.
+"""
+
+import collections, itertools
+import numpy
+from . import vectorized
+
+word_size = 64
+band_words = 1 << 16
+
+_one = numpy.uint64(1)
+_msb = numpy.uint64(word_size - 1)
+_word = numpy.dtype('<u8')
+_boundaries = ('dead', 'torus', 'reflect')
+_popcount = numpy.array([bin(i).count('1') for i in range(256)], dtype=numpy.uint8)
+_expressions = {}
+
+class BitBoard(object):
+    """Conway data packed 64 cells per machine word.
+
+    A BitBoard can be indexed like the list representation, board[y][x], so
+    it can be handed directly to conway.colorize. Indexing a row unpacks it so
+    callers should hold on to the row rather than indexing per cell.
+
+    Attributes:
+        words (numpy.ndarray): uint64 array of shape (height, words per row).
+
+    Args:
+        width  (int): The width of the board.
+        height (int): The height of the board.
+    """
+
+    def __init__(self, width: int, height: int):
+        self._width = width
+        self._height = height
+        self.words = numpy.zeros((height, -(-width // word_size)), dtype=_word)
+
+    def __len__(self) -> int:
+        return self._height
+
+    def __getitem__(self, y: int) -> list:
+        return unpack_rows(self.words[y:y+1], self._width)[0].tolist()
+
+    def __array__(self, dtype=None, copy=None) -> numpy.ndarray:
+        cells = unpack_rows(self.words, self._width)
+        if dtype is not None and numpy.dtype(dtype) == bool:
+            return cells.view(bool)
+        return numpy.asarray(cells, dtype=dtype)
+
+    @property
+    def width(self) -> int:
+        """Return the width of the board.
+
+        Returns:
+          int
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """Return the height of the board.
+
+        Returns:
+          int
+        """
+        return self._height
+
+    @property
+    def nbytes(self) -> int:
+        """Return the number of bytes used to hold the cells.
+
+        Returns:
+          int
+        """
+        return self.words.nbytes
+
+    def count(self) -> int:
+        """Return the number of living cells.
+
+        Returns:
+          int
+        """
+        return population(self.words)
+
+    def coordinates(self) -> tuple:
+        """Return the coordinates of the living cells, unpacking only the
+        words holding any.
+
+        Returns:
+            tuple: (xs, ys) int64 arrays.
+        """
+        return set_bits(self.words)
+
+    def packbits(self) -> numpy.ndarray:
+        """Return the rows packed 8 cells to a byte, as
+        numpy.packbits(cells, axis=1, bitorder='little') would.
+
+        Returns:
+            numpy.ndarray: uint8 view of words of shape
+                           (height, ceil(width / 8)).
+        """
+        return self.words.view(numpy.uint8)[:, :-(-self._width // 8)]
+
+
+def pack(conway) -> BitBoard:
+    """Pack conway data into a BitBoard.
+
+    Args:
+        conway (list, numpy.ndarray): 2D conway data holding 0 or 1.
+    Returns:
+        BitBoard
+    """
+    cells = numpy.asarray(conway, dtype=numpy.uint8)
+    board = BitBoard(cells.shape[1], cells.shape[0])
+    board.words[...] = pack_rows(cells)
+
+    return board
+
+def unpack(board: BitBoard) -> list:
+    """Unpack a BitBoard into the 2D list representation.
+
+    Args:
+        board (BitBoard)
+    Returns:
+        list
+    """
+    return unpack_rows(board.words, board.width).tolist()
+
+def increment(board: BitBoard, table: numpy.ndarray = vectorized.life,
+              boundary: str = 'dead', on_change=None) -> int:
+    """Increment the board by one.
+
+    Produces the same births and deaths as conway.increment.
+
+    Post:
+        Arg board is modified.
+
+    Args:
+        board (BitBoard)
+        table (numpy.ndarray): Lookup table of the rule, e.g. conway.Rule.table.
+        boundary (str): 'dead', 'torus' or 'reflect'.
+        on_change (callable): Called with the xs and ys of the cells that were
+                              born or died, e.g. conway.Cycles.flip, once for
+                              every band of rows; only the words that changed
+                              are unpacked.
+    Returns:
+        int: The number of living cells.
+    """
+    words = next_words(board.words, board.width, table, boundary)
+    if on_change is not None:
+        # Every changed cell takes about 50 bytes to report, so the changes
+        # are reported in bands of a sixteenth of the words stepped at a time.
+        band = max(band_words // 16 // max(words.shape[1], 1), 1)
+        for y0 in range(0, board.height, band):
+            xs, ys = changes(board.words[y0:y0+band], words[y0:y0+band])
+            on_change(xs, ys + y0)
+    board.words[...] = words
+
+    return board.count()
+
+def next_words(cells: numpy.ndarray, width: int,
+               table: numpy.ndarray = vectorized.life,
+               boundary: str = 'dead', band: int = None) -> numpy.ndarray:
+    """Return the next generation of rows of packed cells.
+
+    The rows are stepped a band at a time, so the temporary planes of the
+    adders take memory in proportion to the band rather than the board.
+
+    Args:
+        cells (numpy.ndarray): uint64 array of rows as held by BitBoard.words.
+        width (int): The width of the board.
+        table (numpy.ndarray): Lookup table of the rule.
+        boundary (str): 'dead', 'torus' or 'reflect'; the first and last row
+                        and column are the edges.
+        band (int): The number of rows stepped at a time; by default enough
+                    rows for band_words words.
+    Returns:
+        numpy.ndarray: uint64 array the same shape as cells.
+    Errors:
+        ValueError: If boundary is not a boundary.
+    """
+    if boundary not in _boundaries:
+        raise ValueError(str(boundary) + " is not a boundary.")
+
+    height = cells.shape[0]
+    if band is None:
+        band = max(band_words // max(cells.shape[1], 1), 1)
+
+    # The rows beyond the top and bottom.
+    if boundary == 'dead':
+        above = below = numpy.zeros((1,) + cells.shape[1:], dtype=cells.dtype)
+    elif boundary == 'torus':
+        above, below = cells[height-1:], cells[:1]
+    else:
+        above, below = cells[:1], cells[height-1:]
+
+    expression, variables = _compile(table)
+    result = numpy.empty_like(cells)
+    for y0 in range(0, height, band):
+        y1 = min(y0 + band, height)
+        rows = numpy.concatenate((cells[y0-1:y0] if y0 > 0 else above, cells[y0:y1],
+                                  cells[y1:y1+1] if y1 < height else below))
+        result[y0:y1] = _step(rows, width, expression, variables, boundary)
+    result[:, -1:] &= _tail_mask(width)
+
+    return result
+
+def _step(rows: numpy.ndarray, width: int, expression, variables: set,
+          boundary: str) -> numpy.ndarray:
+    """Return the next generation of all but the first and last of rows.
+
+    Args:
+        rows (numpy.ndarray): uint64 array of a band of rows with the row
+                              above and the row below it.
+        width (int): The width of the board.
+        expression: The rule's expression from _compile.
+        variables (set): The variables the expression reads.
+        boundary (str): 'dead', 'torus' or 'reflect'.
+    Returns:
+        numpy.ndarray: uint64 array of len(rows) - 2 rows.
+    """
+    cells = rows[1:-1]
+    if expression is True:
+        return numpy.full_like(cells, numpy.uint64(0xFFFFFFFFFFFFFFFF))
+    elif expression is False:
+        return numpy.zeros_like(cells)
+
+    # Neighbor planes to the west (x-1) and east (x+1), carrying the edge bit
+    # across word boundaries.
+    west = rows << _one
+    edge = rows[:, :-1] >> _msb
+    west[:, 1:] |= edge
+    east = rows >> _one
+    numpy.left_shift(rows[:, 1:], _msb, out=edge)
+    east[:, :-1] |= edge
+    del edge
+
+    # Bring in the cells beyond the first and last column.
+    if boundary != 'dead':
+        last, bit = divmod(width - 1, word_size)
+        bit = numpy.uint64(bit)
+        first = rows[:, 0] & _one
+        end = (rows[:, last] >> bit) & _one
+        if boundary == 'torus':
+            first, end = end, first
+        west[:, 0] |= first
+        east[:, last] |= end << bit
+
+    # Two bit sums of each row's three cells, and of the two cells on either
+    # side of the center cell; the planes are reused in place.
+    row0 = west ^ rows
+    row1 = west & rows
+    row1 |= east & row0
+    row0 ^= east
+    mid1 = west[1:-1] & east[1:-1]
+    mid0 = west[1:-1]
+    mid0 ^= east[1:-1]
+    del east
+
+    # count = sum0 + 2 * (sum1 + carry0) + 4 * carry1, adding the rows above
+    # (north) and below (south) to the middle.
+    scratch = numpy.empty_like(cells)
+    sums = []
+    for plane, mid in ((row0, mid0), (row1, mid1)):
+        north, south = plane[:-2], plane[2:]
+        total = north ^ south
+        carry = north & south
+        carry |= numpy.bitwise_and(mid, total, out=scratch)
+        total ^= mid
+        sums.append((total, carry))
+    del west, row0, row1, mid0, mid1, scratch
+    (sum0, carry0), (sum1, carry1) = sums
+
+    # The inputs of the expression, in the order of _compile's variables.
+    carry = sum1 & carry0 if 4 in variables else None
+    sum1 ^= carry0
+    return _evaluate(expression, (cells, sum0, sum1, carry1, carry), {})
+
+def _compile(table: numpy.ndarray) -> tuple:
+    """Return the expression of a rule over the cell and the adder outputs.
+
+    The next state is a function of five bits, numbered as the variables of
+    the expression: 0 the cell, 1 sum0, 2 bit1 (sum1 ^ carry0), 3 carry1 and 4
+    carry (sum1 & carry0), where the neighbor count is
+    sum0 + 2 * bit1 + 4 * (carry1 + carry). Inputs the adders never produce,
+    bit1 and carry both set or counts above 8, are don't-cares. Expressions are
+    cached per table.
+
+    Args:
+        table (numpy.ndarray): Lookup table of the rule.
+    Returns:
+        tuple: (expression, variables); the expression is True, False or a
+               node as taken by _evaluate, and variables is the set of
+               variables it reads.
+    """
+    key = numpy.asarray(table, dtype=numpy.uint8).tobytes()
+    if key not in _expressions:
+        ones, free = set(), set()
+        for m in range(32):
+            cell, sum0, bit1, carry1, carry = ((m >> i) & 1 for i in range(5))
+            count = sum0 + 2 * bit1 + 4 * (carry1 + carry)
+            if (bit1 and carry) or count > 8:
+                free.add(m)
+            elif table[cell][count]:
+                ones.add(m)
+
+        terms = _cover(ones, free)
+        expression = _factor(terms) if terms else False
+        variables = _variables(expression) if expression is not False else set()
+        _expressions[key] = (expression, variables)
+
+    return _expressions[key]
+
+def _cover(ones: set, free: set) -> list:
+    """Return a small sum of products of a function of five bits.
+
+    The prime implicants are found by the Quine-McCluskey method; the primes
+    covering the most ones still uncovered are then taken greedily, preferring
+    those with fewer literals.
+
+    Args:
+        ones (set): The inputs the function is 1 for.
+        free (set): The inputs the function may be anything for.
+    Returns:
+        list: frozensets of the (variable, positive) literals of each product.
+    """
+    implicants = {(m, 0) for m in ones | free}
+    primes = set()
+    while implicants:
+        merged, used = set(), set()
+        for a, b in itertools.combinations(implicants, 2):
+            bit = a[0] ^ b[0]
+            if a[1] == b[1] and bit & (bit - 1) == 0:
+                merged.add((a[0] & ~bit, a[1] | bit))
+                used.update((a, b))
+        primes |= implicants - used
+        implicants = merged
+
+    covered = {p: {m for m in ones if m & ~p[1] == p[0]} for p in sorted(primes)}
+    terms = []
+    while ones:
+        value, mask = max(covered, key=lambda p: (len(covered[p] & ones), bin(p[1]).count('1')))
+        ones = ones - covered[(value, mask)]
+        terms.append(frozenset((i, bool((value >> i) & 1)) for i in range(5)
+                               if not (mask >> i) & 1))
+
+    return terms
+
+def _factor(terms: list):
+    """Return the node of a sum of products, factoring out shared literals.
+
+    Args:
+        terms (list): frozensets of (variable, positive) literals.
+    Returns:
+        The node as taken by _evaluate, or True.
+    """
+    if not all(terms):
+        return True
+
+    common = frozenset.intersection(*terms)
+    if common:
+        return _conjoin(common, _factor([t - common for t in terms]))
+
+    literal, uses = collections.Counter(l for t in terms for l in sorted(t)).most_common(1)[0]
+    if uses < 2:
+        return _node('or', [_conjoin(t, True) for t in terms])
+
+    shared = _conjoin({literal}, _factor([t - {literal} for t in terms if literal in t]))
+    return _node('or', [shared, _factor([t for t in terms if literal not in t])])
+
+def _conjoin(literals, rest):
+    """Return the node of literals and rest; negated literals are or-ed and
+    negated once.
+
+    Args:
+        literals (set): (variable, positive) literals.
+        rest: A node, or True.
+    Returns:
+        The node as taken by _evaluate.
+    """
+    parts = sorted(v for v, positive in literals if positive)
+    negated = sorted(v for v, positive in literals if not positive)
+    if negated:
+        parts.append(('not', _node('or', negated)))
+    if rest is not True:
+        parts.append(rest)
+
+    return _node('and', parts)
+
+def _node(op: str, children: list):
+    """Return an and or or node, merging children of the same op.
+
+    Or nodes of x & ~y & rest and ~x & y & rest are rewritten as
+    (x ^ y) & rest.
+
+    Args:
+        op (str): 'and' or 'or'.
+        children (list): Nodes.
+    Returns:
+        The node as taken by _evaluate; the child if there is only one.
+    """
+    merged = set()
+    for child in children:
+        merged.update(child[1] if isinstance(child, tuple) and child[0] == op else [child])
+
+    pairs = itertools.combinations(sorted(merged, key=repr), 2) if op == 'or' else ()
+    for a, b in pairs:
+        if not (isinstance(a, tuple) and isinstance(b, tuple) and a[0] == b[0] == 'and'):
+            continue
+        only_a, only_b = set(a[1]) - set(b[1]), set(b[1]) - set(a[1])
+        x = [n for n in only_a if not (isinstance(n, tuple) and n[0] == 'not')]
+        y = [n[1] for n in only_a if isinstance(n, tuple) and n[0] == 'not']
+        if len(x) == len(y) == 1 and only_b == {('not', x[0]), y[0]}:
+            rest = [n for n in a[1] if n not in only_a]
+            xor = ('xor', tuple(sorted((x[0], y[0]), key=repr)))
+            return _node('or', list(merged - {a, b}) + [_node('and', rest + [xor])])
+
+    if len(merged) == 1:
+        return merged.pop()
+
+    return (op, tuple(sorted(merged, key=repr)))
+
+def _variables(node) -> set:
+    """Return the variables a node reads.
+
+    Args:
+        node: A node as taken by _evaluate, or True.
+    Returns:
+        set
+    """
+    if not isinstance(node, tuple):
+        return {node} if node is not True else set()
+    if node[0] == 'not':
+        return _variables(node[1])
+    return set().union(*(_variables(child) for child in node[1]))
+
+def _evaluate(node, inputs: tuple, memo: dict) -> numpy.ndarray:
+    """Evaluate a node of a compiled expression over packed cells.
+
+    A node is a variable (int) indexing inputs, or an ('and', nodes),
+    ('or', nodes), ('xor', nodes) or ('not', node) tuple. Nodes appearing more
+    than once are evaluated once.
+
+    Args:
+        node: The node.
+        inputs (tuple): uint64 arrays of the variables.
+        memo (dict): Node to its value, shared by the whole expression.
+    Returns:
+        numpy.ndarray: A uint64 array; inputs are returned as they are and
+                       must not be modified.
+    """
+    if not isinstance(node, tuple):
+        return inputs[node]
+
+    if node not in memo:
+        op, args = node
+        if op == 'not':
+            memo[node] = ~_evaluate(args, inputs, memo)
+        else:
+            combine = {'and': numpy.bitwise_and, 'or': numpy.bitwise_or,
+                       'xor': numpy.bitwise_xor}[op]
+            values = [_evaluate(arg, inputs, memo) for arg in args]
+            value = combine(values[0], values[1])
+            for other in values[2:]:
+                combine(value, other, out=value)
+            memo[node] = value
+
+    return memo[node]
+
+def _tail_mask(width: int) -> numpy.uint64:
+    """Return the mask of the valid cells in the last word of a row.
+
+    Args:
+        width (int): The width of the board.
+    Returns:
+        numpy.uint64
+    """
+    used = width % word_size
+    if used == 0:
+        return numpy.uint64(0xFFFFFFFFFFFFFFFF)
+
+    return numpy.uint64((1 << used) - 1)
+
+def pack_rows(cells: numpy.ndarray) -> numpy.ndarray:
+    """Pack rows of cells into words.
+
+    Args:
+        cells (numpy.ndarray): 2D uint8 array holding 0 or 1.
+    Returns:
+        numpy.ndarray: uint64 array of shape (rows, words per row).
+    """
+    height, width = cells.shape
+    padded = numpy.zeros((height, -(-width // word_size) * word_size), dtype=numpy.uint8)
+    padded[:, :width] = cells
+
+    return numpy.packbits(padded, axis=1, bitorder='little').view(_word)
+
+def changes(old: numpy.ndarray, new: numpy.ndarray) -> tuple:
+    """Return the cells that differ between two sets of rows of words.
+
+    Args:
+        old (numpy.ndarray): uint64 array of rows.
+        new (numpy.ndarray): uint64 array of rows the same shape.
+    Returns:
+        tuple: (xs, ys) int64 arrays of the cells.
+    """
+    return set_bits(old ^ new)
+
+def set_bits(words: numpy.ndarray) -> tuple:
+    """Return the cells set in rows of words, unpacking only the words that
+    are not 0.
+
+    Args:
+        words (numpy.ndarray): uint64 array of rows.
+    Returns:
+        tuple: (xs, ys) int64 arrays of the cells.
+    """
+    rows, cols = numpy.nonzero(words)
+    held = numpy.ascontiguousarray(words[rows, cols])
+    bits = numpy.unpackbits(held.view(numpy.uint8).reshape(-1, 8), axis=1,
+                            bitorder='little')
+    index, bit = numpy.nonzero(bits)
+    return (cols[index].astype(numpy.int64) * word_size + bit, rows[index].astype(numpy.int64))
+
+def population(words: numpy.ndarray) -> int:
+    """Return the number of living cells in rows of words.
+
+    Args:
+        words (numpy.ndarray): uint64 array of rows.
+    Returns:
+        int
+    """
+    octets = numpy.ascontiguousarray(words).view(numpy.uint8)
+    return int(_popcount[octets].sum(dtype=numpy.int64))
+
+def unpack_rows(words: numpy.ndarray, width: int) -> numpy.ndarray:
+    """Unpack rows of words into a uint8 array of cells.
+
+    Args:
+        words (numpy.ndarray): uint64 array of rows.
+        width (int): The width of the board.
+    Returns:
+        numpy.ndarray
+    """
+    bits = numpy.unpackbits(numpy.ascontiguousarray(words).view(numpy.uint8),
+                            axis=1, bitorder='little')
+    return bits[:, :width]
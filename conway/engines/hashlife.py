@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+"""hashlife.py: HashLife engine for advancing the conway system quickly.
+
+The universe is stored as a quadtree of canonical nodes; identical sub-patterns
+share a single node, and the future of every node is memoized on the node so
+repeated or periodic structure is only ever computed once. A node of level k
+covers 2**k x 2**k cells and can be advanced up to 2**(k-2) generations at a
+time, so a universe is advanced by the powers of two making up the requested
+number of generations.
+
+The universe is unbounded. When a conway.State is advanced its board is
+treated as the window (0, 0, width, height) of the universe, so unlike the
+other engines cells crossing the edge of the board are not killed, and states
+with a boundary other than 'dead' cannot be advanced. For the same reason
+rules where cells are born with no living neighbors (B0) are not supported.
+
+Attributes:
+    default_max_nodes (int): The number of canonical nodes kept before the node
+                             cache is garbage collected.
+"""
+
+import numpy
+from . import vectorized
+
+default_max_nodes = 500000
+
+class Node(object):
+    """A canonical quadtree node.
+
+    Nodes are immutable and must only be created through Universe so that
+    equal patterns share the same node.
+
+    Attributes:
+        nw, ne, sw, se (Node): The quadrants of the node; None for a leaf.
+        level (int): The node covers 2**level x 2**level cells.
+        population (int): The number of living cells.
+        results (dict): Memoized successors keyed by the log2 of the step.
+    """
+
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population', 'results')
+
+    def __init__(self, nw, ne, sw, se, level: int, population: int):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+        self.results = None
+
+
+_off = Node(None, None, None, None, 0, 0)
+_on = Node(None, None, None, None, 0, 1)
+
+class Universe(object):
+    """An unbounded conway universe advanced with HashLife.
+
+    Attributes:
+        root (Node): The node holding the universe.
+        generations (int): The number of generations the universe has been
+                           advanced.
+        max_nodes (int): Bound on the node cache. Once exceeded every node
+                         not reachable from root is dropped along with the
+                         memoized results.
+
+    Args:
+        max_nodes (int): Bound on the node cache.
+        table (numpy.ndarray): Lookup table of the rule, e.g. conway.Rule.table.
+    Errors:
+        ValueError: If the rule has births with no living neighbors.
+    """
+
+    def __init__(self, max_nodes: int = default_max_nodes, table=vectorized.life):
+        if table[0][0]:
+            raise ValueError("B0 rules fill an unbounded universe.")
+
+        self.max_nodes = max_nodes
+        self._lookup = [[int(i) for i in row] for row in table]
+        self.generations = 0
+        self._nodes = {}
+        self._empty = [_off]
+        self._origin = [0, 0]
+        self.root = self._empty_node(3)
+
+    @property
+    def population(self) -> int:
+        """Return the number of living cells.
+
+        Returns:
+          int
+        """
+        return self.root.population
+
+    @property
+    def num_nodes(self) -> int:
+        """Return the number of nodes in the node cache.
+
+        Returns:
+          int
+        """
+        return len(self._nodes)
+
+    def load(self, conway, x: int = 0, y: int = 0):
+        """Replace the universe with conway data placed at (x,y).
+
+        Post:
+            root is modified.
+
+        Args:
+            conway (list, numpy.ndarray): 2D conway data holding 0 or 1.
+            x (int): x of the top-left corner of the data.
+            y (int): y of the top-left corner of the data.
+        """
+        cells = numpy.asarray(conway, dtype=numpy.uint8)
+        level = 3
+        while (1 << level) < max(cells.shape):
+            level += 1
+
+        padded = numpy.zeros((1 << level, 1 << level), dtype=numpy.uint8)
+        padded[:cells.shape[0], :cells.shape[1]] = cells
+
+        self.root = self._build(padded, 0, 0, level)
+        self._origin = [x, y]
+
+    def advance(self, generations: int):
+        """Advance the universe.
+
+        Post:
+            root, generations are modified.
+
+        Args:
+            generations (int): The number of generations to advance.
+        Errors:
+            ValueError: If generations is negative.
+        """
+        if generations < 0:
+            raise ValueError("generations must be positive")
+
+        j = 0
+        while generations >> j:
+            if (generations >> j) & 1:
+                self._step(j)
+            j += 1
+
+        self.generations += generations
+
+    def window(self, x: int, y: int, width: int, height: int) -> list:
+        """Return a rectangular window of the universe.
+
+        Args:
+            x (int): x of the top-left corner of the window.
+            y (int): y of the top-left corner of the window.
+            width  (int): The width of the window.
+            height (int): The height of the window.
+        Returns:
+            list: 2D list holding 0 or 1.
+        """
+        grid = [[0] * width for _ in range(height)]
+        self._fill(self.root, self._origin[0], self._origin[1],
+                   (x, y, x + width, y + height), grid)
+
+        return grid
+
+    def collect(self):
+        """Drop every node not reachable from root.
+
+        Post:
+            The node cache and the memoized results are cleared.
+        """
+        keep = {}
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in keep:
+                keep[key] = node
+                node.results = None
+                stack.extend(key)
+
+        self._nodes = keep
+        self._empty = [_off]
+
+    def _step(self, j: int):
+        """Advance the universe by 2**j generations.
+
+        Post:
+            root is modified.
+
+        Args:
+            j (int)
+        """
+        if len(self._nodes) > self.max_nodes:
+            self.collect()
+
+        # The pattern must sit in the center of root with a margin of at
+        # least 2**j cells, since it can grow by one cell per generation.
+        while self.root.level < j + 3 or not _padded(self.root):
+            self._expand()
+        self._expand()
+
+        offset = 1 << (self.root.level - 2)
+        self.root = self._successor(self.root, j)
+        self._origin = [self._origin[0] + offset, self._origin[1] + offset]
+
+    def _expand(self):
+        """Center root in a node twice its size.
+
+        Post:
+            root is modified.
+        """
+        root = self.root
+        empty = self._empty_node(root.level - 1)
+        self.root = self._join(self._join(empty, empty, empty, root.nw),
+                               self._join(empty, empty, root.ne, empty),
+                               self._join(empty, root.sw, empty, empty),
+                               self._join(root.se, empty, empty, empty))
+
+        offset = 1 << (root.level - 1)
+        self._origin = [self._origin[0] - offset, self._origin[1] - offset]
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Return the canonical node with the given quadrants.
+
+        Args:
+            nw, ne, sw, se (Node): Quadrants of the same level.
+        Returns:
+            Node
+        """
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+
+        return node
+
+    def _empty_node(self, level: int) -> Node:
+        """Return the canonical empty node of a level.
+
+        Args:
+            level (int)
+        Returns:
+            Node
+        """
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self._join(e, e, e, e))
+
+        return self._empty[level]
+
+    def _center(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Return the center of the node made of the given quadrants.
+
+        Args:
+            nw, ne, sw, se (Node): Quadrants of the same level.
+        Returns:
+            Node
+        """
+        return self._join(nw.se, ne.sw, sw.ne, se.nw)
+
+    def _successor(self, node: Node, j: int) -> Node:
+        """Return the center of node advanced by 2**min(j, level-2) generations.
+
+        Args:
+            node (Node): Node of level 2 or more.
+            j (int)
+        Returns:
+            Node: Node of level node.level-1.
+        """
+        if node.population == 0:
+            return node.nw
+
+        j = min(j, node.level - 2)
+        if node.results is None:
+            node.results = {}
+        elif j in node.results:
+            return node.results[j]
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            join = self._join
+            succ = self._successor
+
+            c00 = succ(nw, j)
+            c01 = succ(join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c02 = succ(ne, j)
+            c10 = succ(join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c11 = succ(join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c12 = succ(join(ne.sw, ne.se, se.nw, se.ne), j)
+            c20 = succ(sw, j)
+            c21 = succ(join(sw.ne, se.nw, sw.se, se.sw), j)
+            c22 = succ(se, j)
+
+            if j < node.level - 2:
+                result = join(self._center(c00, c01, c10, c11),
+                              self._center(c01, c02, c11, c12),
+                              self._center(c10, c11, c20, c21),
+                              self._center(c11, c12, c21, c22))
+            else:
+                result = join(succ(join(c00, c01, c10, c11), j),
+                              succ(join(c01, c02, c11, c12), j),
+                              succ(join(c10, c11, c20, c21), j),
+                              succ(join(c11, c12, c21, c22), j))
+
+        node.results[j] = result
+        return result
+
+    def _life_4x4(self, node: Node) -> Node:
+        """Return the center of a level 2 node advanced by one generation.
+
+        Args:
+            node (Node): Node of level 2.
+        Returns:
+            Node: Node of level 1.
+        """
+        cells = [[0] * 4 for _ in range(4)]
+        for qx, qy, quad in ((0, 0, node.nw), (2, 0, node.ne),
+                             (0, 2, node.sw), (2, 2, node.se)):
+            cells[qy][qx] = quad.nw.population
+            cells[qy][qx+1] = quad.ne.population
+            cells[qy+1][qx] = quad.sw.population
+            cells[qy+1][qx+1] = quad.se.population
+
+        lookup = self._lookup
+
+        def cell(x: int, y: int) -> Node:
+            count = sum(cells[j][i] for j in range(y-1, y+2)
+                        for i in range(x-1, x+2)) - cells[y][x]
+            return _on if lookup[cells[y][x]][count] else _off
+
+        return self._join(cell(1, 1), cell(2, 1), cell(1, 2), cell(2, 2))
+
+    def _build(self, cells: numpy.ndarray, x: int, y: int, level: int) -> Node:
+        """Build the node covering a square of cells.
+
+        Args:
+            cells (numpy.ndarray): 2D array holding 0 or 1.
+            x (int): x of the top-left corner of the square.
+            y (int): y of the top-left corner of the square.
+            level (int): The square is 2**level cells wide.
+        Returns:
+            Node
+        """
+        if level == 0:
+            return _on if cells[y, x] else _off
+
+        size = 1 << level
+        if not cells[y:y+size, x:x+size].any():
+            return self._empty_node(level)
+
+        half = size >> 1
+        return self._join(self._build(cells, x, y, level-1),
+                          self._build(cells, x+half, y, level-1),
+                          self._build(cells, x, y+half, level-1),
+                          self._build(cells, x+half, y+half, level-1))
+
+    def _fill(self, node: Node, x: int, y: int, bounds: tuple, grid: list):
+        """Copy the living cells of node that fall within bounds into grid.
+
+        Post:
+            Arg grid is modified.
+
+        Args:
+            node (Node)
+            x (int): x of the top-left corner of node.
+            y (int): y of the top-left corner of node.
+            bounds (tuple): (left, top, right, bottom) of the window.
+            grid (list): 2D list for the window.
+        """
+        size = 1 << node.level
+        if node.population == 0 or x >= bounds[2] or y >= bounds[3] or \
+           x + size <= bounds[0] or y + size <= bounds[1]:
+            return
+
+        if node.level == 0:
+            grid[y - bounds[1]][x - bounds[0]] = 1
+            return
+
+        half = size >> 1
+        self._fill(node.nw, x, y, bounds, grid)
+        self._fill(node.ne, x + half, y, bounds, grid)
+        self._fill(node.sw, x, y + half, bounds, grid)
+        self._fill(node.se, x + half, y + half, bounds, grid)
+
+
+def advance(state, generations: int, universe: Universe = None) -> Universe:
+    """Advance a conway state by a number of generations.
+
+    Pre:
+        universe, if given, must be the universe returned by the previous call
+        for state.
+
+    Post:
+        state.conway is replaced by a new list.
+        state.living and state.generations are modified.
+
+    Args:
+        state (conway.State): The conway state.
+        generations (int): The number of generations to advance.
+        universe (Universe): Universe to continue from. Cells that have left
+                             the board are only kept if it is passed back in.
+    Returns:
+        Universe
+    Errors:
+        ValueError: If the state's boundary is not 'dead'.
+    """
+    if state.boundary != 'dead':
+        raise ValueError("HashLife universes have no " + state.boundary + " boundary.")
+
+    if universe is None:
+        universe = Universe(table=state.rule.table)
+        universe.load(state.conway)
+
+    universe.advance(generations)
+    state.conway = universe.window(0, 0, state.width, state.height)
+    state.living = sum(map(sum, state.conway))
+    state.inc_generation(generations)
+
+    return universe
+
+def _padded(node: Node) -> bool:
+    """Check if the living cells of node are all in its central quarter.
+
+    Args:
+        node (Node)
+    Returns:
+        boolean
+    """
+    inner = node.nw.se.population + node.ne.sw.population + \
+            node.sw.ne.population + node.se.nw.population
+    return inner == node.population
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""mapped.py: Memory-mapped on-disk boards for the conway system.
+
+A board file holds a 64 byte header followed by the cells, either one uint8
+per cell or packed 64 cells per little-endian uint64 word in the layout used
+by bitboard. The file is mapped rather than read, and a generation is stepped
+in bands of rows, so only the band being worked on needs to be resident. The
+file is always a valid checkpoint once flushed, and other processes can open it
+read-only to look at any window of it.
+
+Header layout (little-endian):
+    magic (4 bytes) b'CWLB', version (u16), packed (u16), width (u64),
+    height (u64), generation (u64), rule (32 bytes ASCII, NUL padded).
+
+Attributes:
+    default_band (int): The number of rows stepped at a time.
+"""
+
+import numpy
+from . import vectorized, bitboard
+
+default_band = 1024
+
+_magic = b'CWLB'
+_version = 1
+_header = numpy.dtype([('magic', 'S4'), ('version', '<u2'), ('packed', '<u2'),
+                       ('width', '<u8'), ('height', '<u8'),
+                       ('generation', '<u8'), ('rule', 'S32')])
+
+class MappedBoard(object):
+    """A conway board held in a memory-mapped file.
+
+    A MappedBoard can be indexed like the list representation, board[y][x],
+    so it can be handed directly to conway.colorize.
+
+    Attributes:
+        cells (numpy.memmap): uint8 array of shape (height, width), or uint64
+                              array of shape (height, words per row) if packed.
+
+    Args:
+        path (str): Path of the board file.
+        mode (str): 'r+' to step the board, 'r' to only read it.
+    Errors:
+        ValueError: If the file is not a board file.
+    """
+
+    def __init__(self, path: str, mode: str = 'r+'):
+        self._path = path
+        self._mode = mode
+        self._head = numpy.memmap(path, dtype=_header, mode=mode, shape=(1,))
+        if self._head['magic'][0] != _magic:
+            raise ValueError(path + " is not a conway board file.")
+
+        width = int(self._head['width'][0])
+        height = int(self._head['height'][0])
+        if self.packed:
+            shape = (height, -(-width // bitboard.word_size))
+            self.cells = numpy.memmap(path, dtype='<u8', mode=mode,
+                                      offset=_header.itemsize, shape=shape)
+        else:
+            self.cells = numpy.memmap(path, dtype=numpy.uint8, mode=mode,
+                                      offset=_header.itemsize, shape=(height, width))
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> list:
+        return self.rows(y, y + 1)[0].tolist()
+
+    def __array__(self, dtype=None, copy=None) -> numpy.ndarray:
+        return numpy.asarray(self.rows(0, self.height), dtype=dtype)
+
+    @property
+    def path(self) -> str:
+        """Return the path of the board file.
+
+        Returns:
+          str
+        """
+        return self._path
+
+    @property
+    def width(self) -> int:
+        """Return the width of the board.
+
+        Returns:
+          int
+        """
+        return int(self._head['width'][0])
+
+    @property
+    def height(self) -> int:
+        """Return the height of the board.
+
+        Returns:
+          int
+        """
+        return int(self._head['height'][0])
+
+    @property
+    def packed(self) -> bool:
+        """Return if the cells are packed 64 to a word.
+
+        Returns:
+          bool
+        """
+        return bool(self._head['packed'][0])
+
+    @property
+    def generation(self) -> int:
+        """Return the generation stored in the header.
+
+        Returns:
+          int
+        """
+        return int(self._head['generation'][0])
+
+    @property
+    def rule(self) -> str:
+        """Return the rule stored in the header.
+
+        Returns:
+          str
+        """
+        return self._head['rule'][0].decode('ascii')
+
+    def rows(self, y0: int, y1: int) -> numpy.ndarray:
+        """Return rows [y0, y1) as a uint8 array of cells.
+
+        Args:
+            y0 (int)
+            y1 (int)
+        Returns:
+            numpy.ndarray
+        """
+        if self.packed:
+            return bitboard.unpack_rows(self.cells[y0:y1], self.width)
+
+        return numpy.array(self.cells[y0:y1])
+
+    def window(self, x: int, y: int, width: int, height: int) -> list:
+        """Return a rectangular window of the board.
+
+        Only the rows of the window are read.
+
+        Args:
+            x (int): x of the top-left corner of the window.
+            y (int): y of the top-left corner of the window.
+            width  (int): The width of the window.
+            height (int): The height of the window.
+        Returns:
+            list: 2D list holding 0 or 1.
+        """
+        return self.rows(y, y + height)[:, x:x+width].tolist()
+
+    def write(self, x: int, y: int, cells):
+        """Write a rectangle of cells with its top-left corner at (x, y).
+
+        Post:
+            The board is modified.
+
+        Args:
+            x (int)
+            y (int)
+            cells (list, numpy.ndarray): 2D data holding 0 or 1.
+        """
+        cells = numpy.asarray(cells, dtype=numpy.uint8)
+        height, width = cells.shape
+        if self.packed:
+            rows = self.rows(y, y + height)
+            rows[:, x:x+width] = cells
+            self.cells[y:y+height] = bitboard.pack_rows(rows)
+        else:
+            self.cells[y:y+height, x:x+width] = cells
+
+    def count(self, band: int = default_band) -> int:
+        """Return the number of living cells.
+
+        Args:
+            band (int): The number of rows read at a time.
+        Returns:
+            int
+        """
+        living = 0
+        for y0 in range(0, self.height, band):
+            if self.packed:
+                living += bitboard.population(self.cells[y0:y0+band])
+            else:
+                living += int(numpy.count_nonzero(self.cells[y0:y0+band]))
+
+        return living
+
+    def flush(self):
+        """Write any changes to disk, making the file a checkpoint.
+
+        Post:
+            The board file is modified.
+        """
+        self._head.flush()
+        self.cells.flush()
+
+    def close(self):
+        """Flush and unmap the board.
+
+        Post:
+            The board can no longer be used.
+        """
+        if self._mode != 'r':
+            self.flush()
+        self.cells._mmap.close()
+        self._head._mmap.close()
+
+
+def empty(path: str, width: int, height: int, packed: bool = False,
+          rule: str = 'B3/S23', generation: int = 0) -> MappedBoard:
+    """Create a board file with every cell dead.
+
+    The cells are not written; the file is extended to size, which most file
+    systems store sparsely.
+
+    Args:
+        path (str): Path of the board file; overwritten if it exists.
+        width  (int): The width of the board.
+        height (int): The height of the board.
+        packed (bool): Store 64 cells per word instead of one per byte.
+        rule (str): Rule to record in the header.
+        generation (int): Generation to record in the header.
+    Returns:
+        MappedBoard
+    """
+    head = numpy.zeros(1, dtype=_header)
+    head['magic'] = _magic
+    head['version'] = _version
+    head['packed'] = 1 if packed else 0
+    head['width'] = width
+    head['height'] = height
+    head['generation'] = generation
+    head['rule'] = rule.encode('ascii')
+
+    row_bytes = -(-width // bitboard.word_size) * 8 if packed else width
+    with open(path, 'wb') as f:
+        f.write(head.tobytes())
+        f.truncate(_header.itemsize + row_bytes * height)
+
+    return MappedBoard(path)
+
+def create(path: str, conway, packed: bool = False, rule: str = 'B3/S23',
+           generation: int = 0) -> MappedBoard:
+    """Create a board file from conway data.
+
+    Args:
+        path (str): Path of the board file; overwritten if it exists.
+        conway (list, numpy.ndarray): 2D conway data holding 0 or 1.
+        packed (bool): Store 64 cells per word instead of one per byte.
+        rule (str): Rule to record in the header.
+        generation (int): Generation to record in the header.
+    Returns:
+        MappedBoard
+    """
+    cells = numpy.asarray(conway, dtype=numpy.uint8)
+    height, width = cells.shape
+
+    board = empty(path, width, height, packed, rule, generation)
+    for y0 in range(0, height, default_band):
+        board.write(0, y0, cells[y0:y0+default_band])
+
+    return board
+
+def increment(board: MappedBoard, band: int = default_band,
+              table: numpy.ndarray = vectorized.life, boundary: str = 'dead') -> int:
+    """Increment the board by one, band by band.
+
+    Each band is read with the row below it, which has not been stepped yet,
+    and the unstepped copy of the row above it kept from the previous band.
+
+    Post:
+        Arg board is modified.
+
+    Args:
+        board (MappedBoard)
+        band (int): The number of rows stepped at a time.
+        table (numpy.ndarray): Lookup table of the rule, normally that of
+                               board.rule.
+        boundary (str): 'dead', 'torus' or 'reflect'.
+    Returns:
+        int: The number of living cells.
+    Errors:
+        ValueError: If boundary is not a boundary.
+    """
+    cells = board.cells
+    height = board.height
+
+    # The rows beyond the top and bottom, copied before either is stepped.
+    if boundary == 'dead':
+        above = numpy.zeros((1,) + cells.shape[1:], dtype=cells.dtype)
+        below = above
+    elif boundary == 'torus':
+        above = numpy.array(cells[height-1:height])
+        below = numpy.array(cells[0:1])
+    elif boundary == 'reflect':
+        above = numpy.array(cells[0:1])
+        below = numpy.array(cells[height-1:height])
+    else:
+        raise ValueError(str(boundary) + " is not a boundary.")
+
+    living = 0
+    for y0 in range(0, height, band):
+        y1 = min(y0 + band, height)
+        old = numpy.array(cells[y0:y1])
+        after = cells[y1:y1+1] if y1 < height else below
+        stacked = numpy.concatenate((above, old, after))
+
+        if board.packed:
+            new = bitboard.next_words(stacked, board.width, table, boundary)[1:-1]
+            living += bitboard.population(new)
+        else:
+            count = vectorized.neighbors(stacked, boundary)[1:-1]
+            new = vectorized.apply(old, count, table)
+            living += int(numpy.count_nonzero(new))
+
+        cells[y0:y1] = new
+        above = old[-1:]
+
+    board._head['generation'] += 1
+
+    return living
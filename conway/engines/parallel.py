@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""parallel.py: Multi-process stepping engine for the conway system.
+
+The board lives in a multiprocessing.shared_memory block and is split into
+horizontal bands, each owned by a worker process. Nothing is pickled per
+generation; at every generation the workers copy the rows bordering their band
+(the halo) out of shared memory, wait on a barrier, and then write their band in
+place using the vectorized engine. The result is identical to the serial
+engines.
+
+The workers are started with the 'fork' start method whatever the platform's
+default is. They only run _work, so forking spares the scripts that create a
+stepper, whose top level starts the program, from being imported again in
+every worker as 'spawn' and 'forkserver' would; the engine is therefore only
+available where os.fork is.
+"""
+
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy
+from . import vectorized
+
+class ParallelStepper(object):
+    """Steps a board held in shared memory with a pool of worker processes.
+
+    A ParallelStepper can be used as an engine for conway.update once the
+    state's conway data has been replaced with conway, e.g.
+    state.conway = stepper.conway.
+
+    Args:
+        conway (list, numpy.ndarray): 2D conway data holding 0 or 1.
+        processes (int): The number of worker processes. Defaults to the number
+                         of CPUs; never more than the height of the board.
+        table (numpy.ndarray): Lookup table of the rule, e.g. conway.Rule.table.
+        boundary (str): 'dead', 'torus' or 'reflect'.
+    Errors:
+        ValueError: If boundary is not a boundary, or the board has no rows.
+    """
+
+    def __init__(self, conway, processes: int = None, table=vectorized.life,
+                 boundary: str = 'dead'):
+        if boundary not in ('dead', 'torus', 'reflect'):
+            raise ValueError(str(boundary) + " is not a boundary.")
+
+        cells = numpy.asarray(conway, dtype=numpy.uint8)
+        height = cells.shape[0]
+        if height == 0:
+            raise ValueError("The board has no rows.")
+        processes = min(processes or os.cpu_count() or 1, height)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(cells.nbytes, 1))
+        self._board = numpy.ndarray(cells.shape, dtype=numpy.uint8, buffer=self._shm.buf)
+        self._board[...] = cells
+
+        context = multiprocessing.get_context('fork')
+        self._steps = context.Value('q', 0, lock=False)
+        self._living = context.Array('q', processes, lock=False)
+        self._control = context.Barrier(processes + 1)
+        barrier = context.Barrier(processes)
+
+        bounds = numpy.linspace(0, height, processes + 1).astype(int)
+        self._workers = []
+        for i in range(processes):
+            worker = context.Process(
+                target=_work, daemon=True,
+                args=(self._shm.name, cells.shape, bounds[i], bounds[i+1], i,
+                      numpy.array(table, dtype=numpy.uint8), boundary,
+                      self._steps, self._living, self._control, barrier))
+            worker.start()
+            self._workers.append(worker)
+
+    def __call__(self, conway=None) -> int:
+        """Increment the board by one.
+
+        Args:
+            conway (numpy.ndarray): Ignored; accepted so the stepper can be
+                                    used as an engine for conway.update.
+        Returns:
+            int: The number of living cells.
+        """
+        return self.run(1)
+
+    @property
+    def conway(self) -> numpy.ndarray:
+        """Return the board held in shared memory.
+
+        Returns:
+          numpy.ndarray
+        """
+        return self._board
+
+    @property
+    def processes(self) -> int:
+        """Return the number of worker processes.
+
+        Returns:
+          int
+        """
+        return len(self._workers)
+
+    def run(self, generations: int) -> int:
+        """Increment the board by a number of generations.
+
+        Post:
+            conway is modified.
+
+        Args:
+            generations (int)
+        Returns:
+            int: The number of living cells.
+        """
+        self._steps.value = generations
+        self._control.wait()
+        self._control.wait()
+
+        return sum(self._living)
+
+    def close(self):
+        """Stop the workers and release the shared memory.
+
+        Pre:
+            No references to conway may remain.
+        Post:
+            The stepper can no longer be used.
+        """
+        if self._board is None:
+            return
+
+        self._steps.value = -1
+        self._control.wait()
+        for worker in self._workers:
+            worker.join()
+
+        self._board = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+def _work(name: str, shape: tuple, y0: int, y1: int, index: int,
+          table: numpy.ndarray, boundary: str, steps, living, control, barrier):
+    """Worker process stepping rows [y0, y1) of the shared board.
+
+    Args:
+        name (str): Name of the shared memory block.
+        shape (tuple): Shape of the board.
+        y0 (int): First row of the band.
+        y1 (int): One past the last row of the band.
+        index (int): Index of the worker in living.
+        table (numpy.ndarray): Lookup table of the rule.
+        boundary (str): 'dead', 'torus' or 'reflect'.
+        steps (multiprocessing.Value): Generations to run; -1 to stop.
+        living (multiprocessing.Array): Living cells per band.
+        control (multiprocessing.Barrier): Barrier shared with the parent.
+        barrier (multiprocessing.Barrier): Barrier shared between the workers.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    board = numpy.ndarray(shape, dtype=numpy.uint8, buffer=shm.buf)
+    band = board[y0:y1]
+
+    # Rows of the board standing in for the rows beyond its top and bottom.
+    first, last = {'torus': (shape[0] - 1, 0),
+                   'reflect': (0, shape[0] - 1)}.get(boundary, (None, None))
+    dead = numpy.zeros((1, shape[1]), dtype=numpy.uint8)
+
+    try:
+        while True:
+            control.wait()
+            if steps.value < 0:
+                break
+
+            for _ in range(steps.value):
+                if y0 > 0:
+                    top = board[y0-1:y0].copy()
+                else:
+                    top = board[first:first+1].copy() if first is not None else dead
+                if y1 < shape[0]:
+                    bottom = board[y1:y1+1].copy()
+                else:
+                    bottom = board[last:last+1].copy() if last is not None else dead
+                barrier.wait()
+
+                count = vectorized.neighbors(numpy.vstack((top, band, bottom)),
+                                             boundary)[1:-1]
+                band[...] = vectorized.apply(band, count, table)
+                barrier.wait()
+
+            living[index] = int(numpy.count_nonzero(band))
+            control.wait()
+    finally:
+        del band, board
+        shm.close()
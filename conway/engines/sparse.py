@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""sparse.py: Unbounded sparse stepping engine for the conway system.
+
+Only the coordinates of living cells are stored, so the universe has no edges
+and its memory is proportional to the population rather than the area the
+pattern spans. A rectangular view of the universe can be indexed like the 2D
+list representation, board[y][x], which lets conway.update and conway.colorize
+work with it directly; the TileMap then shows whatever the view covers. It
+converts to a numpy array of the view the same way, for the PixelMap. Having
+no edges, it has no boundary either.
+"""
+
+from collections import Counter
+import numpy
+from . import vectorized
+
+_offsets = [(dx, dy) for dy in range(-1, 2) for dx in range(-1, 2)
+            if not (dx == 0 and dy == 0)]
+
+class SparseUniverse(object):
+    """An unbounded conway universe stored as a set of living cells.
+
+    Attributes:
+        cells (set): The (x,y) values of the living cells.
+
+    Args:
+        conway (list): 2D conway data holding 0 or 1 placed at (0,0). Its size
+                       is used as the size of the view.
+    """
+
+    def __init__(self, conway: list):
+        self.cells = set()
+        self._view = [0, 0, len(conway[0]), len(conway)]
+
+        for y in range(0, len(conway)):
+            for x in range(0, len(conway[y])):
+                if conway[y][x] == 1:
+                    self.cells.add((x, y))
+
+    def __len__(self) -> int:
+        return self._view[3]
+
+    def __getitem__(self, y: int) -> list:
+        if y >= self._view[3]:
+            raise IndexError("row " + str(y) + " outside of the view.")
+
+        y += self._view[1]
+        return [1 if (x, y) in self.cells else 0
+                for x in range(self._view[0], self._view[0] + self._view[2])]
+
+    def __array__(self, dtype=None, copy=None) -> numpy.ndarray:
+        x0, y0, width, height = self._view
+        view = numpy.zeros((height, width), dtype=numpy.uint8)
+        for x, y in self.cells:
+            if x0 <= x < x0 + width and y0 <= y < y0 + height:
+                view[y - y0, x - x0] = 1
+
+        return numpy.asarray(view, dtype=dtype)
+
+    @property
+    def population(self) -> int:
+        """Return the number of living cells.
+
+        Returns:
+          int
+        """
+        return len(self.cells)
+
+    @property
+    def view(self) -> list:
+        """Return the view of the universe as [x, y, width, height].
+
+        Returns:
+          list
+        """
+        return self._view
+
+    def move_view(self, x: int, y: int):
+        """Move the top-left corner of the view.
+
+        Post:
+            view is modified.
+
+        Args:
+            x (int)
+            y (int)
+        """
+        self._view[0] = x
+        self._view[1] = y
+
+    def coordinates(self) -> tuple:
+        """Return the coordinates of the living cells.
+
+        Returns:
+            tuple: (xs, ys) int64 arrays.
+        """
+        xy = numpy.array(list(self.cells), dtype=numpy.int64).reshape(-1, 2)
+        return xy[:, 0], xy[:, 1]
+
+    def bounds(self) -> list:
+        """Return the bounding box of the living cells.
+
+        Returns:
+          list: [x, y, width, height], or None if there are no living cells.
+        """
+        if not self.cells:
+            return None
+
+        xs = [xy[0] for xy in self.cells]
+        ys = [xy[1] for xy in self.cells]
+        return [min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1]
+
+    def window(self, x: int, y: int, width: int, height: int) -> list:
+        """Return a rectangular window of the universe.
+
+        Args:
+            x (int): x of the top-left corner of the window.
+            y (int): y of the top-left corner of the window.
+            width  (int): The width of the window.
+            height (int): The height of the window.
+        Returns:
+            list: 2D list holding 0 or 1.
+        """
+        grid = [[0] * width for _ in range(height)]
+        for cx, cy in self.cells:
+            if x <= cx < x + width and y <= cy < y + height:
+                grid[cy - y][cx - x] = 1
+
+        return grid
+
+
+def increment(universe: SparseUniverse, table=vectorized.life, on_change=None) -> int:
+    """Increment the universe by one.
+
+    Post:
+        Arg universe is modified.
+
+    Args:
+        universe (SparseUniverse)
+        table (numpy.ndarray): Lookup table of the rule, e.g. conway.Rule.table.
+        on_change (callable): Called with the xs and ys of the cells that were
+                              born or died, e.g. conway.Cycles.flip.
+    Returns:
+        int: The number of living cells.
+    Errors:
+        ValueError: If the rule has births with no living neighbors, which
+                    would fill the universe.
+    """
+    if table[0][0]:
+        raise ValueError("B0 rules fill an unbounded universe.")
+
+    born = {i for i in range(1, 9) if table[0][i]}
+    survive = {i for i in range(1, 9) if table[1][i]}
+
+    cells = universe.cells
+    counts = Counter((x + dx, y + dy) for x, y in cells for dx, dy in _offsets)
+
+    new = {xy for xy, count in counts.items()
+           if count in (survive if xy in cells else born)}
+    if table[1][0]:
+        # Cells with no living neighbors are not counted at all.
+        new.update(xy for xy in cells if xy not in counts)
+    if on_change is not None:
+        xys = numpy.array(list(new ^ cells), dtype=numpy.int64).reshape(-1, 2)
+        on_change(xys[:, 0], xys[:, 1])
+    universe.cells = new
+
+    return len(universe.cells)
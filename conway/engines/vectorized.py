@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""vectorized.py: NumPy stepping engine for the conway system.
+
+The engine keeps the conway data as a 2D numpy.ndarray and computes the number
+of living neighbors for every cell at once by summing the eight shifted views
+of a padded copy of the board. The padding holds the cells beyond the edges for
+the boundary, as conway.increment does: zeros for 'dead', the opposite edge for
+'torus' and the edge itself for 'reflect', so no boundary costs more per cell.
+
+The rule is a lookup table as held by conway.Rule.table; a cell's next state is
+read from it at index 9 * state + count, so any rule costs the same.
+
+Attributes:
+    life (numpy.ndarray): The lookup table of Conway's rule, B3/S23.
+"""
+
+import numpy
+
+life = numpy.zeros((2, 9), dtype=numpy.uint8)
+life[0, 3] = life[1, 2] = life[1, 3] = 1
+life.flags.writeable = False
+
+_pad_modes = {'torus': 'wrap', 'reflect': 'symmetric'}
+
+def as_array(conway) -> numpy.ndarray:
+    """Convert conway data into the array used by the engine.
+
+    Args:
+        conway (list, numpy.ndarray): 2D conway data holding 0 or 1.
+    Returns:
+        numpy.ndarray: uint8 array of shape (height, width).
+    """
+    return numpy.array(conway, dtype=numpy.uint8)
+
+def as_list(conway: numpy.ndarray) -> list:
+    """Convert the engine's array back into a 2D list.
+
+    Args:
+        conway (numpy.ndarray)
+    Returns:
+        list
+    """
+    return conway.tolist()
+
+def neighbors(conway: numpy.ndarray, boundary: str = 'dead') -> numpy.ndarray:
+    """Return the number of living neighbors for every cell.
+
+    Args:
+        conway (numpy.ndarray): 2D array holding 0 or 1.
+        boundary (str): 'dead', 'torus' or 'reflect'.
+    Returns:
+        numpy.ndarray: uint8 array the same shape as conway.
+    Errors:
+        ValueError: If boundary is not a boundary.
+    """
+    height, width = conway.shape
+    if boundary == 'dead':
+        padded = numpy.zeros((height+2, width+2), dtype=numpy.uint8)
+        padded[1:-1, 1:-1] = conway
+    elif boundary in _pad_modes:
+        padded = numpy.pad(numpy.asarray(conway, dtype=numpy.uint8), 1,
+                           mode=_pad_modes[boundary])
+    else:
+        raise ValueError(str(boundary) + " is not a boundary.")
+
+    count = numpy.zeros((height, width), dtype=numpy.uint8)
+    for dy in range(0, 3):
+        for dx in range(0, 3):
+            if not (dx == 1 and dy == 1):
+                count += padded[dy:dy+height, dx:dx+width]
+
+    return count
+
+def apply(cells: numpy.ndarray, count: numpy.ndarray, table: numpy.ndarray) -> numpy.ndarray:
+    """Return the next state of cells from their neighbor counts.
+
+    Post:
+        Arg count is modified.
+
+    Args:
+        cells (numpy.ndarray): uint8 array holding 0 or 1.
+        count (numpy.ndarray): uint8 array of neighbor counts the same shape as
+                               cells, as returned by neighbors.
+        table (numpy.ndarray): Lookup table of shape (2, 9).
+    Returns:
+        numpy.ndarray: uint8 array the same shape as cells.
+    """
+    count += cells * numpy.uint8(9)
+    return table.ravel().take(count)
+
+def increment(conway: numpy.ndarray, table: numpy.ndarray = life,
+              boundary: str = 'dead', on_change=None) -> int:
+    """Increment conway by one.
+
+    Produces the same births and deaths as conway.increment.
+
+    Post:
+        Arg conway is modified.
+
+    Args:
+        conway (numpy.ndarray): 2D array holding 0 or 1.
+        table (numpy.ndarray): Lookup table of the rule, e.g. conway.Rule.table.
+        boundary (str): 'dead', 'torus' or 'reflect'.
+        on_change (callable): Called with the xs and ys of the cells that were
+                              born or died, e.g. conway.Cycles.flip.
+    Returns:
+        int: The number of living cells.
+    """
+    new = apply(conway, neighbors(conway, boundary), table)
+    if on_change is not None:
+        ys, xs = numpy.nonzero(new != conway)
+        on_change(xs, ys)
+    conway[...] = new
+
+    return int(numpy.count_nonzero(conway))
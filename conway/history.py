@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""history.py: Delta compressed generation history for the conway system.
+
+Past generations are kept in segments, each a keyframe holding the whole board
+packed 8 cells to a byte, row by row, followed by a delta for each later
+generation. A delta is the flat indices of the cells that were born or died, or
+an XOR bitmap when that is smaller. Boards that can hand over their rows packed,
+as engines.bitboard.BitBoard does, are recorded and diffed without unpacking. A generation is rebuilt from the keyframe of its segment, so
+rebuilding takes time proportional to its distance from the keyframe.
+
+Attributes:
+    default_memory (int): The default cap on the bytes held, 64 MiB.
+"""
+
+import collections
+import numpy
+
+default_memory = 64 * 2 ** 20
+
+class History(object):
+    """Ring buffer of past generations.
+
+    Once more than memory bytes are held, the oldest segments are dropped.
+
+    Args:
+        keyframe_interval (int): The number of generations in each segment.
+        memory (int): The cap on the bytes held; the newest segment is always
+                      kept however large it is.
+    """
+
+    def __init__(self, keyframe_interval: int = 32,
+                 memory: int = default_memory):
+        self._interval = keyframe_interval
+        self._memory = memory
+        # Segments are [first generation, keyframe, deltas].
+        self._segments = collections.deque()
+        self._shape = None
+        self._last = None
+        self._nbytes = 0
+
+    def __len__(self) -> int:
+        return sum(len(segment[2]) + 1 for segment in self._segments)
+
+    def __contains__(self, generation: int) -> bool:
+        return len(self._segments) > 0 and self.oldest <= generation <= self.newest
+
+    @property
+    def oldest(self) -> int:
+        """Return the oldest generation held.
+
+        Returns:
+          int: None if empty.
+        """
+        return self._segments[0][0] if self._segments else None
+
+    @property
+    def newest(self) -> int:
+        """Return the newest generation held.
+
+        Returns:
+          int: None if empty.
+        """
+        if not self._segments:
+            return None
+
+        return self._segments[-1][0] + len(self._segments[-1][2])
+
+    @property
+    def nbytes(self) -> int:
+        """Return the number of bytes held by keyframes and deltas.
+
+        Returns:
+          int
+        """
+        return self._nbytes
+
+    def record(self, conway, generation: int):
+        """Record the board of a generation.
+
+        Recording a generation that is not newer than the newest held discards
+        it and every newer one first, as after rewinding and stepping again.
+
+        Post:
+            Older segments may be dropped.
+
+        Args:
+            conway (list, numpy.ndarray, BitBoard): conway data; any board
+                                                    numpy can convert will do.
+            generation (int): The generation of the board.
+        """
+        if hasattr(conway, 'packbits'):
+            shape = (conway.height, conway.width)
+            rows = numpy.array(conway.packbits())
+        else:
+            cells = numpy.asarray(conway, dtype=bool)
+            shape = cells.shape
+            rows = numpy.packbits(cells, axis=1, bitorder='little')
+        if shape != self._shape:
+            self.clear()
+            self._shape = shape
+        elif self._segments and generation <= self.newest:
+            self._truncate(generation)
+
+        segment = self._segments[-1] if self._segments else None
+        if segment is not None and generation == self.newest + 1 and \
+           len(segment[2]) + 1 < self._interval:
+            delta = _delta(rows, self._last, shape[1])
+            segment[2].append(delta)
+            self._nbytes += delta.nbytes
+        else:
+            self._segments.append([generation, rows, []])
+            self._nbytes += rows.nbytes
+
+        self._last = rows
+
+        while self._nbytes > self._memory and len(self._segments) > 1:
+            self._nbytes -= _segment_bytes(self._segments.popleft())
+
+    def get(self, generation: int) -> numpy.ndarray:
+        """Rebuild the board of a generation.
+
+        Args:
+            generation (int)
+        Returns:
+            numpy.ndarray: uint8 array holding 0 or 1.
+        Errors:
+            KeyError: If the generation is not held.
+        """
+        if generation not in self:
+            raise KeyError(generation)
+
+        return numpy.unpackbits(self._rows(generation), axis=1,
+                                count=self._shape[1], bitorder='little')
+
+    def clear(self):
+        """Drop every generation held.
+
+        Post:
+            The history is empty.
+        """
+        self._segments.clear()
+        self._last = None
+        self._nbytes = 0
+
+    def _truncate(self, generation: int):
+        """Drop generation and every newer one.
+
+        Post:
+            The history holds generations older than generation only.
+
+        Args:
+            generation (int)
+        """
+        while self._segments and self._segments[-1][0] >= generation:
+            self._nbytes -= _segment_bytes(self._segments.pop())
+
+        if self._segments:
+            deltas = self._segments[-1][2]
+            keep = generation - 1 - self._segments[-1][0]
+            self._nbytes -= sum(delta.nbytes for delta in deltas[keep:])
+            del deltas[keep:]
+            self._last = self._rows(generation - 1)
+        else:
+            self._last = None
+
+    def _rows(self, generation: int) -> numpy.ndarray:
+        """Rebuild the packed rows of a generation held.
+
+        Args:
+            generation (int)
+        Returns:
+            numpy.ndarray: uint8 array of rows packed 8 cells to a byte.
+        """
+        segment = next(s for s in reversed(self._segments) if s[0] <= generation)
+        rows = segment[1].copy()
+        width = self._shape[1]
+        for delta in segment[2][:generation - segment[0]]:
+            if delta.dtype == numpy.uint8:
+                rows ^= delta
+            else:
+                ys, xs = numpy.divmod(delta, width)
+                numpy.bitwise_xor.at(rows, (ys, xs >> 3),
+                                     numpy.left_shift(1, xs & 7).astype(numpy.uint8))
+
+        return rows
+
+
+def _delta(rows: numpy.ndarray, last: numpy.ndarray, width: int) -> numpy.ndarray:
+    """Return the delta from last to rows.
+
+    Args:
+        rows (numpy.ndarray): Packed rows of the board.
+        last (numpy.ndarray): Packed rows of the previous generation.
+        width (int): The width of the board in cells.
+    Returns:
+        numpy.ndarray: uint32 or int64 flat indices of the flipped cells, or a
+                       uint8 packed XOR bitmap if that is smaller.
+    """
+    flips = rows ^ last
+    dtype = numpy.uint32 if rows.shape[0] * width < 2 ** 32 else numpy.int64
+    itemsize = numpy.dtype(dtype).itemsize
+    # Every flipped byte holds at least one flipped cell, so count bytes first
+    # and unpack only the bytes that changed.
+    ys, columns = numpy.nonzero(flips)
+    if ys.size * itemsize >= flips.nbytes:
+        return flips
+
+    bits = numpy.unpackbits(flips[ys, columns][:, None], axis=1, bitorder='little')
+    index, bit = numpy.nonzero(bits)
+    if index.size * itemsize >= flips.nbytes:
+        return flips
+
+    xs = columns[index].astype(numpy.int64) * 8 + bit
+    return (ys[index].astype(numpy.int64) * width + xs).astype(dtype)
+
+def _segment_bytes(segment: list) -> int:
+    """Return the bytes held by a segment.
+
+    Args:
+        segment (list): [first generation, keyframe, deltas].
+    Returns:
+        int
+    """
+    return segment[1].nbytes + sum(delta.nbytes for delta in segment[2])
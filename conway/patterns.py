@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""patterns.py: Reading and writing Life patterns.
+
+Supports the run length encoded (.rle) and plaintext (.cells) formats. Both
+readers and writers stream: patterns are parsed a line at a time and only the
+rows holding living cells are produced, and boards are written a row at a time,
+so neither the pattern text nor the whole board needs to be held in memory.
+
+Attributes:
+    line_length (int): The maximum length of a line written to an RLE file.
+"""
+
+import re
+import numpy
+
+line_length = 70
+
+_header = re.compile(r'\s*x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?')
+_token = re.compile(r'(\d*)([^\d\s])')
+_alive = (ord('O'), ord('*'))
+_rle_alive = ('o', 'A')
+
+class Pattern(object):
+    """A pattern file opened for reading.
+
+    The header is read when the pattern is opened; the cells are only read by
+    rows.
+
+    Attributes:
+        width (int): The width of the pattern.
+        height (int): The height of the pattern.
+        rule (str): The rule the pattern is meant for.
+        name (str): The name of the pattern, if the file gives one.
+
+    Args:
+        f (file): Seekable text file positioned at the start of the pattern.
+        rle (bool): True if the file is RLE, False if plaintext.
+    Errors:
+        ValueError: If an RLE file has no header line.
+    """
+
+    def __init__(self, f, rle: bool):
+        self._file = f
+        self._rle = rle
+        self.width = 0
+        self.height = 0
+        self.rule = 'B3/S23'
+        self.name = None
+
+        if rle:
+            self._read_rle_header()
+        else:
+            self._read_plaintext_size()
+
+    def rows(self):
+        """Yield the rows of the pattern that hold living cells.
+
+        Yields:
+            tuple: (y, numpy.ndarray) with a uint8 row of length width.
+        Errors:
+            ValueError: If a row is longer than width or below height, or an
+                        RLE tag is not a cell state of a two state rule.
+        """
+        self._file.seek(self._start)
+        if self._rle:
+            return self._rle_rows()
+
+        return self._plaintext_rows()
+
+    def _read_rle_header(self):
+        """Read comments and the header line of an RLE file.
+
+        Post:
+            width, height, rule and name are set.
+        """
+        while True:
+            line = self._file.readline()
+            if not line:
+                raise ValueError("RLE pattern has no header line.")
+            if line.startswith('#N'):
+                self.name = line[2:].strip()
+            elif not line.startswith('#') and line.strip():
+                break
+
+        match = _header.match(line)
+        if match is None:
+            raise ValueError("invalid RLE header: " + line.strip())
+
+        self.width = int(match.group(1))
+        self.height = int(match.group(2))
+        if match.group(3) is not None:
+            self.rule = match.group(3)
+        self._start = self._file.tell()
+
+    def _read_plaintext_size(self):
+        """Scan a plaintext file for its size.
+
+        Trailing empty rows are not counted in the height.
+
+        Post:
+            width, height and name are set.
+        """
+        self._start = self._file.tell()
+        rows = 0
+        while True:
+            line = self._file.readline()
+            if not line:
+                break
+            if line.startswith('!'):
+                if line.startswith('!Name:'):
+                    self.name = line[6:].strip()
+                continue
+
+            rows += 1
+            if line.strip():
+                self.width = max(self.width, len(line.rstrip()))
+                self.height = rows
+
+    def _rle_rows(self):
+        """Yield the living rows of an RLE body.
+
+        Yields:
+            tuple: (y, numpy.ndarray)
+        """
+        row = numpy.zeros(self.width, dtype=numpy.uint8)
+        x = y = 0
+        dirty = False
+
+        while True:
+            line = self._file.readline()
+            if not line:
+                break
+
+            for match in _token.finditer(line):
+                count = int(match.group(1)) if match.group(1) else 1
+                tag = match.group(2)
+                if tag == 'b' or tag == '.':
+                    x += count
+                elif tag == '$' or tag == '!':
+                    if dirty:
+                        yield y, row
+                        row = numpy.zeros(self.width, dtype=numpy.uint8)
+                        dirty = False
+                    if tag == '!':
+                        return
+                    x = 0
+                    y += count
+                elif tag not in _rle_alive:
+                    raise ValueError("invalid RLE tag: " + tag)
+                else:
+                    if x + count > self.width or y >= self.height:
+                        raise ValueError("pattern cell outside of " +
+                                         str((self.width, self.height)))
+                    row[x:x+count] = 1
+                    x += count
+                    dirty = True
+
+        if dirty:
+            yield y, row
+
+    def _plaintext_rows(self):
+        """Yield the living rows of a plaintext body.
+
+        Yields:
+            tuple: (y, numpy.ndarray)
+        """
+        y = 0
+        while True:
+            line = self._file.readline()
+            if not line:
+                break
+            if line.startswith('!'):
+                continue
+
+            cells = numpy.frombuffer(line.rstrip().encode('ascii'), dtype=numpy.uint8)
+            if numpy.isin(cells, _alive).any():
+                row = numpy.zeros(self.width, dtype=numpy.uint8)
+                row[:len(cells)] = numpy.isin(cells, _alive)
+                yield y, row
+            y += 1
+
+
+def read(f) -> Pattern:
+    """Open a pattern from a file, detecting its format.
+
+    Args:
+        f (file): Seekable text file positioned at the start of the pattern.
+    Returns:
+        Pattern
+    """
+    start = f.tell()
+    line = f.readline()
+    while line.startswith('#') or (line and not line.strip()):
+        line = f.readline()
+    f.seek(start)
+
+    return Pattern(f, _header.match(line) is not None)
+
+def load(pattern: Pattern, conway, xy: tuple = (0, 0)):
+    """Copy a pattern into conway with its top-left corner at xy.
+
+    Boards with a write(x, y, cells) method, such as engines.mapped's
+    MappedBoard, are written through it.
+
+    Post:
+        Arg conway is modified.
+
+    Args:
+        pattern (Pattern): The pattern to load.
+        conway (list, numpy.ndarray): conway data large enough for the pattern.
+        xy (tuple): (x,y) of the top-left corner of the pattern.
+    Returns:
+        conway is returned.
+    Errors:
+        ValueError: If the pattern does not fit in conway.
+    """
+    if xy[0] < 0 or xy[1] < 0 or xy[1] + pattern.height > len(conway) or \
+       xy[0] + pattern.width > len(conway[0]):
+        raise ValueError("pattern does not fit at " + str(xy))
+
+    write = getattr(conway, 'write', None)
+    x = xy[0]
+    for y, row in pattern.rows():
+        if write is not None:
+            write(x, xy[1] + y, row[numpy.newaxis])
+        elif isinstance(conway, numpy.ndarray):
+            conway[xy[1] + y, x:x+len(row)] = row
+        else:
+            conway[xy[1] + y][x:x+len(row)] = row.tolist()
+
+    return conway
+
+def write_rle(f, conway, rule: str = 'B3/S23', name: str = None):
+    """Write conway data as RLE, a row at a time.
+
+    Args:
+        f (file): Text file to write to.
+        conway (list, numpy.ndarray): 2D conway data holding 0 or 1; any board
+                                      indexable as conway[y] will do.
+        rule (str): The rule to record.
+        name (str): Name to record as a #N comment.
+    """
+    height = len(conway)
+    width = len(conway[0]) if height else 0
+
+    if name is not None:
+        f.write('#N ' + name + '\n')
+    f.write('x = {0}, y = {1}, rule = {2}\n'.format(width, height, rule))
+
+    line = ''
+    last = 0
+    for y in range(height):
+        row = numpy.asarray(conway[y], dtype=numpy.uint8)
+        edges = numpy.flatnonzero(numpy.diff(row, prepend=0, append=0))
+        if not len(edges):
+            continue
+
+        tokens = []
+        if y > last:
+            tokens.append(_run(y - last, '$'))
+        last = y
+
+        end = 0
+        for start, stop in zip(edges[0::2].tolist(), edges[1::2].tolist()):
+            if start > end:
+                tokens.append(_run(start - end, 'b'))
+            tokens.append(_run(stop - start, 'o'))
+            end = stop
+
+        for token in tokens:
+            if len(line) + len(token) > line_length:
+                f.write(line + '\n')
+                line = ''
+            line += token
+
+    # The terminator counts towards the length of the last line.
+    if len(line) + 1 > line_length:
+        f.write(line + '\n')
+        line = ''
+    f.write(line + '!\n')
+
+def write_plaintext(f, conway, name: str = None):
+    """Write conway data as plaintext, a row at a time.
+
+    Args:
+        f (file): Text file to write to.
+        conway (list, numpy.ndarray): 2D conway data holding 0 or 1; any board
+                                      indexable as conway[y] will do.
+        name (str): Name to record as a !Name: comment.
+    """
+    if name is not None:
+        f.write('!Name: ' + name + '\n')
+
+    for y in range(len(conway)):
+        row = numpy.asarray(conway[y], dtype=numpy.uint8)
+        text = numpy.where(row, ord('O'), ord('.')).astype(numpy.uint8)
+        f.write(text.tobytes().decode('ascii').rstrip('.') + '\n')
+
+def _run(count: int, tag: str) -> str:
+    """Return an RLE token for count repeats of tag.
+
+    Args:
+        count (int)
+        tag (str)
+    Returns:
+        str
+    """
+    return tag if count == 1 else str(count) + tag
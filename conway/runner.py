@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""runner.py: Headless batch runner for the conway system.
+
+Steps a conway system as fast as possible without a display or TileMap and
+reports the throughput. Neither this module nor anything it imports uses pygame,
+so it is safe to use on servers without SDL.
+
+Usage:
+    python conway run --size W,H --generations N [--seed S] [--density P]
+                      [--pattern FILE] [--output FILE] [--engine E]
+                      [--rule RULE] [--boundary B] [--board PATH [--packed]]
+
+With --board the system is kept in a memory-mapped board file, which is
+created from the seed if it does not exist and resumed from otherwise.
+
+Attributes:
+    engines (list): Names of the available stepping engines.
+"""
+
+import os, time, argparse, functools
+import numpy
+import conway
+from engines import vectorized, bitboard, active, sparse, parallel, mapped
+import patterns
+
+engines = ['python', 'numpy', 'bitboard', 'active', 'sparse', 'parallel']
+
+def make_engine(state: conway.State, name: str, processes: int = None):
+    """Create an engine and convert the state's conway data to suit it.
+
+    The engine steps with the state's rule and boundary. If the state is
+    tracking cycles, the engine reports the cells it changes to them, so the
+    board is hashed in proportion to its changes; the parallel engine does not,
+    and its boards are hashed whole.
+
+    Post:
+        state.conway may be replaced.
+
+    Args:
+        state (conway.State): The conway state.
+        name (str): Name of the engine; one of engines.
+        processes (int): The number of worker processes for parallel.
+    Returns:
+        callable: Engine to pass to conway.update.
+    Errors:
+        ValueError: If name is not a known engine, or the engine cannot step
+                    the state's rule or boundary.
+    """
+    table = state.rule.table
+    boundary = state.boundary
+    on_change = state.cycles.flip if state.cycles is not None else None
+    if name == 'python':
+        return functools.partial(conway.increment, rule=state.rule, boundary=boundary,
+                                 on_change=on_change)
+    elif name == 'numpy':
+        state.conway = vectorized.as_array(state.conway)
+        return functools.partial(vectorized.increment, table=table, boundary=boundary,
+                                 on_change=on_change)
+    elif name == 'bitboard':
+        state.conway = bitboard.pack(state.conway)
+        return functools.partial(bitboard.increment, table=table, boundary=boundary,
+                                 on_change=on_change)
+    elif name == 'active':
+        return active.ActiveRegion(state.conway, table, boundary, on_change)
+    elif name == 'sparse':
+        if table[0][0]:
+            raise ValueError("B0 rules fill an unbounded universe.")
+        if boundary != 'dead':
+            raise ValueError("The sparse universe has no " + boundary + " boundary.")
+        # The universe is unbounded; the state's size is the size of the view.
+        state.conway = sparse.SparseUniverse(state.conway)
+        return functools.partial(sparse.increment, table=table, on_change=on_change)
+    elif name == 'parallel':
+        engine = parallel.ParallelStepper(state.conway, processes, table, boundary)
+        state.conway = engine.conway
+        return engine
+
+    raise ValueError(name + " is not a known engine.")
+
+def run(state: conway.State, engine, generations: int) -> float:
+    """Step the state without rendering.
+
+    If the state is tracking cycles, stepping stops once the system repeats;
+    the remaining generations are skipped after stepping to the same phase of
+    the cycle, which leaves the same board as stepping through them.
+
+    Post:
+        state is modified.
+
+    Args:
+        state (conway.State): The conway state.
+        engine (callable): Engine as returned by make_engine.
+        generations (int): The number of generations to step.
+    Returns:
+        float: Wall time spent stepping in seconds.
+    """
+    start = time.perf_counter()
+    remaining = generations
+    while remaining > 0:
+        state.living = engine(state.conway)
+        state.inc_generation()
+        remaining -= 1
+
+        if state.period:
+            for _ in range(remaining % state.period):
+                state.living = engine(state.conway)
+                state.inc_generation()
+            if remaining >= state.period:
+                state.inc_generation(remaining - remaining % state.period)
+            break
+
+    return time.perf_counter() - start
+
+def main(argv: list) -> int:
+    """Entry point for python conway run.
+
+    Args:
+        argv (list): Command line arguments following run.
+    Returns:
+        int: Exit status.
+    """
+    parser = argparse.ArgumentParser(prog='conway run',
+                                     description='Run Conway\'s Game of Life headless.')
+    parser.add_argument('--size', help='Conway Size [width,height]; defaults to '
+                                       'the size of --pattern')
+    parser.add_argument('--generations', required=True, type=int,
+                        help='Number of generations to step')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    parser.add_argument('--density', type=float,
+                        help='Seed each cell alive with this probability instead of '
+                             'the default soup')
+    parser.add_argument('--pattern', help='RLE or plaintext pattern to start from, '
+                                          'centred, instead of a random seed')
+    parser.add_argument('--output', help='Write the final generation to this file; '
+                                         'RLE if it ends in .rle, plaintext otherwise')
+    parser.add_argument('--engine', choices=engines,
+                        help='Stepping engine; defaults to numpy')
+    parser.add_argument('--rule', help='Rule in B/S notation or a name in '
+                                       'conway.rules; defaults to the rule of '
+                                       '--pattern, or B3/S23')
+    parser.add_argument('--boundary', default='dead', choices=conway.boundaries,
+                        help='How cells beyond the edges are treated')
+    parser.add_argument('--cycles', action='store_true',
+                        help='Stop stepping once the system repeats itself')
+    parser.add_argument('--processes', type=int,
+                        help='Worker processes for the parallel engine')
+    parser.add_argument('--board', help='Memory-mapped board file to create or resume')
+    parser.add_argument('--packed', action='store_true',
+                        help='Pack 64 cells per word when creating the board file')
+    args = parser.parse_args(argv)
+
+    if args.board is not None and args.cycles:
+        parser.error('--cycles cannot be used with --board')
+    if args.board is not None and args.engine is not None:
+        parser.error('--engine cannot be used with --board')
+    args.engine = args.engine or 'numpy'
+
+    start = time.perf_counter()
+    if args.board is not None and os.path.exists(args.board):
+        board = mapped.MappedBoard(args.board)
+        conflict = _resume_conflict(args, board)
+        if conflict is not None:
+            board.close()
+            parser.error(conflict)
+        args.engine = 'mapped'
+        return _run_mapped(args, board, start)
+
+    if args.size is None and args.pattern is None:
+        parser.error('--size is required without --pattern')
+
+    if args.pattern is not None:
+        with open(args.pattern) as f:
+            pattern = patterns.read(f)
+            rule = _rule(parser, args.rule or pattern.rule)
+            size = [pattern.width, pattern.height]
+            if args.size is not None:
+                size = [int(i) for i in args.size.split(',')]
+
+            xy = ((size[0] - pattern.width) // 2, (size[1] - pattern.height) // 2)
+            if args.board is not None:
+                board = mapped.empty(args.board, size[0], size[1], args.packed,
+                                     str(rule))
+            else:
+                board = numpy.zeros((size[1], size[0]), dtype=numpy.uint8)
+            patterns.load(pattern, board, xy)
+
+        if args.board is not None:
+            args.engine = 'mapped'
+            return _run_mapped(args, board, start)
+    else:
+        rule = _rule(parser, args.rule or 'B3/S23')
+        size = [int(i) for i in args.size.split(',')]
+        if args.density is None:
+            bands = conway.soup(size[0], size[1], args.seed)
+        else:
+            bands = conway.uniform(size[0], size[1], args.density, args.seed)
+        if args.board is not None:
+            # Write each band as it is generated, so the board is never held
+            # in memory whole.
+            board = mapped.empty(args.board, size[0], size[1], args.packed,
+                                 str(rule))
+            for y0, rows in bands:
+                board.write(0, y0, rows)
+            args.engine = 'mapped'
+            return _run_mapped(args, board, start)
+        board = numpy.vstack([rows for _, rows in bands])
+
+    if args.engine in ('python', 'active', 'sparse'):
+        board = board.tolist()
+
+    state = conway.State(size[0], size[1], board, rule=rule, boundary=args.boundary)
+    if args.cycles:
+        state.track_cycles()
+    try:
+        engine = make_engine(state, args.engine, args.processes)
+    except ValueError as e:
+        parser.error(str(e))
+    setup = time.perf_counter() - start
+
+    elapsed = run(state, engine, args.generations)
+
+    if args.output is not None:
+        _export(args.output, state.conway, str(state.rule))
+
+    if args.engine == 'parallel':
+        state.conway = None
+        engine.close()
+
+    status = _report(args, size, setup, elapsed, state.living)
+    if args.cycles:
+        found = state.cycles.found
+        print("cycle:           " + ("generation {0}, period {1}".format(*found)
+                                     if found is not None else "none"))
+
+    return status
+
+def _export(path: str, board, rule: str = 'B3/S23'):
+    """Write a board to a pattern file.
+
+    Args:
+        path (str): RLE if it ends in .rle, plaintext otherwise.
+        board (list, numpy.ndarray): Any board indexable as board[y].
+        rule (str): The rule to record in an RLE file.
+    """
+    with open(path, 'w') as f:
+        if path.endswith('.rle'):
+            patterns.write_rle(f, board, rule)
+        else:
+            patterns.write_plaintext(f, board)
+
+def _rule(parser: argparse.ArgumentParser, notation: str) -> conway.Rule:
+    """Parse a rule, exiting with a usage error if it is not one.
+
+    Args:
+        parser (argparse.ArgumentParser)
+        notation (str): The rule as accepted by conway.Rule.
+    Returns:
+        conway.Rule
+    """
+    try:
+        return conway.Rule(notation)
+    except ValueError as e:
+        parser.error(str(e))
+
+def _resume_conflict(args, board: mapped.MappedBoard) -> str:
+    """Return how the arguments conflict with a board file being resumed.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        board (mapped.MappedBoard): The board to resume.
+    Returns:
+        str: The error, or None if there is no conflict.
+    """
+    for name in ('pattern', 'seed', 'density'):
+        if getattr(args, name) is not None:
+            return '--' + name + ' cannot be used when resuming ' + args.board
+    if args.packed and not board.packed:
+        return args.board + ' is not packed'
+    if args.size is not None and \
+       [int(i) for i in args.size.split(',')] != [board.width, board.height]:
+        return '--size {0} does not match the size of {1}, {2},{3}'.format(
+            args.size, args.board, board.width, board.height)
+    if args.rule is not None:
+        try:
+            if conway.Rule(args.rule) != conway.Rule(board.rule):
+                return '--rule {0} does not match the rule of {1}, {2}'.format(
+                    args.rule, args.board, board.rule)
+        except ValueError as e:
+            return str(e)
+
+    return None
+
+def _run_mapped(args, board: mapped.MappedBoard, start: float) -> int:
+    """Step a board file, flushing it afterwards as a checkpoint.
+
+    The board is stepped with the rule recorded in its header.
+
+    Post:
+        The board file is modified and closed.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        board (mapped.MappedBoard): The board to step.
+        start (float): perf_counter time setup started.
+    Returns:
+        int: Exit status.
+    """
+    size = [board.width, board.height]
+    table = conway.Rule(board.rule).table
+    living = board.count()
+    setup = time.perf_counter() - start
+
+    # The board is not wrapped in a State, which would count it all in memory.
+    begin = time.perf_counter()
+    for _ in range(args.generations):
+        living = mapped.increment(board, table=table, boundary=args.boundary)
+    elapsed = time.perf_counter() - begin
+
+    if args.output is not None:
+        _export(args.output, board, board.rule)
+    board.close()
+
+    return _report(args, size, setup, elapsed, living)
+
+def _report(args, size: list, setup: float, elapsed: float, living: int) -> int:
+    """Print the results of a run.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        size (list): Width and height of the system.
+        setup (float): Setup time in seconds.
+        elapsed (float): Wall time spent stepping in seconds.
+        living (int): The final population.
+    Returns:
+        int: Exit status.
+    """
+    rate = args.generations / elapsed if elapsed > 0 else float('inf')
+    print("engine:          " + args.engine)
+    print("size:            {0}x{1}".format(size[0], size[1]))
+    print("generations:     {0}".format(args.generations))
+    print("setup time:      {0:.3f} s".format(setup))
+    print("wall time:       {0:.3f} s".format(elapsed))
+    print("generations/sec: {0:.2f}".format(rate))
+    print("cells/sec:       {0:.0f}".format(rate * size[0] * size[1]))
+    print("population:      {0}".format(living))
+
+    return 0
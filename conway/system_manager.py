@@ -5,6 +5,7 @@ __version__ = '0.1.0'
 
 from collections import Iterable
 import pygame
+import timing
 from ui import container
 
 class SystemManager(object):
@@ -18,8 +19,16 @@ class SystemManager(object):
         fps (int): Framerate. Default=60
         screen:
         running (bool): Flag indicating if the system is running.
+        dirty_threshold (float): Fraction of the screen that may change before
+                                 the whole display is updated instead of the
+                                 changed areas. Default=0.5
+        timer (timing.PhaseTimer): Times drawing the UI objects and copying
+                                   them to the screen as the draw phase, and
+                                   updating the display as the update phase.
+                                   Default=disabled
     Private Attributes:
         _fonts (dict): Fonts that have been added to the system.
+        _full (bool): Flag to update the whole display on the next render.
         _root (container.SurfaceContainer):
 
     Args:
@@ -34,11 +43,14 @@ class SystemManager(object):
         self.clock = pygame.time.Clock()
         self.fps = 60
         self.running = True
+        self.dirty_threshold = 0.5
+        self.timer = timing.PhaseTimer()
         self.screen = pygame.display.set_mode(screen_size, screen_opt)
 
         pygame.display.set_caption(caption)
 
         self._fonts = {}
+        self._full = True
         self._root = container.SurfaceContainer([0,0,screen_size[0], screen_size[1]])
 
     def add_font(self, font_name: str, font: pygame.font.Font):
@@ -83,17 +95,50 @@ class SystemManager(object):
         """
         pygame.quit()
 
+    def redraw_all(self):
+        """Show every container and update the whole display on the next render.
+
+        Post:
+            _full is modified.
+        """
+        self._full = True
+
     def render(self):
         """Handle the rendering of the system.
 
+        Only the dirty areas of each container are copied to the screen and
+        passed to pygame.display.update, unless they cover more than
+        dirty_threshold of the screen. Areas of overlapping containers are
+        merged first, so no part of the screen is counted or updated twice.
+
         Post:
             screen is modified.
             _root objects may be modified.
         """
-        for i in self._root.objects:
-            if isinstance(i, container.SurfaceContainer):
-                for j in i.objects:
-                    j.draw(i.surface)
-                self.screen.blit(i.surface, (i.rect.x, i.rect.y))
-
-        pygame.display.update()
+        rects = []
+        with self.timer.time('draw'):
+            for i in self._root.objects:
+                if isinstance(i, container.SurfaceContainer):
+                    for j in i.objects:
+                        i.add_dirty(j.draw(i.surface))
+
+                    if self._full:
+                        i.dirty = [i.surface.get_rect()]
+
+                    for r in i.dirty:
+                        r = r.clip(i.surface.get_rect())
+                        if r.w > 0 and r.h > 0:
+                            self.screen.blit(i.surface, (i.rect.x + r.x, i.rect.y + r.y), r)
+                            rects.append(r.move(i.rect.x, i.rect.y))
+                    i.dirty = []
+
+        rects = container.merge_dirty(rects)
+        area = sum(r.w * r.h for r in rects)
+        screen_area = self.screen.get_width() * self.screen.get_height()
+        with self.timer.time('update'):
+            if self._full or area > self.dirty_threshold * screen_area:
+                pygame.display.update()
+            elif rects:
+                pygame.display.update(rects)
+
+        self._full = False
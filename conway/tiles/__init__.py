@@ -3,4 +3,4 @@ __license__ = "MIT"
 
 __version__ = "0.2.0"
 
-__all__ = ['tilemap', 'tile']
+__all__ = ['tilemap', 'tile', 'pixelmap']
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Module to handle the density levels of a grid of cells.
+
+Density levels are the mipmaps of a grid: level k holds the number of living
+cells in every 2^k x 2^k block. A renderer showing more than one cell per screen
+pixel draws from the level whose blocks are about a pixel, so the work done
+follows the number of pixels drawn instead of the number of cells.
+
+The levels are kept up to date from the cells that were born or died since the
+last update, and only rebuilt when a large part of the grid changed.
+
+Attributes:
+    rebuild_fraction (float): The fraction of cells changed beyond which the
+                              levels are rebuilt instead of updated.
+"""
+
+import numpy
+
+rebuild_fraction = 1 / 16
+
+class DensityLevels(object):
+    """Block population counts of a grid of cells at every power of two.
+
+    Blocks on the right and bottom edges are cut short by the grid, so their
+    counts are of the cells that lie in the grid.
+
+    Attributes:
+        depth (int): The number of levels.
+    Private Attributes:
+        _levels (list): Level k is _levels[k - 1]; an array of shape
+                        (ceil(height / 2^k), ceil(width / 2^k)) of the smallest
+                        unsigned dtype that holds 4^k.
+
+    Args:
+        width  (int): The width of the grid in cells.
+        height (int): The height of the grid in cells.
+        depth  (int): The number of levels; None for enough levels to reduce
+                      the grid to a single block.
+    """
+
+    def __init__(self, width: int, height: int, depth: int = None):
+        if depth is None:
+            depth = max(int(max(width, height) - 1).bit_length(), 1)
+
+        self.depth = depth
+        self._size = [width, height]
+        self._levels = []
+        for k in range(1, depth + 1):
+            blocks = (-(-height >> k), -(-width >> k))
+            self._levels.append(numpy.zeros(blocks, dtype=_count_dtype(k)))
+
+    @property
+    def size(self):
+        """Return the size of the grid in cells.
+
+        Returns:
+          list
+        """
+        return self._size
+
+    def level(self, k: int) -> numpy.ndarray:
+        """Return the counts of the level with blocks of 2^k x 2^k cells.
+
+        Args:
+            k (int): The level, [1, depth].
+        Returns:
+            numpy.ndarray
+        Errors:
+            ValueError: if k is outside of [1, depth].
+        """
+        if k < 1 or k > self.depth:
+            raise ValueError(str(k) + " outside of level range.")
+
+        return self._levels[k - 1]
+
+    def reset(self, alive: numpy.ndarray):
+        """Rebuild every level from the cells.
+
+        Post:
+            Every level is modified.
+
+        Args:
+            alive (numpy.ndarray): 2D bool array of the living cells.
+        """
+        counts = alive
+        for level in self._levels:
+            counts = _reduce(counts, level.shape, level.dtype)
+            level[...] = counts
+
+    def update(self, alive: numpy.ndarray, was_alive: numpy.ndarray):
+        """Bring every level up to date with the cells.
+
+        Only the blocks holding cells that were born or died are changed,
+        unless more than rebuild_fraction of the cells changed.
+
+        Post:
+            Every level is modified.
+
+        Args:
+            alive     (numpy.ndarray): 2D bool array of the living cells.
+            was_alive (numpy.ndarray): 2D bool array of the living cells at the
+                                       last update.
+        """
+        changed = alive != was_alive
+        if numpy.count_nonzero(changed) > alive.size * rebuild_fraction:
+            self.reset(alive)
+            return
+
+        ys, xs = numpy.nonzero(changed)
+
+        # Merge the changes falling in the same block at every level, so each
+        # level is written once per changed block.
+        change = numpy.where(alive[ys, xs], 1, -1)
+        for level in self._levels:
+            ys >>= 1
+            xs >>= 1
+            blocks, inverse = numpy.unique(ys * level.shape[1] + xs, return_inverse=True)
+            change = numpy.bincount(inverse.ravel(), weights=change).astype(numpy.int64)
+
+            moved = change != 0
+            blocks = blocks[moved]
+            change = change[moved]
+            level.flat[blocks] = (level.flat[blocks] + change).astype(level.dtype)
+            ys, xs = numpy.divmod(blocks, level.shape[1])
+
+def _count_dtype(k: int):
+    """Return the smallest unsigned dtype holding the population of a block.
+
+    Args:
+        k (int): The level.
+    Returns:
+        numpy.dtype
+    """
+    for dtype in (numpy.uint8, numpy.uint16, numpy.uint32):
+        if 4 ** k <= numpy.iinfo(dtype).max:
+            return dtype
+    return numpy.uint64
+
+def _reduce(counts: numpy.ndarray, shape: tuple, dtype) -> numpy.ndarray:
+    """Sum 2x2 blocks of counts.
+
+    Args:
+        counts (numpy.ndarray): 2D array of the level below.
+        shape (tuple): Shape of the level.
+        dtype (numpy.dtype): dtype of the level.
+    Returns:
+        numpy.ndarray
+    """
+    if counts.shape != (shape[0] * 2, shape[1] * 2):
+        padded = numpy.zeros((shape[0] * 2, shape[1] * 2), dtype=dtype)
+        padded[:counts.shape[0], :counts.shape[1]] = counts
+        counts = padded
+
+    # Adding the four corners of the blocks is much faster than summing over
+    # the axes of a reshaped view.
+    total = numpy.add(counts[0::2, 0::2], counts[0::2, 1::2], dtype=dtype)
+    total += counts[1::2, 0::2]
+    total += counts[1::2, 1::2]
+    return total
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""Module to handle the PixelMap renderer.
+
+A PixelMap is an alternative to TileMap that keeps one color per cell in an
+array instead of a Tile per cell. Rendering copies only the visible cells to a
+surface, scales it to the tile size and blits it once, so frame time does not
+grow with the number of cells.
+
+The colors of a generation are held in a Colors object, so that they can be
+filled on a worker thread while the PixelMap draws the previous ones.
+
+When the camera is zoomed out so far that more than one cell falls on a screen
+pixel, the visible part is drawn from the density levels instead, shading each
+block of cells by how many of them are alive. The cells are then neither aged
+nor colored, so a generation costs a pass over the cells to update the levels
+rather than one per array of ages and colors.
+"""
+
+import math
+import numpy
+import pygame
+from . import density
+
+# Levels with blocks of at most this many cells are shaded through a table of
+# every population.
+_max_shade_table = 4 ** 8
+
+class Colors(object):
+    """The colors of one generation of cells, as drawn by a PixelMap.
+
+    conway.colorize_pixels fills them and PixelMap.render draws them. Besides
+    the color of every cell, the counts of a density level are copied when the
+    PixelMap asks for one.
+
+    Attributes:
+        level (int): The density level of counts, or 0 for none.
+        buffer (numpy.ndarray): uint8 RGBA array of shape (height, width, 4)
+                                holding the colors of the cells.
+        changed (numpy.ndarray): bool array of the cells whose color changed
+                                 since the colors were last drawn; kept only
+                                 while level is 0.
+        counts (numpy.ndarray): Copy of the counts of the density level, or
+                                None.
+
+    Args:
+        width       (int): The width of the map in cells.
+        height      (int): The height of the map in cells.
+    """
+
+    __slots__ = ('level', 'buffer', 'changed', 'counts')
+
+    def __init__(self, width, height):
+        self.level = 0
+        self.buffer = numpy.zeros((height, width, 4), dtype=numpy.uint8)
+        self.changed = numpy.zeros((height, width), dtype=bool)
+        self.counts = None
+
+    def merge(self, colors):
+        """Add the changes of colors that are replaced before being drawn.
+
+        Changes are only kept between colors of level 0; buffer is filled
+        whole when the level returns to 0.
+
+        Post:
+            changed is modified.
+
+        Args:
+            colors (Colors): The colors of the generation before.
+        """
+        if self.level == 0 and colors.level == 0:
+            self.changed |= colors.changed
+
+class PixelMap(object):
+    """PixelMap renders a grid of cells from an array of their colors.
+
+    Attributes:
+        ages (numpy.ndarray): uint16 array of the age of every cell, see
+                              conway.age.
+        aged (bool): Flag indicating if ages are up to date; they are not kept
+                     while a density level is drawn.
+        alive (numpy.ndarray): bool array of the cells last colorized, which
+                               the density levels are updated against.
+        lut (numpy.ndarray): Lookup table mapping ages to RGBA colors, see
+                             conway.palette.
+        colors (Colors): The colors drawn.
+        level (int): The density level the colors are to be filled with; set
+                     by render from the camera's zoom.
+        redraw (bool): Flag to trigger redrawing.
+        density (density.DensityLevels): Population counts of blocks of cells,
+                                         kept up to date by colorize_pixels.
+        density_lut (numpy.ndarray): uint8 array of shape (256, 4) shading a
+                                     block from the dead color, when empty, to
+                                     the newborn color, when full.
+
+    Args:
+        width       (int): The width of the map in cells.
+        height      (int): The height of the map in cells.
+        tile_size   (list): The size a cell is scaled to.
+        lut         (numpy.ndarray): Lookup table from conway.palette.
+    """
+
+    def __init__(self, width, height, tile_size=[32,32], lut=None):
+        self._tile_size = tile_size
+        self._size = [width, height]
+        self._cells = None
+        self._scaled = None
+        self._last = None
+
+        self.lut = lut if lut is not None else numpy.zeros((1, 4), dtype=numpy.uint8)
+        self.ages = numpy.zeros((height, width), dtype=numpy.uint16)
+        self.aged = True
+        self.alive = numpy.zeros((height, width), dtype=bool)
+        self.colors = self.new_colors()
+        self.level = 0
+        self.redraw = True
+
+        self.density = density.DensityLevels(width, height)
+        shade = numpy.linspace(0, 1, 256)[:, None]
+        dead = self.lut[0].astype(float)
+        born = self.lut[min(1, len(self.lut) - 1)].astype(float)
+        self.density_lut = numpy.round(dead + (born - dead) * shade).astype(numpy.uint8)
+        self._blocks = None
+        self._palette = None
+        self._shades = {}
+
+    @property
+    def tile_size(self):
+        """Return the size a cell is scaled to.
+
+        Returns:
+          list
+        """
+        return self._tile_size
+
+    @property
+    def tile_width(self):
+        """Return the width a cell is scaled to.
+
+        Returns:
+          int
+        """
+        return self._tile_size[0]
+
+    @property
+    def tile_height(self):
+        """Return the height a cell is scaled to.
+
+        Returns:
+          int
+        """
+        return self._tile_size[1]
+
+    @property
+    def size(self):
+        """Return the size of the map in cells.
+
+        Returns:
+          list
+        """
+        return self._size
+
+    @property
+    def buffer(self):
+        """Return the colors of the cells drawn.
+
+        Returns:
+          numpy.ndarray
+        """
+        return self.colors.buffer
+
+    @property
+    def changed(self):
+        """Return the cells whose color changed since they were last drawn.
+
+        Returns:
+          numpy.ndarray
+        """
+        return self.colors.changed
+
+    def new_colors(self) -> Colors:
+        """Return blank colors the size of the map.
+
+        Returns:
+            Colors
+        """
+        return Colors(self._size[0], self._size[1])
+
+    def show(self, colors: Colors):
+        """Draw other colors from now on, such as those of a SteppingWorker.
+
+        Post:
+            colors is modified.
+            redraw is modified.
+
+        Args:
+            colors (Colors)
+        """
+        self.colors = colors
+        self.redraw = True
+
+    def render(self, surface, cam) -> list:
+        """Render the visible cells onto the surface.
+
+        Only the cells within the camera's viewport are copied and scaled.
+        Nothing is done if neither the colors nor the camera have changed since
+        the last render. If the colors hold the counts of a density level, the
+        visible blocks are shaded and scaled instead of the cells.
+
+        Post:
+            surface is modified.
+            level is modified.
+            redraw is set to False.
+            changed is cleared within the viewport.
+
+        Args:
+            surface (SDL_Surface):
+            cam          (Camera):
+        Returns:
+            list: pygame.Rect areas of surface that changed. Changed cells are
+                  merged into one rect per run of changed rows; the whole area
+                  is returned if the camera moved or a density level was drawn.
+        """
+        view = (cam.x, cam.y, cam.viewport[0], cam.viewport[1], cam.zoom,
+                cam.offset[0], cam.offset[1])
+        if (not self.redraw and view == self._last) or cam.zoom <= 0:
+            return []
+
+        tw = self.tile_width
+        th = self.tile_height
+        x0 = max(int(cam.x // tw), 0)
+        y0 = max(int(cam.y // th), 0)
+        x1 = min(math.ceil((cam.x + cam.viewport[0] / cam.zoom) / tw), self._size[0])
+        y1 = min(math.ceil((cam.y + cam.viewport[1] / cam.zoom) / th), self._size[1])
+        self.level = self.level_for(cam.zoom)
+
+        colors = self.colors
+        k = colors.level
+        rects = []
+        if x1 > x0 and y1 > y0 and k > 0:
+            # Whole blocks of 2^k cells, scaled by the width of a block.
+            x0 = (x0 >> k) << k
+            y0 = (y0 >> k) << k
+            blocks = self._shade(k, colors.counts[y0 >> k:-(-y1 >> k), x0 >> k:-(-x1 >> k)])
+            span = (blocks.get_width() << k, blocks.get_height() << k)
+            rects.append(self._blit_scaled(surface, cam, blocks, (x0, y0), span))
+        elif x1 > x0 and y1 > y0:
+            size = (x1 - x0, y1 - y0)
+            if self._cells is None or self._cells.get_size() != size:
+                self._cells = pygame.Surface(size)
+            pygame.surfarray.blit_array(self._cells,
+                                        colors.buffer[y0:y1, x0:x1, :3].swapaxes(0, 1))
+            rect = self._blit_scaled(surface, cam, self._cells, (x0, y0), size)
+
+            changed = colors.changed[y0:y1, x0:x1]
+            if view != self._last:
+                rects.append(rect)
+            else:
+                for cells in _runs(changed):
+                    rects.append(pygame.Rect(rect.x + cells[0] * tw * cam.zoom,
+                                             rect.y + cells[1] * th * cam.zoom,
+                                             math.ceil(cells[2] * tw * cam.zoom),
+                                             math.ceil(cells[3] * th * cam.zoom)))
+            changed[...] = False
+
+        self._last = view
+        self.redraw = False
+
+        return rects
+
+    def level_for(self, zoom: float) -> int:
+        """Return the density level to draw at a zoom.
+
+        Args:
+            zoom (float): Camera zoom.
+        Returns:
+            int: The deepest level whose blocks are at most a screen pixel
+                 across, or 0 to draw the cells.
+        """
+        scale = min(self.tile_width, self.tile_height) * zoom
+        k = 0
+        while k < self.density.depth and scale * (2 << k) <= 1:
+            k += 1
+        return k
+
+    def _shade(self, k: int, counts: numpy.ndarray) -> pygame.Surface:
+        """Shade blocks of a density level by their population.
+
+        Args:
+            k (int): The density level.
+            counts (numpy.ndarray): Populations of the blocks.
+        Returns:
+            pygame.Surface: One pixel per block.
+        """
+
+        size = (counts.shape[1], counts.shape[0])
+        if self._blocks is None or self._blocks.get_size() != size:
+            self._blocks = pygame.Surface(size)
+        if self._palette is None:
+            self._palette = pygame.surfarray.map_array(
+                self._blocks, self.density_lut[None, :, :3]).ravel()
+
+        full = 4 ** k
+        if full <= _max_shade_table:
+            table = self._shades.get(k)
+            if table is None:
+                table = self._palette.take(_shades(numpy.arange(full + 1), full))
+                self._shades[k] = table
+            pixels = table.take(counts)
+        else:
+            pixels = self._palette.take(_shades(counts, full))
+        pygame.surfarray.blit_array(self._blocks, pixels.T)
+
+        return self._blocks
+
+    def _blit_scaled(self, surface, cam, source, cell: tuple, cells: tuple):
+        """Scale a surface covering cells by the zoom and blit it.
+
+        Post:
+            surface is modified.
+
+        Args:
+            surface (SDL_Surface): Surface to blit onto.
+            cam          (Camera):
+            source (SDL_Surface): Surface to scale.
+            cell (tuple): (x, y) of the top-left cell covered by source.
+            cells (tuple): (width, height) in cells covered by source.
+        Returns:
+            pygame.Rect: The area of surface blitted.
+        """
+        tw = self.tile_width
+        th = self.tile_height
+        size = (max(int(cells[0] * tw * cam.zoom), 1), max(int(cells[1] * th * cam.zoom), 1))
+        if self._scaled is None or self._scaled.get_size() != size:
+            self._scaled = pygame.Surface(size)
+
+        left = (cell[0] * tw - cam.x) * cam.zoom + cam.offset[0]
+        top = (cell[1] * th - cam.y) * cam.zoom + cam.offset[1]
+
+        pygame.transform.scale(source, size, self._scaled)
+        surface.blit(self._scaled, (left, top))
+
+        return pygame.Rect(left, top, size[0], size[1])
+
+
+def _shades(counts: numpy.ndarray, full: int) -> numpy.ndarray:
+    """Map block populations to indices of the density lookup table.
+
+    Shades are rounded up, so that a block with any living cell is not drawn
+    dead.
+
+    Args:
+        counts (numpy.ndarray): Populations of blocks.
+        full (int): The population of a full block.
+    Returns:
+        numpy.ndarray: uint8 array the same shape as counts.
+    """
+    return numpy.ceil(counts * (255 / full)).astype(numpy.uint8)
+
+def _runs(changed: numpy.ndarray) -> list:
+    """Merge changed cells into one rect per run of consecutive changed rows.
+
+    Args:
+        changed (numpy.ndarray): 2D bool array.
+    Returns:
+        list: (x, y, width, height) tuples in cells.
+    """
+    rows = numpy.flatnonzero(changed.any(axis=1))
+    if len(rows) == 0:
+        return []
+
+    runs = []
+    breaks = numpy.flatnonzero(numpy.diff(rows) > 1)
+    for first, last in zip(numpy.concatenate(([0], breaks + 1)),
+                           numpy.concatenate((breaks, [len(rows) - 1]))):
+        y0 = int(rows[first])
+        y1 = int(rows[last]) + 1
+        cols = numpy.flatnonzero(changed[y0:y1].any(axis=0))
+        runs.append((int(cols[0]), y0, int(cols[-1]) - int(cols[0]) + 1, y1 - y0))
+
+    return runs
@@ -3,25 +3,92 @@
 
 """tile.py
 
+Tiles do not own a surface. The surface for a tile is shared by every tile of
+the same size and color and is taken from a bounded cache when drawn.
+
+Attributes:
+    default_cache_size (int): The number of surfaces kept by surface_cache.
+    surface_cache (SurfaceCache): Cache used by Tile objects.
+
 TODO:
     * Handle textures
-    * Tile should derivie DirtySprite
 """
 
-from collections import Iterable
+from collections import OrderedDict
+from collections.abc import Iterable
 import pygame
 
-class Tile(pygame.sprite.Sprite):
+default_cache_size = 1024
+
+class SurfaceCache(object):
+    """A bounded cache of filled surfaces keyed by size and color.
+
+    The least recently used surface is dropped once the cache is full.
+
+    Args:
+        max_surfaces (int): The number of surfaces to keep.
     """
 
-    See:
-        https://www.pygame.org/docs/ref/sprite.html
+    def __init__(self, max_surfaces: int = default_cache_size):
+        self.max_surfaces = max_surfaces
+        self._surfaces = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def get(self, size, color: tuple) -> pygame.Surface:
+        """Return the surface of a size filled with a color.
+
+        Post:
+            The cache may be modified.
+
+        Args:
+            size (tuple): The size of the surface.
+            color (tuple): RGBA color.
+        Returns:
+            pygame.Surface
+        """
+        key = (size, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(size)
+            surface.fill(color)
+            self._surfaces[key] = surface
+
+            if len(self._surfaces) > self.max_surfaces:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+
+        return surface
+
+    def clear(self):
+        """Drop every surface.
+
+        Post:
+            The cache is emptied.
+        """
+        self._surfaces.clear()
+
+
+surface_cache = SurfaceCache()
+
+class Tile(object):
+    """A square of color in a tile map.
+
+    A tile holds only its size and RGBA color; its surface is shared through
+    surface_cache.
 
     Attributes:
-        image (pygame.Surface)
+        image (pygame.Surface): Shared surface of the tile's size and color.
         rect  (pygame.Rect)
+        key (tuple): RGBA color of the tile, for comparing without building a
+                     pygame.Color.
+        color (pygame.Color): Copy of the color of the tile.
+        redraw (bool): Flag to trigger redrawing.
     Private Attributes:
-        _color (pygame.Color)
+        _key (tuple): RGBA color of the tile.
+        _size (tuple)
     Args:
         size (list): The size of the tile.
         color (pygame.Color, Iterable): Color to fill the tile.
@@ -30,37 +97,70 @@ class Tile(pygame.sprite.Sprite):
         TypeError: if color is not pygame.Color or Iterable
     """
 
+    __slots__ = ('_size', '_key', 'redraw')
+
     def __init__(self, size, color=pygame.Color(255, 255, 255, 0), texture_id=0):
-        super().__init__()
+        self._size = tuple(size)
+        self._key = _color_key(color)
         self.redraw = True
 
-        self.image = pygame.Surface(size)
-        self.image.fill(color)
+    @property
+    def image(self):
+        """Return the surface of the tile.
 
-        if isinstance(color, pygame.Color):
-            self._color = color
-        elif isinstance(color, Iterable):
-            self._color = pygame.Color(color[0], color[1], color[2], color[3])
-        else:
-            raise TypeError("color must be pygame.Color or Iterable")
+        Returns:
+            pygame.Surface
+        """
+        return surface_cache.get(self._size, self._key)
+
+    def scaled(self, size) -> pygame.Surface:
+        """Return the surface of the tile drawn at another size.
+
+        Scaled surfaces are shared through surface_cache like image, so each
+        zoom level keeps one surface per color.
+
+        Args:
+            size (tuple): The size to draw the tile at.
+        Returns:
+            pygame.Surface
+        """
+        return surface_cache.get(size, self._key)
+
+    @property
+    def rect(self):
+        """Return the rect of the tile.
+
+        Returns:
+            pygame.Rect
+        """
+        return pygame.Rect(0, 0, self._size[0], self._size[1])
 
-        self.rect = self.image.get_rect()
+    @property
+    def key(self) -> tuple:
+        """Return the RGBA color of the tile.
+
+        Returns:
+            tuple
+        """
+        return self._key
 
     @property
     def color(self):
         """Return the color of the tile.
 
+        Each access builds a new pygame.Color; compare key instead where that
+        matters.
+
         Returns:
             pygame.Color
         """
-        return self._color
+        return pygame.Color(*self._key)
 
     @color.setter
     def color(self, color):
-        """Set the image to a new color.
+        """Set the tile to a new color.
 
         Post:
-            image is modified.
             color is modified.
             redraw is modified.
 
@@ -69,13 +169,23 @@ class Tile(pygame.sprite.Sprite):
         Errors:
             TypeError: if color is not pygame.Color or Iterable
         """
-        self.image.fill(color)
+        self._key = _color_key(color)
+        self.redraw = True
 
-        if isinstance(color, pygame.Color):
-            self._color = color
-        elif isinstance(color, Iterable):
-            self._color = pygame.Color(color[0], color[1], color[2], color[3])
-        else:
-            raise TypeError("color must be pygame.Color or Iterable")
 
-        self.redraw = True
+def _color_key(color) -> tuple:
+    """Return the RGBA tuple for a color.
+
+    Args:
+        color (pygame.Color, Iterable)
+    Returns:
+        tuple
+    Errors:
+        TypeError: if color is not pygame.Color or Iterable
+    """
+    if isinstance(color, pygame.Color):
+        return (color.r, color.g, color.b, color.a)
+    elif isinstance(color, Iterable):
+        return (color[0], color[1], color[2], color[3])
+    else:
+        raise TypeError("color must be pygame.Color or Iterable")
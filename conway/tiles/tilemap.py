@@ -6,34 +6,56 @@ Attributes:
                                        used when instantiating the TileMap object.
 """
 
+import os
+from collections import OrderedDict
+import numpy
 import pygame
 from . import tile
 
 default_tile_color = pygame.Color(255,255,255,255)
 
+# Estimated bytes used by a Tile; surfaces are shared through tile.surface_cache.
+_tile_bytes = 160
+
 class TileMap(object):
     """TileMap is a data structure containing tiles to for a map.
 
     The TileMap is divided up into a number of chunks each of a given width and
     height, and each tile is of equal size.
 
+    Chunks are only created the first time they are accessed. If a memory
+    budget is given, the least recently used chunks are evicted once the
+    estimated size of the allocated chunks exceeds it; the current chunk is
+    never evicted. Evicted chunks are recreated with tile_color unless a spill
+    directory is given, in which case the colors of their tiles are saved there
+    and restored when the chunk is next accessed.
+
     Args:
         width       (int): The width of a chunk in the tile map.
         height      (int): The height of a chunk in the tile map.
         num_chunks  (int): The number of chunks in the tile map.
         tile_size   (list): The size of a Tile in the tile map.
+        tile_color  (pygame.Color): The initial color of the tiles.
+        memory_budget (int): Estimated bytes the allocated chunks may use; None
+                             for no limit.
+        spill_dir   (str): Directory evicted chunks are saved to; None to
+                           discard them.
     """
 
     def __init__(self, width, height, num_chunks=1, tile_size=[32,32],
-                 tile_color: pygame.Color = default_tile_color):
+                 tile_color: pygame.Color = default_tile_color,
+                 memory_budget: int = None, spill_dir: str = None):
         self._tile_size = tile_size
+        self._tile_shape = tuple(tile_size)
+        self._tile_color = tile_color
         self._current_chunk = 1
         self._total_chunks = num_chunks
         self._chunk_size = [width, height]
-        self._map = [[[tile.Tile(size=tile_size, color=tile_color)
-                        for x in range(width)]
-                     for y in range(height)]
-                    for z in range(num_chunks)]
+        self._memory_budget = memory_budget
+        self._spill_dir = spill_dir
+        self._current = None
+        self._map = OrderedDict()
+        self._last_view = None
 
     @property
     def tile_size(self):
@@ -113,6 +135,26 @@ class TileMap(object):
             raise ValueError(str(value) + " outside of chunk range.")
 
         self._current_chunk = value
+        self._current = self._load(value)
+        self._last_view = None
+
+    @property
+    def chunk_bytes(self):
+        """Return the estimated number of bytes used by a chunk.
+
+        Returns:
+          int
+        """
+        return self._chunk_size[0] * self._chunk_size[1] * _tile_bytes
+
+    @property
+    def loaded_chunks(self):
+        """Return the allocated chunks from least to most recently used.
+
+        Returns:
+          list
+        """
+        return list(self._map.keys())
 
     def get_center(self):
         """Return the coordinates of the center point.
@@ -128,7 +170,10 @@ class TileMap(object):
         Returns:
           list
         """
-        return self._map[self._current_chunk-1]
+        if self._current is None:
+            self._current = self._load(self._current_chunk)
+
+        return self._current
 
     def get_chunk(self, chunk):
         """Return the specified chunk.
@@ -139,33 +184,136 @@ class TileMap(object):
         if chunk <= 0 or chunk > self._total_chunks:
             return None
 
-        return self._map[chunk-1]
+        return self._load(chunk)
 
     def render(self, surface, cam):
         """Render the world onto the screen.
 
+        Only the tiles within the camera's viewport are visited; the range is
+        computed from the camera's position, viewport and zoom. Tiles are drawn
+        at their size scaled by the zoom, rounded to whole pixels, with the
+        scaled surfaces taken from tile.surface_cache. Every visible tile is
+        drawn if the camera has changed since the last render.
+
         Post:
             surface is modified.
 
         Args:
             surface (SDL_Surface):
             cam          (Camera):
+        Returns:
+            list: pygame.Rect areas of surface that were drawn, with tiles
+                  drawn next to each other in a column merged.
         """
+        if cam.zoom <= 0:
+            return []
+
+        step_x = max(int(round(self.tile_width * cam.zoom)), 1)
+        step_y = max(int(round(self.tile_height * cam.zoom)), 1)
+        size = (step_x, step_y)
+        scroll_x = int(round(cam.x * cam.zoom))
+        scroll_y = int(round(cam.y * cam.zoom))
+        left = cam.offset[0] - scroll_x
+        top = cam.offset[1] - scroll_y
+
+        x0, x1 = _visible(scroll_x, cam.viewport[0], step_x, self.chunk_width)
+        y0, y1 = _visible(scroll_y, cam.viewport[1], step_y, self.chunk_height)
+
+        view = (size, left, top, x0, x1, y0, y1)
+        moved = view != self._last_view
+        self._last_view = view
+
+        rects = []
         chunk = self.get_current_chunk()
-        for x in range(cam.x, cam.viewport[0], self.tile_width):
-            x_tile = int(x / self.tile_width)
-            if x_tile >= 0 and x_tile < self.chunk_width:
-                for y in range(cam.y, cam.viewport[1], self.tile_height):
-                    y_tile = int(y / self.tile_height)
+        blit = surface.blit
+        for x_tile in range(x0, x1):
+            tl_x = left + x_tile * step_x
+            run = None
+            for y_tile in range(y0, y1):
+                t = chunk[y_tile][x_tile]
+                if moved or t.redraw:
+                    tile_rect = blit(t.scaled(size), (tl_x, top + y_tile * step_y))
+                    t.redraw = False
+
+                    if run is not None and run.bottom == tile_rect.top:
+                        run.h += tile_rect.h
+                    else:
+                        run = tile_rect
+                        rects.append(run)
+                else:
+                    run = None
+
+        return rects
+
+
+    def _load(self, chunk):
+        """Return a chunk, allocating it if needed, and mark it most recent.
 
-                    if y_tile >= 0 and y_tile < self.chunk_height:
-                        if chunk[y_tile][x_tile].redraw == True:
-                            wc = screen_to_world([x, y], cam.position)
-                            tl_x = (wc[0] * cam.zoom) + cam.offset[0]
-                            tl_y = (wc[1] * cam.zoom) + cam.offset[1]
+        Post:
+            _map is modified.
 
-                            surface.blit(chunk[y_tile][x_tile].image, [tl_x, tl_y])
-                            chunk[y_tile][x_tile].redraw = False
+        Args:
+            chunk (int): 1-based chunk number.
+        Returns:
+          list
+        """
+        if chunk in self._map:
+            self._map.move_to_end(chunk)
+            return self._map[chunk]
+
+        path = self._spill_path(chunk)
+        if path is not None and os.path.exists(path):
+            colors = numpy.load(path).tolist()
+            os.remove(path)
+            tiles = [[tile.Tile(size=self._tile_shape, color=colors[y][x])
+                      for x in range(self.chunk_width)]
+                     for y in range(self.chunk_height)]
+        else:
+            tiles = [[tile.Tile(size=self._tile_shape, color=self._tile_color)
+                      for x in range(self.chunk_width)]
+                     for y in range(self.chunk_height)]
+
+        self._map[chunk] = tiles
+        self._evict(chunk)
+
+        return tiles
+
+    def _evict(self, keep):
+        """Evict least recently used chunks until the budget is met.
+
+        Post:
+            _map is modified.
+
+        Args:
+            keep (int): Chunk that must not be evicted besides the current one.
+        """
+        if self._memory_budget is None:
+            return
+
+        for chunk in list(self._map.keys()):
+            if len(self._map) * self.chunk_bytes <= self._memory_budget:
+                break
+            if chunk == self._current_chunk or chunk == keep:
+                continue
+
+            tiles = self._map.pop(chunk)
+            path = self._spill_path(chunk)
+            if path is not None:
+                numpy.save(path, numpy.array([[tuple(t.color) for t in row]
+                                              for row in tiles], dtype=numpy.uint8))
+
+    def _spill_path(self, chunk):
+        """Return the file an evicted chunk is saved to.
+
+        Args:
+            chunk (int): 1-based chunk number.
+        Returns:
+          str: None if there is no spill directory.
+        """
+        if self._spill_dir is None:
+            return None
+
+        return os.path.join(self._spill_dir, "chunk-" + str(chunk) + ".npy")
 
 
 def screen_to_world(screen_coord, cam_coord):
@@ -178,3 +326,18 @@ def screen_to_world(screen_coord, cam_coord):
       list
     """
     return [screen_coord[0] - cam_coord[0], screen_coord[1] - cam_coord[1]]
+
+def _visible(scroll, extent, step, tiles):
+    """Return the range of tiles along an axis within the camera's viewport.
+
+    Args:
+        scroll (int): Camera position along the axis, in screen pixels.
+        extent (int): Viewport length along the axis, in screen pixels.
+        step   (int): Scaled tile length along the axis, in screen pixels.
+        tiles  (int): Number of tiles along the axis.
+    Returns:
+        tuple: (first, last + 1) tile indices, clipped to the chunk.
+    """
+    first = max(scroll // step, 0)
+    last = min(-(-(scroll + extent) // step), tiles)
+    return first, max(last, first)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""timing.py: Per-phase timing for the conway system.
+
+A PhaseTimer times the phases of a frame (stepping, colorizing, rendering,
+drawing the UI and updating the display) with a monotonic clock and keeps the
+latest samples of each phase for rolling percentiles. Samples can also be kept
+as trace events and written out as JSON lines or as a Chrome trace, which
+chrome://tracing and Perfetto open. Only the latest trace_limit events are
+kept, so a long session traces its last minutes instead of growing without end.
+
+A disabled timer hands out a shared context manager that does nothing, so
+leaving the timing calls in the hot paths costs a method call per phase.
+
+Attributes:
+    trace_limit (int): The default number of latest trace events kept.
+"""
+
+import time, threading, collections, json, os
+
+trace_limit = 1 << 20
+
+class _NullPhase(object):
+    """Context manager of a disabled timer."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_null_phase = _NullPhase()
+
+class _Phase(object):
+    """Context manager timing one run of a phase."""
+
+    __slots__ = ('_timer', '_name', '_start')
+
+    def __init__(self, timer, name: str):
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._timer.add(self._name, self._start, time.perf_counter())
+        return False
+
+class PhaseTimer(object):
+    """Times the phases of a frame.
+
+    Attributes:
+        enabled (bool): Flag indicating if phases are timed.
+        window (int): The number of latest samples kept per phase.
+        tracing (bool): Flag indicating if samples are kept as trace events.
+    Private Attributes:
+        _epoch (float): perf_counter time the timer was created.
+        _events (collections.deque): (name, thread id, start, duration) of
+                                     the latest trace_limit samples while
+                                     tracing.
+        _lock (threading.Lock): Guards the samples; phases may be timed on
+                                other threads.
+        _samples (dict): Phase name to a deque of durations in seconds.
+
+    Args:
+        enabled (bool): Time phases.
+        window (int): The number of latest samples kept per phase.
+        tracing (bool): Keep samples for export.
+        trace_limit (int): The number of latest samples kept for export.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 240,
+                 tracing: bool = False, trace_limit: int = trace_limit):
+        self.enabled = enabled or tracing
+        self.window = window
+        self.tracing = tracing
+
+        self._epoch = time.perf_counter()
+        self._events = collections.deque(maxlen=trace_limit)
+        self._lock = threading.Lock()
+        self._samples = collections.OrderedDict()
+
+    def time(self, name: str):
+        """Return a context manager that times the phase it wraps.
+
+        Args:
+            name (str): Name of the phase.
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _null_phase
+        return _Phase(self, name)
+
+    def add(self, name: str, start: float, end: float):
+        """Add a sample of a phase.
+
+        Post:
+            _samples is modified.
+            _events is modified if tracing.
+
+        Args:
+            name (str): Name of the phase.
+            start (float): perf_counter time the phase started.
+            end (float): perf_counter time the phase ended.
+        """
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = collections.deque(maxlen=self.window)
+                self._samples[name] = samples
+            samples.append(end - start)
+
+            if self.tracing:
+                self._events.append((name, threading.get_ident(), start, end - start))
+
+    @property
+    def phases(self) -> list:
+        """Return the names of the phases timed, in the order first timed.
+
+        Returns:
+            list
+        """
+        with self._lock:
+            return list(self._samples)
+
+    def stats(self, name: str) -> tuple:
+        """Return the rolling percentiles of a phase.
+
+        Args:
+            name (str): Name of the phase.
+        Returns:
+            tuple: (p50, p95, max) in seconds, or None if the phase has not
+                   been timed.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if not samples:
+            return None
+
+        return (_percentile(samples, 0.5), _percentile(samples, 0.95), samples[-1])
+
+    def summary(self) -> str:
+        """Return a line of the p50/p95/max of every phase in milliseconds.
+
+        Returns:
+            str
+        """
+        parts = []
+        for name in self.phases:
+            p50, p95, most = self.stats(name)
+            parts.append("%s %.1f/%.1f/%.1f" % (name, p50 * 1000, p95 * 1000, most * 1000))
+        return "  ".join(parts)
+
+    def export(self, path: str):
+        """Write the trace events to a file.
+
+        Files ending in .jsonl are written as one JSON object per sample;
+        anything else is written as a Chrome trace.
+
+        Pre:
+            tracing is True.
+
+        Args:
+            path (str): Path of the file.
+        """
+        with self._lock:
+            events = list(self._events)
+
+        pid = os.getpid()
+        with open(path, 'w') as f:
+            if path.endswith('.jsonl'):
+                for name, tid, start, duration in events:
+                    f.write(json.dumps({'phase': name, 'thread': tid,
+                                        'start': start - self._epoch,
+                                        'duration': duration}))
+                    f.write('\n')
+            else:
+                json.dump({'traceEvents': [
+                    {'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                     'ts': (start - self._epoch) * 1e6, 'dur': duration * 1e6}
+                    for name, tid, start, duration in events],
+                    'displayTimeUnit': 'ms'}, f)
+
+def _percentile(samples: list, fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted samples.
+
+    Args:
+        samples (list): Sorted, non-empty samples.
+        fraction (float): The percentile as a fraction of 1.
+    Returns:
+        float
+    """
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
@@ -10,6 +10,8 @@ class SurfaceContainer(ui_object.UIObject):
 
     Attributes:
         surface (pygame.Surface)
+        dirty (list): pygame.Rect areas of surface, in surface coordinates,
+                      that changed since the container was last shown.
 
     Args:
         rect (pygame.Rect)
@@ -36,6 +38,68 @@ class SurfaceContainer(ui_object.UIObject):
         else:
             raise TypeError("surface must be type pygame.Surface, Iterable, or None")
         self.objects = []
+        self.dirty = [self.surface.get_rect()]
 
     def add(self, obj: ui_object.UIObject):
-        self.objects.append(obj)
\ No newline at end of file
+        self.objects.append(obj)
+
+    def add_dirty(self, rects):
+        """Mark areas of the surface as changed.
+
+        Post:
+            dirty is modified.
+
+        Args:
+            rects (pygame.Rect, Iterable, None): A rect, a list of rects or
+                                                 None for no change.
+        """
+        if rects is None:
+            return
+        elif isinstance(rects, pygame.Rect):
+            self.dirty.append(rects)
+        else:
+            self.dirty.extend(rects)
+
+def merge_dirty(rects) -> list:
+    """Return disjoint rects covering the same area as rects.
+
+    The rects are cut into bands at every top and bottom edge and the
+    overlapping spans of each band are merged; a span that carries on
+    unchanged into the next band grows its rect down instead.
+
+    Args:
+        rects (Iterable): pygame.Rect areas, which may overlap.
+    Returns:
+        list: pygame.Rect
+    """
+    rects = sorted((r for r in rects if r.w > 0 and r.h > 0), key=lambda r: r.top)
+    edges = sorted({y for r in rects for y in (r.top, r.bottom)})
+
+    merged = []
+    active = []
+    growing = {}
+    i = 0
+    for top, bottom in zip(edges, edges[1:]):
+        while i < len(rects) and rects[i].top <= top:
+            active.append(rects[i])
+            i += 1
+        active = [r for r in active if r.bottom > top]
+
+        spans = []
+        for left, right in sorted((r.left, r.right) for r in active):
+            if spans and left <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], right)
+            else:
+                spans.append([left, right])
+
+        band = {}
+        for left, right in spans:
+            rect = growing.get((left, right))
+            if rect is None:
+                rect = pygame.Rect(left, top, right - left, 0)
+                merged.append(rect)
+            rect.h = bottom - rect.top
+            band[(left, right)] = rect
+        growing = band
+
+    return merged
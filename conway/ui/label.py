@@ -1,10 +1,112 @@
 # -*- coding: utf-8 -*=
-"""label.py: A rect containing text for rndering purposes."""
+"""label.py: A rect containing text for rndering purposes.
+
+Text made only of glyphs, such as the numbers of the counters, is drawn from a
+GlyphAtlas shared by every label of the same font and colors instead of being
+rendered by the font each time it changes.
+
+Attributes:
+    glyphs (str): Characters drawn from a GlyphAtlas.
+"""
 
 from collections import Iterable
 import pygame
 from . import ui_object
 
+glyphs = "0123456789.-"
+
+class GlyphAtlas(object):
+    """A surface holding the rendered glyphs of a font, side by side.
+
+    Text is drawn by blitting the area of each of its glyphs, advancing by the
+    glyph's advance in the font. Kerning is not applied, so numbers keep the
+    same width for the same number of digits.
+
+    Private Attributes:
+        _advances (dict): Glyph to its advance in pixels.
+        _areas (dict): Glyph to pygame.Rect of the glyph in _surface.
+        _height (int): Height of the font.
+        _surface (pygame.Surface): The rendered glyphs.
+
+    Args:
+        font (pygame.font.Font)
+        antialias (int): Render with antialiasing.
+        foreground (pygame.Color, list): The text color.
+        chars (str): The glyphs of the atlas.
+    """
+
+    def __init__(self, font: pygame.font.Font, antialias, foreground,
+                 chars: str = glyphs):
+        rendered = [font.render(c, antialias, foreground) for c in chars]
+
+        self._height = font.size(chars)[1]
+        self._surface = pygame.Surface((sum(r.get_width() for r in rendered),
+                                        max([self._height] + [r.get_height() for r in rendered])),
+                                       pygame.SRCALPHA)
+        self._advances = {c: m[4] for c, m in zip(chars, font.metrics(chars))}
+        self._areas = {}
+        x = 0
+        for c, image in zip(chars, rendered):
+            # Copy the glyph, alpha included, rather than blend it.
+            self._areas[c] = self._surface.blit(image, (x, 0),
+                                                special_flags=pygame.BLEND_RGBA_MAX)
+            x += image.get_width()
+
+    def __contains__(self, text: str) -> bool:
+        return all(c in self._areas for c in text)
+
+    def size(self, text: str) -> tuple:
+        """Return the size of text drawn from the atlas.
+
+        Args:
+            text (str)
+        Returns:
+            tuple
+        """
+        return (sum(self._advances[c] for c in text), self._height)
+
+    def draw(self, surface, text: str, position) -> pygame.Rect:
+        """Draw text from the atlas onto the surface.
+
+        Pre:
+            Every character of text is in the atlas.
+        Post:
+            surface is modified.
+
+        Args:
+            surface (pygame.Surface)
+            text (str)
+            position (list): Top-left of the text on surface.
+        Returns:
+            pygame.Rect: The area of surface covered by the text.
+        """
+        x, y = position[0], position[1]
+        for c in text:
+            surface.blit(self._surface, (x, y), self._areas[c])
+            x += self._advances[c]
+
+        return pygame.Rect(position[0], position[1], x - position[0], self._height)
+
+_atlases = {}
+
+def atlas(font: pygame.font.Font, antialias, foreground) -> GlyphAtlas:
+    """Return the GlyphAtlas of a font and color, building it once.
+
+    Args:
+        font (pygame.font.Font)
+        antialias (int): Render with antialiasing.
+        foreground (pygame.Color, list): The text color.
+    Returns:
+        GlyphAtlas
+    """
+    key = (font, bool(antialias), tuple(foreground))
+    glyph_atlas = _atlases.get(key)
+    if glyph_atlas is None:
+        glyph_atlas = GlyphAtlas(font, antialias, foreground)
+        _atlases[key] = glyph_atlas
+
+    return glyph_atlas
+
 class Label(ui_object.UIObject):
     """A Label is a simple rect that can render text.
 
@@ -13,8 +115,8 @@ class Label(ui_object.UIObject):
     Private Attributes:
         _font (pygame.Font): Font object
         _foreground (pygame.Color,list): Color the text will be rendered.
-        _old_text_size (list): The size of the previous text used to clear the
-                               surface.
+        _old_text_size (list): The size of the text last drawn, used to clear
+                               the surface.
         _text (str): Text to be rendered.
         _redraw (bool): Flag to trigger redrawing.
 
@@ -47,14 +149,29 @@ class Label(ui_object.UIObject):
 
         Args
             surface (pygame.Surface)
+        Returns
+            pygame.Rect: The area of surface covered by the old and new text, or
+                         None if nothing was drawn.
         """
         if self._redraw == True:
             surface.fill(self._background, [self.rect[0], self.rect[1],
                                             self._old_text_size[0], self._old_text_size[1]])
-            text = self._font.render(self._text, self.antialias, self._foreground)
-            surface.blit(text, self.rect)
+            glyph_atlas = atlas(self._font, self.antialias, self._foreground)
+            if self._text and self._text in glyph_atlas:
+                size = glyph_atlas.draw(surface, self._text, self.rect).size
+            else:
+                text = self._font.render(self._text, self.antialias, self._foreground)
+                surface.blit(text, self.rect)
+                size = text.get_size()
 
+            rect = pygame.Rect(self.rect[0], self.rect[1],
+                               max(self._old_text_size[0], size[0]),
+                               max(self._old_text_size[1], size[1]))
+            self._old_text_size = size
             self._redraw = False
+            return rect
+
+        return None
 
     @property
     def background(self) -> pygame.Color:
@@ -131,14 +248,15 @@ class Label(ui_object.UIObject):
     def text(self, text: str):
         """Change the text of the label.
 
+        Nothing is redrawn if the text is unchanged.
+
         Post:
-            _old_text_size is modified.
             _text is modified.
             _redraw is modified.
 
         Args:
             text (str): New text string.
         """
-        self._old_text_size = self._font.size(self._text)
-        self._text = text
-        self._redraw = True
+        if text != self._text:
+            self._text = text
+            self._redraw = True
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""worker.py: Background stepping for the conway system.
+
+A SteppingWorker steps a conway state on its own thread so a slow generation
+never blocks the event loop. Each finished generation is copied into a triple
+buffer: the worker writes the back buffer and swaps it with the ready buffer,
+and the renderer swaps the ready buffer with the front buffer it draws from, so
+neither side ever waits on the other for longer than a swap and the renderer
+always gets the latest completed generation. Generations finished faster than
+they are drawn are skipped over, never queued.
+
+Given a pixel map, the worker also colors each generation on its thread, into
+a triple buffer of tiles.pixelmap.Colors, so the renderer only draws the colors
+it is handed.
+
+The engines mutate the conway data in place, so it is stepped on a thread of
+this process; numpy releases the GIL for its array work, and the pure Python
+engine is preempted at the interpreter's switch interval.
+"""
+
+import threading, collections, contextlib
+import numpy
+
+Frame = collections.namedtuple('Frame', ['cells', 'generation', 'living', 'period',
+                                         'colors'])
+Frame.__doc__ = """A published generation.
+
+Attributes:
+    cells (numpy.ndarray): uint8 copy of the conway data, or None if the
+                           worker colors generations.
+    generation (int): The generation of cells.
+    living (int): The number of living cells.
+    period (int): The state's period; see conway.State.period.
+    colors (tiles.pixelmap.Colors): The colors of the generation, or None if
+                                    the worker does not color generations.
+"""
+
+class SteppingWorker(object):
+    """Steps a conway state on a background thread.
+
+    While the worker is busy the state belongs to it; wait() before touching
+    state or engine, and publish() afterwards to show the result.
+
+    Attributes:
+        state (conway.State): The conway state being stepped.
+        engine (callable): Engine as passed to conway.update.
+        timer (timing.PhaseTimer): Times each generation as the step phase, and
+                                   its coloring as the colorize phase, or None.
+
+    Args:
+        state (conway.State): The conway state.
+        engine (callable): Function that increments the conway data by one and
+                           returns the number of living cells.
+        on_step (callable): Called with the state on the worker thread after
+                            each generation, e.g. to record history.
+        timer (timing.PhaseTimer): Times each generation. Default=None
+        colorize (callable): conway.colorize_pixels, to color each generation
+                             for pixel_map. Default=None
+        pixel_map (tiles.pixelmap.PixelMap): The pixel map the generations are
+                                             colored for; its ages and density
+                                             levels belong to the worker.
+                                             Default=None
+    """
+
+    def __init__(self, state, engine, on_step=None, timer=None, colorize=None,
+                 pixel_map=None):
+        self.state = state
+        self.engine = engine
+        self.timer = timer
+        self._on_step = on_step
+        self._colorize = colorize
+        self._pixel_map = pixel_map
+
+        if colorize is not None:
+            self._buffers = [None, None, None]
+            self._colors = [pixel_map.new_colors() for _ in range(3)]
+        else:
+            shape = (state.height, state.width)
+            self._buffers = [numpy.zeros(shape, dtype=numpy.uint8) for _ in range(3)]
+            self._colors = [None, None, None]
+        self._meta = [None, None, None]
+        self._front, self._ready, self._back = 0, 1, 2
+        self._fresh = False
+        self._swap = threading.Lock()
+
+        self._pending = 0
+        self._busy = False
+        self._running = True
+        self._work = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def idle(self) -> bool:
+        """Return if no generations are being or waiting to be stepped.
+
+        Returns:
+          bool
+        """
+        with self._work:
+            return self._pending == 0 and not self._busy
+
+    def request(self, generations: int = 1):
+        """Ask for more generations to be stepped; returns immediately.
+
+        Args:
+            generations (int): The number of generations.
+        """
+        with self._work:
+            self._pending += generations
+            self._work.notify_all()
+
+    def wait(self, cancel: bool = False):
+        """Block until the worker is idle.
+
+        Args:
+            cancel (bool): Drop requested generations that were not started
+                           instead of waiting for them.
+        """
+        with self._work:
+            if cancel:
+                self._pending = 0
+            while self._busy or self._pending:
+                self._work.wait()
+
+    def latest(self) -> Frame:
+        """Return the latest completed generation, if not returned before.
+
+        The frame's cells and colors stay valid until the next call.
+
+        Returns:
+            Frame: None if no generation has completed since the last call.
+        """
+        with self._swap:
+            if not self._fresh:
+                return None
+            self._front, self._ready = self._ready, self._front
+            self._fresh = False
+
+        front = self._front
+        return Frame(self._buffers[front], *self._meta[front], self._colors[front])
+
+    def publish(self):
+        """Copy or color the state into the back buffer and make it the latest
+        frame.
+
+        Pre:
+            The worker is idle or this is the worker thread.
+        """
+        state = self.state
+        back = self._back
+        if self._colorize is not None:
+            colors = self._colors[back]
+            timer = self.timer
+            with timer.time('colorize') if timer is not None else contextlib.nullcontext():
+                self._colorize(state.conway, self._pixel_map, colors)
+                # The ready frame is replaced; if it was never drawn, its
+                # changes are still to be drawn. Only this thread sets fresh,
+                # so reading it unlocked at worst merges changes drawn already.
+                if self._fresh:
+                    colors.merge(self._colors[self._ready])
+        else:
+            self._buffers[back][...] = numpy.asarray(state.conway, dtype=numpy.uint8)
+        self._meta[back] = (state.generations, state.living, state.period)
+
+        with self._swap:
+            self._back, self._ready = self._ready, self._back
+            self._fresh = True
+
+    def close(self):
+        """Stop the worker thread once the current generation is done.
+
+        Post:
+            The worker can no longer be used.
+        """
+        with self._work:
+            self._running = False
+            self._pending = 0
+            self._work.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        """Worker thread: step the state while generations are pending."""
+        while True:
+            with self._work:
+                self._busy = False
+                self._work.notify_all()
+                while self._running and self._pending == 0:
+                    self._work.wait()
+                if not self._running:
+                    return
+                self._pending -= 1
+                self._busy = True
+
+            timer = self.timer
+            with timer.time('step') if timer is not None else contextlib.nullcontext():
+                self.state.living = self.engine(self.state.conway)
+            self.state.inc_generation()
+            if self._on_step is not None:
+                self._on_step(self.state)
+            self.publish()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, random, copy
+from conway import conway
+from conway.engines import active
+
+class TestActiveRegionMethods(unittest.TestCase):
+    def setUp(self):
+        random.seed(2)
+        self.grid = conway._seed(20, 15)
+        self.engine_grid = copy.deepcopy(self.grid)
+        self.engine = active.ActiveRegion(self.engine_grid)
+
+    def test_init(self):
+        self.assertEqual(self.engine.living, sum(map(sum, self.grid)))
+        self.assertEqual(len(self.engine.changed), 20 * 15)
+
+    def test_increment_matches_python(self):
+        for _ in range(15):
+            living = conway.increment(self.grid)
+            self.assertEqual(self.engine(self.engine_grid), living)
+            self.assertEqual(self.engine_grid, self.grid)
+
+    def test_increment_boundaries(self):
+        for boundary in ('torus', 'reflect'):
+            engine = active.ActiveRegion(self.engine_grid, boundary=boundary)
+            for _ in range(6):
+                living = conway.increment(self.grid, boundary=boundary)
+                self.assertEqual(engine(self.engine_grid), living)
+                self.assertEqual(self.engine_grid, self.grid)
+
+    def test_increment_rules(self):
+        for name in ('highlife', 'B0/S8'):
+            rule = conway.Rule(name)
+            engine = active.ActiveRegion(self.engine_grid, rule.table)
+            for _ in range(6):
+                living = conway.increment(self.grid, rule)
+                self.assertEqual(engine(self.engine_grid), living)
+                self.assertEqual(self.engine_grid, self.grid)
+
+    def test_still_life(self):
+        grid = [[0, 0, 0, 0],
+                [0, 1, 1, 0],
+                [0, 1, 1, 0],
+                [0, 0, 0, 0]]
+        engine = active.ActiveRegion(grid)
+
+        self.assertEqual(engine(grid), 4)
+        self.assertEqual(engine.changed, set())
+        self.assertEqual(engine(grid), 4)
+
+if __name__ == '__main__':
+    unittest.main()
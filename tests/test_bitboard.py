@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, random, time
+import numpy
+from conway import conway
+from conway.engines import bitboard
+
+class TestBitBoardMethods(unittest.TestCase):
+    def setUp(self):
+        random.seed(1)
+        self.grid = [[random.randint(0, 1) for _ in range(130)] for _ in range(12)]
+        self.board = bitboard.pack(self.grid)
+
+    def test_pack(self):
+        self.assertEqual(self.board.width, 130)
+        self.assertEqual(self.board.height, 12)
+        self.assertEqual(self.board.words.shape, (12, 3))
+        self.assertEqual(bitboard.unpack(self.board), self.grid)
+        self.assertEqual(self.board[3], self.grid[3])
+        self.assertEqual(len(self.board), 12)
+        self.assertEqual(self.board.count(), sum(map(sum, self.grid)))
+
+    def test_increment_matches_python(self):
+        for _ in range(10):
+            living = conway.increment(self.grid)
+            self.assertEqual(bitboard.increment(self.board), living)
+            self.assertEqual(bitboard.unpack(self.board), self.grid)
+
+    def test_increment_boundaries(self):
+        # Widths ending mid-word and on a word boundary.
+        for width in (130, 128):
+            for boundary in ('torus', 'reflect'):
+                grid = [row[:width] for row in self.grid]
+                board = bitboard.pack(grid)
+                for _ in range(6):
+                    living = conway.increment(grid, conway.Rule('highlife'), boundary)
+                    self.assertEqual(bitboard.increment(board, conway.Rule('highlife').table,
+                                                        boundary), living)
+                    self.assertEqual(bitboard.unpack(board), grid)
+
+    def test_increment_rules(self):
+        for name in ('highlife', 'daynight', 'seeds', 'B0/S8'):
+            rule = conway.Rule(name)
+            grid = [row[:] for row in self.grid]
+            board = bitboard.pack(grid)
+            for _ in range(6):
+                living = conway.increment(grid, rule)
+                self.assertEqual(bitboard.increment(board, rule.table), living)
+                self.assertEqual(bitboard.unpack(board), grid)
+
+    def test_compile(self):
+        # Bit m of input i is bit i of m, so bit m of the result is the next
+        # state for the inputs m; compare every input the adders produce.
+        inputs = tuple(numpy.array([sum(1 << m for m in range(32) if (m >> i) & 1)],
+                                   dtype=numpy.uint64) for i in range(5))
+        rng = numpy.random.RandomState(1)
+        for table in [conway.Rule('life').table] + [rng.randint(0, 2, (2, 9)) for _ in range(100)]:
+            expression, _ = bitboard._compile(table)
+            if expression is True or expression is False:
+                result = 0xFFFFFFFF if expression else 0
+            else:
+                result = int(bitboard._evaluate(expression, inputs, {})[0])
+            for m in range(32):
+                cell, sum0, bit1, carry1, carry = ((m >> i) & 1 for i in range(5))
+                count = sum0 + 2 * bit1 + 4 * (carry1 + carry)
+                if not (bit1 and carry) and count <= 8:
+                    self.assertEqual((result >> m) & 1, table[cell][count])
+
+        # Conway's rule compiles to ~carry1 & bit1 & (sum0 | cells).
+        self.assertEqual(bitboard._compile(conway.Rule('life').table)[0],
+                         ('and', (('not', 3), ('or', (0, 1)), 2)))
+
+    def test_compile_time(self):
+        # Rules with many prime implicants compile quickly too.
+        rng = numpy.random.RandomState(2)
+        tables = [[[1, 0, 0, 0, 1, 1, 1, 0, 1], [1, 1, 1, 0, 1, 1, 1, 1, 0]],
+                  [[1, 1, 1, 0, 1, 1, 1, 1, 0], [0, 1, 1, 1, 1, 0, 0, 1, 1]]]
+        for table in tables + [rng.randint(0, 2, (2, 9)) for _ in range(50)]:
+            bitboard._expressions.clear()
+            start = time.perf_counter()
+            bitboard._compile(numpy.array(table))
+            self.assertLess(time.perf_counter() - start, 0.1)
+
+    def test_bands(self):
+        # Stepping a band of rows at a time matches stepping them all at once.
+        table = conway.Rule('highlife').table
+        for boundary in ('dead', 'torus', 'reflect'):
+            whole = bitboard.next_words(self.board.words, 130, table, boundary)
+            for band in (1, 5):
+                self.assertTrue(numpy.array_equal(
+                    bitboard.next_words(self.board.words, 130, table, boundary, band),
+                    whole))
+
+    def test_coordinates(self):
+        cells = numpy.array(self.grid, dtype=numpy.uint8)
+        ys, xs = numpy.nonzero(cells)
+        self.assertEqual(sorted(zip(*self.board.coordinates())),
+                         sorted(zip(xs.tolist(), ys.tolist())))
+        self.assertTrue(numpy.array_equal(
+            self.board.packbits(), numpy.packbits(cells, axis=1, bitorder='little')))
+        self.assertTrue(numpy.array_equal(numpy.asarray(self.board, dtype=bool),
+                                          cells.astype(bool)))
+
+    def test_word_boundary(self):
+        # Blinker straddling the boundary between the first and second word.
+        grid = [[0] * 128 for _ in range(3)]
+        grid[1][63] = grid[1][64] = grid[1][65] = 1
+        board = bitboard.pack(grid)
+
+        self.assertEqual(bitboard.increment(board), 3)
+        self.assertEqual([board[y][64] for y in range(3)], [1, 1, 1])
+        self.assertEqual(board[1][63], 0)
+
+if __name__ == '__main__':
+    unittest.main()
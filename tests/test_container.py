@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, pygame
+from conway.ui import container
+
+class TestSurfaceContainer(unittest.TestCase):
+    def test_dirty(self):
+        c = container.SurfaceContainer([0, 0, 10, 20])
+        self.assertEqual(c.surface.get_size(), (10, 20))
+        self.assertEqual(c.dirty, [pygame.Rect(0, 0, 10, 20)])
+
+        c.dirty = []
+        c.add_dirty(None)
+        c.add_dirty(pygame.Rect(1, 1, 2, 2))
+        c.add_dirty([pygame.Rect(3, 3, 1, 1)])
+        self.assertEqual(c.dirty, [pygame.Rect(1, 1, 2, 2), pygame.Rect(3, 3, 1, 1)])
+
+    def test_merge_dirty(self):
+        # Two containers overlapping by a 5x10 area, each wholly dirty, and a
+        # rect inside both.
+        a = container.SurfaceContainer([0, 0, 10, 20])
+        b = container.SurfaceContainer([5, 10, 10, 20])
+        rects = [r.move(c.rect.x, c.rect.y) for c in (a, b) for r in c.dirty]
+        rects.append(pygame.Rect(6, 12, 2, 2))
+
+        merged = container.merge_dirty(rects)
+        self.assertEqual(sum(r.w * r.h for r in merged), 2 * 200 - 50)
+        for i, r in enumerate(merged):
+            self.assertEqual(r.collidelist(merged[i+1:]), -1)
+        cells = {(x, y) for r in rects for x in range(r.left, r.right)
+                 for y in range(r.top, r.bottom)}
+        self.assertEqual({(x, y) for r in merged for x in range(r.left, r.right)
+                          for y in range(r.top, r.bottom)}, cells)
+
+        self.assertEqual(container.merge_dirty([]), [])
+        self.assertEqual(container.merge_dirty([pygame.Rect(1, 2, 3, 4)] * 2),
+                         [pygame.Rect(1, 2, 3, 4)])
+
+if __name__ == '__main__':
+    unittest.main()
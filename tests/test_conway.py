@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, random, functools
+import numpy
+from conway import conway
+from conway.tiles import tilemap
+from conway.engines import vectorized, bitboard, active, sparse
+
+class TestSeedMethods(unittest.TestCase):
+    def test_seed(self):
+        grid = conway._seed(30, 20, 1)
+        self.assertEqual(len(grid), 20)
+        self.assertEqual(len(grid[0]), 30)
+        self.assertEqual(grid, conway._seed(30, 20, 1))
+        self.assertNotEqual(grid, conway._seed(30, 20, 2))
+
+        random.seed(1)
+        grid = conway._seed(30, 20)
+        random.seed(1)
+        self.assertEqual(grid, conway._seed(30, 20))
+
+    def test_soup(self):
+        whole = numpy.vstack([rows for _, rows in conway.soup(200, 200, 3)])
+        banded = conway.soup(200, 200, 3, band=7)
+        self.assertEqual(next(banded)[0], 0)
+        self.assertEqual(next(banded)[0], 7)
+        self.assertTrue((numpy.vstack([rows for _, rows in conway.soup(200, 200, 3, band=7)])
+                         == whole).all())
+        self.assertAlmostEqual(whole.mean(), 0.233, delta=0.01)
+
+    def test_uniform(self):
+        whole = numpy.vstack([rows for _, rows in conway.uniform(200, 200, 0.1, 4)])
+        banded = numpy.vstack([rows for _, rows in conway.uniform(200, 200, 0.1, 4, 9)])
+        self.assertTrue((whole == banded).all())
+        self.assertAlmostEqual(whole.mean(), 0.1, delta=0.01)
+
+    def test_stamp(self):
+        grid = [[0] * 5 for _ in range(4)]
+        conway.stamp(grid, [[1, 1], [0, 1]], (3, 2))
+        self.assertEqual(grid[2], [0, 0, 0, 1, 1])
+        self.assertEqual(grid[3], [0, 0, 0, 0, 1])
+
+        with self.assertRaises(ValueError):
+            conway.stamp(grid, [[1, 1]], (4, 0))
+
+class TestStateMethods(unittest.TestCase):
+    def test_init(self):
+        state = conway.State(10, 8, seed=5)
+        self.assertEqual(state.conway, conway._seed(10, 8, 5))
+        self.assertEqual(state.living, sum(map(sum, state.conway)))
+        self.assertEqual(state.generations, 1)
+
+        state = conway.State(3, 3, [[0, 1, 0], [0, 1, 0], [0, 1, 0]])
+        self.assertEqual(state.living, 3)
+        state.inc_generation(5)
+        self.assertEqual(state.generations, 6)
+
+    def test_cycles(self):
+        grid = [[0] * 8 for _ in range(8)]
+        conway.stamp(grid, [[1, 1, 1]], (2, 4))
+        state = conway.State(8, 8, grid)
+        self.assertEqual(state.period, 0)
+
+        state.track_cycles()
+        conway.update(state, None, colorizer=lambda conway, color_grid: None)
+        self.assertEqual(state.period, 0)
+        conway.update(state, None, colorizer=lambda conway, color_grid: None)
+        self.assertEqual(state.period, 2)
+
+        # The board was hashed from scratch, with no changes reported.
+        fresh = conway.Cycles(8, 8)
+        fresh.update(state.conway, 0)
+        self.assertEqual(fresh.hash, state.cycles.hash)
+
+        state.inc_generation(4)
+        self.assertEqual(state.period, 0)
+        self.assertEqual(state.cycles.found, (3, 2))
+
+    def test_cycles_history(self):
+        cycles = conway.Cycles(4, 4, history=2)
+        block = numpy.zeros((4, 4), dtype=numpy.uint8)
+        block[1:3, 1:3] = 1
+        self.assertEqual(cycles.update(block, 1), 0)
+        self.assertEqual(cycles.update(block, 2), 1)
+        cycles.update(numpy.zeros((4, 4)), 3)
+        cycles.update(numpy.ones((4, 4)), 4)
+        self.assertEqual(cycles.update(block, 5), 0)
+
+    def test_cycles_keys(self):
+        grid = numpy.zeros((6, 6), dtype=numpy.uint8)
+        grid[2, 1:4] = 1
+        dense = conway.Cycles(6, 6)
+        dense.update(grid, 1)
+
+        # A universe is hashed by where its cells are, whatever its view.
+        universe = sparse.SparseUniverse(grid.tolist())
+        universe.move_view(-3, 2)
+        unbounded = conway.Cycles(6, 6)
+        unbounded.update(universe, 1)
+        self.assertEqual(unbounded.hash, dense.hash)
+
+        dense.flip(numpy.array([1, 3, 2, 2]), numpy.array([2, 2, 1, 3]))
+        self.assertEqual(dense.update(None, 2), 0)
+        fresh = conway.Cycles(6, 6)
+        fresh.update(grid.T, 2)
+        self.assertEqual(fresh.hash, dense.hash)
+        self.assertNotEqual(conway.Cycles(6, 6, seed=1).keys([1], [2])[0],
+                            dense.keys([1], [2])[0])
+
+    def test_cycles_engines(self):
+        # Every engine reporting its changes keeps the hash of the board.
+        random.seed(2)
+        grid = [[random.randint(0, 1) for _ in range(70)] for _ in range(20)]
+        table = conway.Rule('highlife').table
+        for name in ('python', 'numpy', 'bitboard', 'active', 'sparse'):
+            state = conway.State(70, 20, [row[:] for row in grid], rule='highlife')
+            state.track_cycles()
+            flip = state.cycles.flip
+            if name == 'python':
+                engine = functools.partial(conway.increment, rule=state.rule, on_change=flip)
+            elif name == 'numpy':
+                state.conway = vectorized.as_array(state.conway)
+                engine = functools.partial(vectorized.increment, table=table, on_change=flip)
+            elif name == 'bitboard':
+                state.conway = bitboard.pack(state.conway)
+                engine = functools.partial(bitboard.increment, table=table, on_change=flip)
+            elif name == 'active':
+                engine = active.ActiveRegion(state.conway, table, on_change=flip)
+            else:
+                state.conway = sparse.SparseUniverse(state.conway)
+                engine = functools.partial(sparse.increment, table=table, on_change=flip)
+            for _ in range(5):
+                state.living = engine(state.conway)
+                self.assertTrue(state.cycles._flipped, name)
+                state.inc_generation()
+
+            fresh = conway.Cycles(70, 20)
+            fresh.update(state.conway, 0)
+            self.assertEqual(state.cycles.hash, fresh.hash, name)
+
+class TestRuleMethods(unittest.TestCase):
+    def test_parse(self):
+        rule = conway.Rule('B36/S23')
+        self.assertEqual(rule.birth, {3, 6})
+        self.assertEqual(rule.survival, {2, 3})
+        self.assertEqual(str(rule), 'B36/S23')
+        self.assertEqual(rule, conway.Rule('s23/b63'))
+        self.assertEqual(rule, conway.Rule('23/36'))
+        self.assertEqual(rule, conway.Rule('HighLife'))
+        self.assertEqual(str(conway.Rule('seeds')), 'B2/S')
+        self.assertEqual(conway.State(3, 3, [[0] * 3] * 3).rule, conway.life)
+
+        for notation in ('B9/S23', 'B3S23', 'life2', ''):
+            with self.assertRaises(ValueError):
+                conway.Rule(notation)
+
+    def test_table(self):
+        self.assertEqual(conway.life.lookup, [[0, 0, 0, 1, 0, 0, 0, 0, 0],
+                                              [0, 0, 1, 1, 0, 0, 0, 0, 0]])
+        self.assertTrue((conway.life.table == vectorized.life).all())
+        self.assertFalse(conway.life.table.flags.writeable)
+
+    def test_increment(self):
+        # Six living neighbors give a birth in HighLife but not in Life.
+        grid = [[0] * 5 for _ in range(5)]
+        conway.stamp(grid, [[1, 1, 1], [1, 0, 1], [0, 1, 0]], (1, 1))
+        life = [row[:] for row in grid]
+        conway.increment(life)
+        conway.increment(grid, conway.Rule('highlife'))
+        self.assertEqual(life[2][2], 0)
+        self.assertEqual(grid[2][2], 1)
+
+        state = conway.State(3, 3, [[1, 0, 0], [0, 0, 0], [0, 0, 0]], rule='B1/S')
+        conway.update(state, None, colorizer=lambda conway, color_grid: None)
+        self.assertEqual(state.conway, [[0, 1, 0], [1, 1, 0], [0, 0, 0]])
+
+class TestBoundaryMethods(unittest.TestCase):
+    def test_torus(self):
+        # A glider crosses every edge and is back where it started after
+        # moving one cell diagonally every four generations.
+        grid = [[0] * 6 for _ in range(5)]
+        conway.stamp(grid, [[0, 1, 0], [0, 0, 1], [1, 1, 1]], (3, 2))
+        start = [row[:] for row in grid]
+        for _ in range(4 * 30):
+            self.assertEqual(conway.increment(grid, boundary='torus'), 5)
+        self.assertEqual(grid, start)
+
+    def test_reflect(self):
+        # A domino on the edge and its mirror image beyond it make a block.
+        grid = [[0, 0, 1, 1, 0, 0], [0] * 6, [0] * 6]
+        self.assertEqual(conway.increment(grid), 0)
+
+        grid = [[0, 0, 1, 1, 0, 0], [0] * 6, [0] * 6]
+        for _ in range(3):
+            self.assertEqual(conway.increment(grid, boundary='reflect'), 2)
+        self.assertEqual(grid[0], [0, 0, 1, 1, 0, 0])
+
+    def test_state(self):
+        state = conway.State(3, 3, [[0] * 3] * 3, boundary='torus')
+        self.assertEqual(state.boundary, 'torus')
+        with self.assertRaises(ValueError):
+            conway.State(3, 3, [[0] * 3] * 3, boundary='klein')
+        with self.assertRaises(ValueError):
+            conway.increment([[0]], boundary='klein')
+
+class TestColorMethods(unittest.TestCase):
+    def test_palette(self):
+        lut = conway.palette()
+        self.assertEqual(lut.shape, (105 + 255 + 255 + 2, 4))
+        self.assertEqual(tuple(lut[0]), conway.dead_cell)
+        self.assertEqual(tuple(lut[1]), conway.living_cell)
+        self.assertEqual(tuple(lut[107]), (255, 1, 0, 0))
+        self.assertEqual(tuple(lut[-1]), (255, 255, 255, 0))
+
+    def test_matches_colorize(self):
+        grid = [[0] * 12 for _ in range(12)]
+        conway.stamp(grid, [[1, 1], [1, 1]], (1, 1))
+        conway.stamp(grid, [[1, 1, 1]], (6, 8))
+        arr = vectorized.as_array(grid)
+
+        tm = tilemap.TileMap(12, 12, 1, [1, 1], conway.dead_cell)
+        lut = conway.palette()
+        ages = numpy.zeros((12, 12), dtype=numpy.uint16)
+
+        for _ in range(120):
+            conway.colorize(arr, tm)
+            conway.age(arr, ages, len(lut) - 1)
+            vectorized.increment(arr)
+
+        colors = [[tuple(t.color) for t in row] for row in tm.get_current_chunk()]
+        self.assertEqual(conway.pixels(ages, lut).tolist(),
+                         [[list(c) for c in row] for row in colors])
+        self.assertEqual(ages[2, 2], 120)
+
+if __name__ == '__main__':
+    unittest.main()
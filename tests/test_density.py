@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+import numpy
+from conway.tiles import density
+
+class TestDensityLevelsMethods(unittest.TestCase):
+    def setUp(self):
+        self.levels = density.DensityLevels(5, 3)
+
+    def test_init(self):
+        self.assertEqual(self.levels.size, [5, 3])
+        self.assertEqual(self.levels.depth, 3)
+        self.assertEqual(self.levels.level(1).shape, (2, 3))
+        self.assertEqual(self.levels.level(3).shape, (1, 1))
+        self.assertEqual(self.levels.level(1).dtype, numpy.uint8)
+        self.assertEqual(density.DensityLevels(300, 1).level(4).dtype, numpy.uint16)
+        self.assertRaises(ValueError, self.levels.level, 4)
+
+    def test_reset(self):
+        alive = numpy.ones((3, 5), dtype=bool)
+        self.levels.reset(alive)
+        self.assertEqual(self.levels.level(1).tolist(), [[4, 4, 2], [2, 2, 1]])
+        self.assertEqual(self.levels.level(2).tolist(), [[12, 3]])
+        self.assertEqual(self.levels.level(3).tolist(), [[15]])
+
+    def test_update(self):
+        rng = numpy.random.RandomState(1)
+        levels = density.DensityLevels(37, 23)
+        was_alive = numpy.zeros((23, 37), dtype=bool)
+        for _ in range(10):
+            alive = was_alive.copy()
+            flips = rng.randint(0, 37 * 23, 20)
+            alive.flat[flips] = ~alive.flat[flips]
+            levels.update(alive, was_alive)
+            was_alive = alive
+
+        expected = density.DensityLevels(37, 23)
+        expected.reset(was_alive)
+        for k in range(1, levels.depth + 1):
+            self.assertEqual(levels.level(k).tolist(), expected.level(k).tolist())
+
+        # Most of the grid changing rebuilds the levels.
+        alive = ~was_alive
+        levels.update(alive, was_alive)
+        self.assertEqual(int(levels.level(levels.depth).sum()), int(alive.sum()))
+
+if __name__ == '__main__':
+    unittest.main()
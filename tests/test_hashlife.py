@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, random
+from conway import conway
+from conway.engines import hashlife, vectorized
+
+class TestHashLifeMethods(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+        self.grid = [[0] * 64 for _ in range(64)]
+        for y in range(24, 40):
+            for x in range(24, 40):
+                self.grid[y][x] = random.randint(0, 1)
+
+    def test_load_window(self):
+        universe = hashlife.Universe()
+        universe.load(self.grid)
+        self.assertEqual(universe.window(0, 0, 64, 64), self.grid)
+        self.assertEqual(universe.population, sum(map(sum, self.grid)))
+
+    def test_advance_matches_vectorized(self):
+        arr = vectorized.as_array(self.grid)
+        universe = hashlife.Universe()
+        universe.load(self.grid)
+
+        for generations in (1, 2, 3, 2):
+            for _ in range(generations):
+                vectorized.increment(arr)
+            universe.advance(generations)
+            self.assertEqual(universe.window(0, 0, 64, 64), vectorized.as_list(arr))
+        self.assertEqual(universe.generations, 8)
+
+    def test_collect(self):
+        arr = vectorized.as_array(self.grid)
+        universe = hashlife.Universe(max_nodes=50)
+        universe.load(self.grid)
+
+        for _ in range(5):
+            vectorized.increment(arr)
+            universe.advance(1)
+        self.assertEqual(universe.window(0, 0, 64, 64), vectorized.as_list(arr))
+
+    def test_glider(self):
+        universe = hashlife.Universe()
+        universe.load([[0, 1, 0],
+                       [0, 0, 1],
+                       [1, 1, 1]])
+        universe.advance(4096)
+
+        self.assertEqual(universe.population, 5)
+        self.assertEqual(universe.window(1024, 1024, 3, 3), [[0, 1, 0],
+                                                             [0, 0, 1],
+                                                             [1, 1, 1]])
+        with self.assertRaises(ValueError):
+            universe.advance(-1)
+
+    def test_advance_state(self):
+        random.seed(4)
+        state = conway.State(16, 16)
+        state.conway = [[0] * 16 for _ in range(16)]
+        state.conway[1][1:4] = [1, 1, 1]
+
+        universe = hashlife.advance(state, 3)
+        self.assertEqual(state.generations, 4)
+        self.assertEqual(state.living, 3)
+        self.assertEqual([state.conway[y][2] for y in range(0, 3)], [1, 1, 1])
+
+        hashlife.advance(state, 1, universe)
+        self.assertEqual(state.conway[1][1:4], [1, 1, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+import numpy
+from conway import conway, history
+from conway.engines import bitboard
+
+class TestHistoryMethods(unittest.TestCase):
+    def setUp(self):
+        self.boards = [numpy.array(conway._seed(40, 30, 1), dtype=numpy.uint8)]
+        for _ in range(20):
+            board = self.boards[-1].tolist()
+            conway.increment(board)
+            self.boards.append(numpy.array(board, dtype=numpy.uint8))
+
+    def test_get(self):
+        past = history.History(keyframe_interval=8)
+        for generation, board in enumerate(self.boards, 1):
+            past.record(board, generation)
+
+        self.assertEqual((past.oldest, past.newest), (1, 21))
+        self.assertEqual(len(past), 21)
+        for generation, board in enumerate(self.boards, 1):
+            self.assertTrue(numpy.array_equal(past.get(generation), board))
+        with self.assertRaises(KeyError):
+            past.get(22)
+
+        # Deltas are never larger than keyframes.
+        self.assertLessEqual(past.nbytes, 21 * self.boards[0].size // 8)
+
+    def test_packed(self):
+        # Boards that pack their own rows are recorded the same as arrays.
+        past = history.History(keyframe_interval=8)
+        for generation, board in enumerate(self.boards, 1):
+            past.record(bitboard.pack(board), generation)
+
+        for generation, board in enumerate(self.boards, 1):
+            self.assertTrue(numpy.array_equal(past.get(generation), board))
+
+    def test_sparse_deltas(self):
+        grid = [[0] * 64 for _ in range(64)]
+        conway.stamp(grid, [[0, 1, 0], [0, 0, 1], [1, 1, 1]], (1, 1))
+        past = history.History(keyframe_interval=32)
+        for generation in range(1, 33):
+            past.record(grid, generation)
+            conway.increment(grid)
+
+        # A glider flips a handful of cells, stored as indices.
+        self.assertLess(past.nbytes, 64 * 64 // 8 + 31 * 8 * 4)
+
+    def test_rewind(self):
+        past = history.History(keyframe_interval=8)
+        for generation, board in enumerate(self.boards[:15], 1):
+            past.record(board, generation)
+
+        past.record(self.boards[0], 11)
+        self.assertEqual(past.newest, 11)
+        self.assertTrue(numpy.array_equal(past.get(10), self.boards[9]))
+        self.assertTrue(numpy.array_equal(past.get(11), self.boards[0]))
+
+        past.record(self.boards[1], 12)
+        self.assertTrue(numpy.array_equal(past.get(12), self.boards[1]))
+
+    def test_memory(self):
+        past = history.History(keyframe_interval=4, memory=1)
+        for generation, board in enumerate(self.boards, 1):
+            past.record(board, generation)
+
+        # Only the newest segment is kept.
+        self.assertEqual((past.oldest, past.newest), (21, 21))
+        self.assertNotIn(20, past)
+        self.assertTrue(numpy.array_equal(past.get(21), self.boards[20]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,41 @@ class TestLabelMethods(unittest.TestCase):
         self.l.text = "Goodbye world"
         self.assertEqual(self.l.text, "Goodbye world")
 
+    def test_draw(self):
+        surface = pygame.Surface((200, 50))
+        rect = self.l.draw(surface)
+        self.assertEqual(rect.topleft, (0, 0))
+        self.assertEqual(rect.size, self.font.size("Hello World"))
+        self.assertIsNone(self.l.draw(surface))
+
+        self.l.text = "Hi"
+        self.assertEqual(self.l.draw(surface).size, self.font.size("Hello World"))
+
+    def test_unchanged_text(self):
+        surface = pygame.Surface((200, 50))
+        self.l.draw(surface)
+        self.l.text = "Hello World"
+        self.assertIsNone(self.l.draw(surface))
+
+    def test_glyphs(self):
+        surface = pygame.Surface((200, 50))
+        self.l.foreground = pygame.Color('white')
+        self.l.text = "120.5"
+        width = sum(m[4] for m in self.font.metrics("120.5"))
+        self.assertEqual(self.l.draw(surface).size, (width, self.font.size("120.5")[1]))
+        self.assertIs(label.atlas(self.font, 1, pygame.Color('white')),
+                      label.atlas(self.font, 1, pygame.Color('white')))
+
+        # The glyphs are drawn at their advances.
+        expected = pygame.Surface((200, 50))
+        expected.fill(pygame.Color('black'))
+        x = 0
+        for c in "120.5":
+            expected.blit(self.font.render(c, 1, pygame.Color('white')), (x, 0))
+            x += self.font.metrics(c)[0][4]
+        self.assertEqual(pygame.image.tostring(surface, 'RGB'),
+                         pygame.image.tostring(expected, 'RGB'))
+
     def test_foreground(self):
         self.assertEqual(self.l.foreground, pygame.Color('black'))
         self.l.foreground = pygame.Color('red')
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, random, tempfile, os
+from conway import conway
+from conway.engines import mapped
+
+class TestMappedMethods(unittest.TestCase):
+    def setUp(self):
+        random.seed(1)
+        self.grid = [[random.randint(0, 1) for _ in range(130)] for _ in range(20)]
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'board.cwl')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_create(self):
+        for packed in (False, True):
+            board = mapped.create(self.path, self.grid, packed=packed, generation=7)
+            self.assertEqual((board.width, board.height), (130, 20))
+            self.assertEqual(board.packed, packed)
+            self.assertEqual(board.generation, 7)
+            self.assertEqual(board.rule, 'B3/S23')
+            self.assertEqual(board[4], self.grid[4])
+            self.assertEqual(board.count(), sum(map(sum, self.grid)))
+            board.close()
+
+    def test_increment_matches_python(self):
+        for packed in (False, True):
+            grid = [row[:] for row in self.grid]
+            board = mapped.create(self.path, grid, packed=packed)
+            for _ in range(5):
+                living = conway.increment(grid)
+                self.assertEqual(mapped.increment(board, band=3), living)
+                self.assertEqual([board[y] for y in range(len(board))], grid)
+            self.assertEqual(board.generation, 5)
+            board.close()
+
+    def test_increment_boundaries(self):
+        for packed in (False, True):
+            for boundary in ('torus', 'reflect'):
+                grid = [row[:] for row in self.grid]
+                board = mapped.create(self.path, grid, packed=packed)
+                for _ in range(3):
+                    living = conway.increment(grid, boundary=boundary)
+                    self.assertEqual(mapped.increment(board, band=7, boundary=boundary),
+                                     living)
+                    self.assertEqual([board[y] for y in range(len(board))], grid)
+                board.close()
+
+    def test_window_read_only(self):
+        board = mapped.create(self.path, self.grid, packed=True)
+        mapped.increment(board)
+        board.flush()
+
+        reader = mapped.MappedBoard(self.path, mode='r')
+        self.assertEqual(reader.generation, 1)
+        self.assertEqual(reader.window(60, 5, 10, 4),
+                         [board[y][60:70] for y in range(5, 9)])
+        reader.close()
+        board.close()
+
+    def test_not_a_board(self):
+        with open(self.path, 'wb') as f:
+            f.write(bytes(64))
+        with self.assertRaises(ValueError):
+            mapped.MappedBoard(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
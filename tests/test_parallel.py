@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, random
+from conway.engines import parallel, vectorized
+
+class TestParallelStepperMethods(unittest.TestCase):
+    def setUp(self):
+        random.seed(6)
+        self.grid = [[random.randint(0, 1) for _ in range(37)] for _ in range(29)]
+        self.stepper = parallel.ParallelStepper(self.grid, processes=3)
+
+    def test_init(self):
+        self.assertEqual(self.stepper.processes, 3)
+        self.assertEqual(self.stepper.conway.tolist(), self.grid)
+
+    def test_matches_vectorized(self):
+        arr = vectorized.as_array(self.grid)
+
+        self.assertEqual(self.stepper(), vectorized.increment(arr))
+        self.assertEqual(self.stepper.conway.tolist(), arr.tolist())
+
+        for _ in range(9):
+            living = vectorized.increment(arr)
+        self.assertEqual(self.stepper.run(9), living)
+        self.assertEqual(self.stepper.conway.tolist(), arr.tolist())
+
+    def test_boundaries(self):
+        for boundary in ('torus', 'reflect'):
+            arr = vectorized.as_array(self.grid)
+            stepper = parallel.ParallelStepper(self.grid, processes=3, boundary=boundary)
+            for _ in range(4):
+                living = vectorized.increment(arr, boundary=boundary)
+            self.assertEqual(stepper.run(4), living)
+            self.assertEqual(stepper.conway.tolist(), arr.tolist())
+            stepper.close()
+
+    def test_no_rows(self):
+        with self.assertRaises(ValueError):
+            parallel.ParallelStepper([])
+
+    def tearDown(self):
+        self.stepper.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, random, io, os, tempfile
+import numpy
+from conway import patterns
+from conway.engines import mapped
+
+GLIDER_RLE = """#N Glider
+#C A comment.
+x = 3, y = 3, rule = B3/S23
+bob$2bo$3o!
+"""
+
+GLIDER_CELLS = """!Name: Glider
+.O
+..O
+OOO
+"""
+
+GLIDER = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+
+class TestPatternMethods(unittest.TestCase):
+    def test_read_rle(self):
+        pattern = patterns.read(io.StringIO(GLIDER_RLE))
+        self.assertEqual((pattern.width, pattern.height), (3, 3))
+        self.assertEqual(pattern.rule, 'B3/S23')
+        self.assertEqual(pattern.name, 'Glider')
+        self.assertEqual(patterns.load(pattern, [[0] * 3 for _ in range(3)]), GLIDER)
+
+    def test_read_plaintext(self):
+        pattern = patterns.read(io.StringIO(GLIDER_CELLS))
+        self.assertEqual((pattern.width, pattern.height), (3, 3))
+        self.assertEqual(pattern.name, 'Glider')
+        grid = patterns.load(pattern, numpy.zeros((5, 6), dtype=numpy.uint8), (2, 1))
+        self.assertEqual(grid[1:4, 2:5].tolist(), GLIDER)
+        self.assertEqual(int(grid.sum()), 5)
+
+    def test_load_errors(self):
+        pattern = patterns.read(io.StringIO(GLIDER_RLE))
+        with self.assertRaises(ValueError):
+            patterns.load(pattern, [[0] * 3 for _ in range(3)], (1, 0))
+        with self.assertRaises(ValueError):
+            patterns.Pattern(io.StringIO("#C no header\n"), True)
+        with self.assertRaises(ValueError):
+            list(patterns.read(io.StringIO("x = 2, y = 1\n3o!\n")).rows())
+        with self.assertRaises(ValueError):
+            list(patterns.read(io.StringIO("x = 3, y = 1\nozo!\n")).rows())
+
+    def test_plaintext_trailing_rows(self):
+        pattern = patterns.read(io.StringIO(GLIDER_CELLS + "\n\n  \n"))
+        self.assertEqual((pattern.width, pattern.height), (3, 3))
+        self.assertEqual(patterns.load(pattern, [[0] * 3 for _ in range(3)]), GLIDER)
+
+        # Empty rows between living ones still count.
+        pattern = patterns.read(io.StringIO("O\n\nO\n\n"))
+        self.assertEqual((pattern.width, pattern.height), (1, 3))
+
+    def test_rle_line_length(self):
+        # Rows of alternating cells after a run of two, so the last line can
+        # end at any length.
+        for width in range(60, 80):
+            f = io.StringIO()
+            patterns.write_rle(f, [[1] + [(x + 1) % 2 for x in range(width)]])
+            self.assertTrue(all(len(line) <= patterns.line_length
+                                for line in f.getvalue().splitlines()), width)
+
+    def test_round_trip(self):
+        random.seed(1)
+        grid = [[random.randint(0, 1) for _ in range(150)] for _ in range(20)]
+        grid[0] = [0] * 150
+        grid[7] = [0] * 150
+        grid[-1] = [0] * 150
+
+        for write in (patterns.write_rle, patterns.write_plaintext):
+            f = io.StringIO()
+            write(f, grid)
+            f.seek(0)
+            pattern = patterns.read(f)
+            if write is patterns.write_rle:
+                self.assertTrue(all(len(line) <= patterns.line_length
+                                    for line in f.getvalue().splitlines()))
+            else:
+                # Plaintext does not record trailing dead rows.
+                self.assertEqual(pattern.height, 19)
+                pattern.height = 20
+            self.assertEqual(patterns.load(pattern, [[0] * 150 for _ in range(20)]), grid)
+
+    def test_load_mapped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            board = mapped.empty(os.path.join(tmp, 'board.cwl'), 100, 50, packed=True)
+            patterns.load(patterns.read(io.StringIO(GLIDER_RLE)), board, (70, 10))
+            self.assertEqual(board.window(70, 10, 3, 3), GLIDER)
+            self.assertEqual(board.count(), 5)
+            board.close()
+
+if __name__ == '__main__':
+    unittest.main()
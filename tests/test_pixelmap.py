@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+import pygame
+from conway import conway, camera
+from conway.tiles import pixelmap
+
+class TestPixelMapMethods(unittest.TestCase):
+    def setUp(self):
+        self.grid = [[0, 1, 0],
+                     [0, 1, 0],
+                     [0, 1, 0]]
+        self.pm = pixelmap.PixelMap(3, 3, [4, 4], conway.palette())
+        self.cam = camera.Camera([0, 0], [12, 12])
+
+    def test_init(self):
+        self.assertEqual(self.pm.size, [3, 3])
+        self.assertEqual(self.pm.tile_size, [4, 4])
+        self.assertEqual(self.pm.ages.shape, (3, 3))
+        self.assertEqual(self.pm.buffer.shape, (3, 3, 4))
+        self.assertEqual(self.pm.changed.shape, (3, 3))
+
+    def test_colorize_render(self):
+        conway.colorize_pixels(self.grid, self.pm)
+        self.assertEqual(self.pm.ages.tolist(), self.grid)
+        self.assertEqual(tuple(self.pm.buffer[0, 1, :3]), conway.living_cell[:3])
+        self.assertTrue(self.pm.redraw)
+
+        surface = pygame.Surface((12, 12))
+        self.pm.render(surface, self.cam)
+        self.assertFalse(self.pm.redraw)
+        self.assertEqual(surface.get_at((5, 10))[:3], conway.living_cell[:3])
+        self.assertEqual(surface.get_at((1, 1))[:3], conway.dead_cell[:3])
+
+    def test_render_camera(self):
+        conway.colorize_pixels(self.grid, self.pm)
+        surface = pygame.Surface((12, 12))
+        self.cam.move([4, 0])
+        self.pm.render(surface, self.cam)
+
+        self.assertEqual(surface.get_at((1, 1))[:3], conway.living_cell[:3])
+        self.assertEqual(surface.get_at((5, 1))[:3], conway.dead_cell[:3])
+
+    def test_render_dirty(self):
+        surface = pygame.Surface((12, 12))
+        conway.colorize_pixels(self.grid, self.pm)
+        self.assertEqual(self.pm.render(surface, self.cam), [pygame.Rect(0, 0, 12, 12)])
+        self.assertEqual(self.pm.render(surface, self.cam), [])
+
+        # Horizontal blinker phase: the middle column ages, the ends change.
+        conway.colorize_pixels([[0, 0, 0], [1, 1, 1], [0, 0, 0]], self.pm)
+        self.assertEqual(self.pm.render(surface, self.cam), [pygame.Rect(0, 0, 12, 12)])
+
+        conway.colorize_pixels([[0, 0, 0], [1, 1, 1], [0, 0, 0]], self.pm)
+        self.assertEqual(self.pm.render(surface, self.cam), [pygame.Rect(0, 4, 12, 4)])
+        self.assertFalse(self.pm.changed.any())
+
+    def test_render_density(self):
+        pm = pixelmap.PixelMap(8, 8, [1, 1], conway.palette())
+        grid = [[1] * 4 + [0] * 4 for _ in range(8)]
+        grid[0][4] = 1
+        self.assertEqual(pm.level_for(1.0), 0)
+        self.assertEqual(pm.level_for(0.3), 1)
+        self.assertEqual(pm.level_for(0.25), 2)
+
+        # The first render asks for the level of the zoom.
+        surface = pygame.Surface((4, 4))
+        cam = camera.Camera([0, 0], [4, 4], 0.5)
+        conway.colorize_pixels(grid, pm)
+        pm.render(surface, cam)
+        self.assertEqual(pm.level, 1)
+
+        conway.colorize_pixels(grid, pm)
+        self.assertEqual(pm.density.level(1)[0].tolist(), [4, 4, 1, 0])
+        self.assertEqual(pm.colors.counts.tolist(), pm.density.level(1).tolist())
+        self.assertEqual(pm.render(surface, cam), [pygame.Rect(0, 0, 4, 4)])
+        self.assertEqual(surface.get_at((0, 3))[:3], conway.living_cell[:3])
+        self.assertEqual(surface.get_at((3, 0))[:3], conway.dead_cell[:3])
+        self.assertEqual(surface.get_at((2, 0))[:3], tuple(pm.density_lut[64][:3]))
+
+    def test_colorize_density(self):
+        pm = pixelmap.PixelMap(8, 8, [1, 1], conway.palette())
+        grid = [[1] * 4 + [0] * 4 for _ in range(8)]
+        conway.colorize_pixels(grid, pm)
+        conway.colorize_pixels(grid, pm)
+        self.assertEqual(int(pm.ages[0, 0]), 2)
+
+        # Zoomed out, only the density levels follow the cells.
+        pm.level = 1
+        grid[0][4] = 1
+        pm.changed[...] = False
+        conway.colorize_pixels(grid, pm)
+        self.assertFalse(pm.aged)
+        self.assertEqual(int(pm.ages[0, 4]), 0)
+        self.assertFalse(pm.changed.any())
+        self.assertEqual(pm.colors.counts[0].tolist(), [4, 4, 1, 0])
+
+        # Zoomed back in, ages start over and every cell is redrawn.
+        pm.level = 0
+        conway.colorize_pixels(grid, pm)
+        self.assertTrue(pm.aged)
+        self.assertEqual(pm.ages.tolist(), grid)
+        self.assertTrue(pm.changed.all())
+        self.assertEqual(pm.density.level(1)[0].tolist(), [4, 4, 1, 0])
+
+if __name__ == '__main__':
+    unittest.main()
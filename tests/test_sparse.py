@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, random
+import numpy
+from conway import conway, worker
+from conway.engines import sparse, vectorized
+from conway.tiles import pixelmap
+
+class TestSparseMethods(unittest.TestCase):
+    def setUp(self):
+        self.glider = [[0, 1, 0],
+                       [0, 0, 1],
+                       [1, 1, 1]]
+        self.universe = sparse.SparseUniverse(self.glider)
+
+    def test_init(self):
+        self.assertEqual(self.universe.population, 5)
+        self.assertEqual(self.universe.view, [0, 0, 3, 3])
+        self.assertEqual(len(self.universe), 3)
+        self.assertEqual([self.universe[y] for y in range(3)], self.glider)
+        self.assertEqual(self.universe.bounds(), [0, 0, 3, 3])
+
+    def test_array(self):
+        self.universe.move_view(1, 1)
+        self.assertEqual(numpy.asarray(self.universe).tolist(),
+                         [[0, 1, 0], [1, 1, 0], [0, 0, 0]])
+        self.assertEqual(numpy.asarray(self.universe, dtype=bool).dtype, bool)
+        self.assertRaises(IndexError, self.universe.__getitem__, 3)
+        self.assertEqual(len(list(self.universe)), 3)
+
+    def test_gui_startup(self):
+        # The steps __main__ takes with the default pixels renderer.
+        state = conway.State(3, 3, self.glider)
+        state.conway = sparse.SparseUniverse(state.conway)
+        pm = pixelmap.PixelMap(3, 3, [4, 4], conway.palette())
+        conway.colorize_pixels(state.conway, pm)
+        self.assertEqual(pm.ages.tolist(), self.glider)
+
+        stepper = worker.SteppingWorker(state, sparse.increment)
+        try:
+            stepper.publish()
+            self.assertEqual(stepper.latest().cells.tolist(), self.glider)
+            stepper.request()
+            stepper.wait()
+            self.assertEqual(stepper.latest().living, 5)
+        finally:
+            stepper.close()
+
+    def test_unbounded(self):
+        for _ in range(400):
+            sparse.increment(self.universe)
+
+        self.assertEqual(self.universe.population, 5)
+        self.assertEqual(self.universe.bounds(), [100, 100, 3, 3])
+        self.assertEqual(self.universe.window(100, 100, 3, 3), self.glider)
+
+        self.universe.move_view(100, 100)
+        self.assertEqual([self.universe[y] for y in range(3)], self.glider)
+
+    def test_increment_matches_vectorized(self):
+        random.seed(5)
+        grid = [[0] * 40 for _ in range(40)]
+        for y in range(15, 25):
+            for x in range(15, 25):
+                grid[y][x] = random.randint(0, 1)
+        arr = vectorized.as_array(grid)
+        universe = sparse.SparseUniverse(grid)
+
+        for _ in range(5):
+            living = vectorized.increment(arr)
+            self.assertEqual(sparse.increment(universe), living)
+            self.assertEqual(universe.window(0, 0, 40, 40), vectorized.as_list(arr))
+
+    def test_rules(self):
+        universe = sparse.SparseUniverse([[1, 0, 0], [0, 0, 0], [0, 0, 1]])
+        table = vectorized.life.copy()
+        table[1, 0] = 1
+        self.assertEqual(sparse.increment(universe, table), 2)
+
+        table[0, 0] = 1
+        with self.assertRaises(ValueError):
+            sparse.increment(universe, table)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,7 +26,32 @@ class TestTileMethods(unittest.TestCase):
 
         self.t1.color = [0,0,0,0]
         self.assertEqual(self.t1.color, pygame.Color(0,0,0,0))
+        self.assertEqual(self.t1.key, (0,0,0,0))
         self.assertEqual(self.t1.redraw, True)
 
+    def test_shared_surface(self):
+        t4 = tile.Tile([32,32], [100, 100, 100, 0])
+        self.assertIs(self.t3.image, t4.image)
+        self.assertIsNot(self.t2.image, t4.image)
+        self.assertEqual(t4.image.get_at((0, 0))[:3], (100, 100, 100))
+
+        with self.assertRaises(AttributeError):
+            t4.surface = None
+
+class TestSurfaceCacheMethods(unittest.TestCase):
+    def test_eviction(self):
+        cache = tile.SurfaceCache(2)
+        red = cache.get((4, 4), (255, 0, 0, 0))
+        green = cache.get((4, 4), (0, 255, 0, 0))
+        self.assertIs(cache.get((4, 4), (255, 0, 0, 0)), red)
+
+        cache.get((4, 4), (0, 0, 255, 0))
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get((4, 4), (255, 0, 0, 0)), red)
+        self.assertIsNot(cache.get((4, 4), (0, 255, 0, 0)), green)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import unittest
+import unittest, tempfile, os
+import pygame
+from conway import camera
 from conway.tiles import tilemap, tile
 
 class TestTileMapMethods(unittest.TestCase):
@@ -25,6 +27,84 @@ class TestTileMapMethods(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.tilemap.current_chunk = 3
 
+    def test_lazy_chunks(self):
+        self.assertEqual(self.tilemap.loaded_chunks, [])
+        self.tilemap.get_current_chunk()
+        self.assertEqual(self.tilemap.loaded_chunks, [1])
+        self.assertEqual(len(self.tilemap.get_chunk(2)), 10)
+        self.assertEqual(self.tilemap.loaded_chunks, [1, 2])
+        self.assertIsNone(self.tilemap.get_chunk(3))
+
+    def test_eviction(self):
+        tm = tilemap.TileMap(4, 4, 5, [2, 2])
+        tm = tilemap.TileMap(4, 4, 5, [2, 2], memory_budget=tm.chunk_bytes * 2)
+        tm.get_current_chunk()
+        tm.get_chunk(2)
+        tm.get_chunk(3)
+        self.assertEqual(tm.loaded_chunks, [1, 3])
+
+        tm.current_chunk = 4
+        tm.get_chunk(5)
+        self.assertEqual(tm.loaded_chunks, [4, 5])
+
+    def test_spill(self):
+        with tempfile.TemporaryDirectory() as spill:
+            tm = tilemap.TileMap(4, 4, 3, [2, 2])
+            tm = tilemap.TileMap(4, 4, 3, [2, 2], memory_budget=tm.chunk_bytes,
+                                 spill_dir=spill)
+            tm.get_current_chunk()[1][2].color = [1, 2, 3, 4]
+            tm.current_chunk = 2
+            self.assertEqual(tm.loaded_chunks, [2])
+            self.assertTrue(os.path.exists(os.path.join(spill, "chunk-1.npy")))
+
+            tm.current_chunk = 1
+            self.assertEqual(tm.get_current_chunk()[1][2].color, pygame.Color(1, 2, 3, 4))
+            self.assertEqual(tm.get_current_chunk()[0][0].color, tilemap.default_tile_color)
+
+    def test_render(self):
+        surface = pygame.Surface((320, 320))
+        cam = camera.Camera([0, 0], [320, 320])
+
+        rects = self.tilemap.render(surface, cam)
+        self.assertEqual(rects, [pygame.Rect(x * 32, 0, 32, 320) for x in range(10)])
+        self.assertEqual(self.tilemap.render(surface, cam), [])
+
+        chunk = self.tilemap.get_current_chunk()
+        chunk[2][3].color = [0, 0, 0, 0]
+        chunk[3][3].color = [0, 0, 0, 0]
+        chunk[5][3].color = [0, 0, 0, 0]
+        self.assertEqual(self.tilemap.render(surface, cam),
+                         [pygame.Rect(96, 64, 32, 64), pygame.Rect(96, 160, 32, 32)])
+
+    def test_render_culled(self):
+        surface = pygame.Surface((320, 320))
+        cam = camera.Camera([64, 96], [128, 64])
+
+        rects = self.tilemap.render(surface, cam)
+        self.assertEqual(rects, [pygame.Rect(x * 32, 0, 32, 64) for x in range(4)])
+        self.assertTrue(self.tilemap.get_current_chunk()[0][0].redraw)
+        self.assertFalse(self.tilemap.get_current_chunk()[3][2].redraw)
+
+        # Moving the camera redraws every visible tile.
+        cam.move([32, 0])
+        rects = self.tilemap.render(surface, cam)
+        self.assertEqual(rects, [pygame.Rect(x * 32, 0, 32, 64) for x in range(4)])
+
+    def test_render_zoom(self):
+        surface = pygame.Surface((320, 320))
+        cam = camera.Camera([0, 0], [320, 320], 0.5)
+        chunk = self.tilemap.get_current_chunk()
+        chunk[9][9].color = [1, 2, 3, 255]
+
+        rects = self.tilemap.render(surface, cam)
+        self.assertEqual(rects, [pygame.Rect(x * 16, 0, 16, 160) for x in range(10)])
+        self.assertEqual(chunk[9][9].scaled((16, 16)).get_size(), (16, 16))
+        self.assertEqual(surface.get_at((150, 150))[:3], (1, 2, 3))
+        self.assertEqual(surface.get_at((170, 170))[:3], (0, 0, 0))
+
+        cam.zoom = 0
+        self.assertEqual(self.tilemap.render(surface, cam), [])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, os, json, tempfile
+from conway import timing
+
+class TestPhaseTimerMethods(unittest.TestCase):
+    def test_disabled(self):
+        timer = timing.PhaseTimer()
+        with timer.time('step'):
+            pass
+        self.assertEqual(timer.phases, [])
+        self.assertIsNone(timer.stats('step'))
+        self.assertEqual(timer.summary(), "")
+
+    def test_stats(self):
+        timer = timing.PhaseTimer(True, window=100)
+        for i in range(200):
+            timer.add('step', 0.0, i / 1000)
+        with timer.time('render'):
+            pass
+
+        self.assertEqual(timer.phases, ['step', 'render'])
+        self.assertEqual(timer.stats('step'), (0.15, 0.195, 0.199))
+        self.assertGreaterEqual(timer.stats('render')[2], 0)
+        self.assertTrue(timer.summary().startswith("step 150.0/195.0/199.0  render "))
+
+    def test_export(self):
+        timer = timing.PhaseTimer(tracing=True)
+        self.assertTrue(timer.enabled)
+        with timer.time('step'):
+            pass
+        with timer.time('draw'):
+            pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            timer.export(path)
+            with open(path) as f:
+                events = json.load(f)['traceEvents']
+            self.assertEqual([e['name'] for e in events], ['step', 'draw'])
+            self.assertTrue(all(e['ph'] == 'X' for e in events))
+            self.assertLessEqual(events[0]['ts'] + events[0]['dur'], events[1]['ts'])
+
+            path = os.path.join(directory, 'trace.jsonl')
+            timer.export(path)
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual([l['phase'] for l in lines], ['step', 'draw'])
+
+    def test_trace_limit(self):
+        timer = timing.PhaseTimer(tracing=True, trace_limit=3)
+        for i in range(5):
+            timer.add(str(i), i, i + 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            timer.export(path)
+            with open(path) as f:
+                events = json.load(f)['traceEvents']
+            self.assertEqual([e['name'] for e in events], ['2', '3', '4'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest, random
+from conway import conway
+from conway.engines import vectorized
+
+class TestVectorizedMethods(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.grid = conway._seed(24, 17)
+
+    def test_conversion(self):
+        arr = vectorized.as_array(self.grid)
+        self.assertEqual(arr.shape, (17, 24))
+        self.assertEqual(vectorized.as_list(arr), self.grid)
+
+    def test_neighbors(self):
+        arr = vectorized.as_array([[1, 1, 0],
+                                   [0, 1, 0],
+                                   [0, 0, 1]])
+        self.assertEqual(vectorized.neighbors(arr).tolist(),
+                         [[2, 2, 2], [3, 3, 3], [1, 2, 1]])
+
+    def test_increment_matches_python(self):
+        arr = vectorized.as_array(self.grid)
+        for _ in range(10):
+            living = conway.increment(self.grid)
+            self.assertEqual(vectorized.increment(arr), living)
+            self.assertEqual(vectorized.as_list(arr), self.grid)
+
+    def test_increment_boundaries(self):
+        for boundary in ('torus', 'reflect'):
+            grid = [row[:] for row in self.grid]
+            arr = vectorized.as_array(grid)
+            for _ in range(6):
+                living = conway.increment(grid, boundary=boundary)
+                self.assertEqual(vectorized.increment(arr, boundary=boundary), living)
+                self.assertEqual(vectorized.as_list(arr), grid)
+
+        with self.assertRaises(ValueError):
+            vectorized.neighbors(arr, 'klein')
+
+    def test_increment_rules(self):
+        for name in ('highlife', 'daynight', 'seeds', 'B0/S8'):
+            rule = conway.Rule(name)
+            grid = [row[:] for row in self.grid]
+            arr = vectorized.as_array(grid)
+            for _ in range(6):
+                living = conway.increment(grid, rule)
+                self.assertEqual(vectorized.increment(arr, rule.table), living)
+                self.assertEqual(vectorized.as_list(arr), grid)
+
+if __name__ == '__main__':
+    unittest.main()
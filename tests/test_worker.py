@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from conway import conway, worker
+from conway.engines import vectorized
+from conway.tiles import pixelmap
+
+class TestSteppingWorkerMethods(unittest.TestCase):
+    def setUp(self):
+        self.expected = conway._seed(40, 30, 1)
+        self.state = conway.State(40, 30, vectorized.as_array(self.expected))
+        self.steps = []
+        self.worker = worker.SteppingWorker(self.state, vectorized.increment,
+                                            lambda state: self.steps.append(state.generations))
+
+    def tearDown(self):
+        self.worker.close()
+
+    def test_request(self):
+        self.assertIsNone(self.worker.latest())
+        self.worker.request(5)
+        self.worker.request()
+        self.worker.wait()
+        self.assertTrue(self.worker.idle)
+
+        for _ in range(6):
+            living = conway.increment(self.expected)
+        frame = self.worker.latest()
+        self.assertEqual(frame.generation, 7)
+        self.assertEqual(frame.living, living)
+        self.assertEqual(frame.cells.tolist(), self.expected)
+        self.assertEqual(self.steps, [2, 3, 4, 5, 6, 7])
+        self.assertIsNone(self.worker.latest())
+
+    def test_publish(self):
+        self.worker.request(1000)
+        self.worker.wait(cancel=True)
+        self.assertLess(self.state.generations, 1000)
+        self.state.conway[...] = 0
+        self.state.living = 0
+        self.worker.publish()
+
+        frame = self.worker.latest()
+        self.assertEqual(frame.living, 0)
+        self.assertFalse(frame.cells.any())
+
+class TestSteppingWorkerColorize(unittest.TestCase):
+    def setUp(self):
+        self.grid = [[0, 0, 0, 0, 0],
+                     [0, 0, 1, 0, 0],
+                     [0, 0, 1, 0, 0],
+                     [0, 0, 1, 0, 0],
+                     [0, 0, 0, 0, 0]]
+        self.state = conway.State(5, 5, vectorized.as_array(self.grid))
+        self.pm = pixelmap.PixelMap(5, 5, [1, 1], conway.palette())
+        self.worker = worker.SteppingWorker(self.state, vectorized.increment,
+                                            colorize=conway.colorize_pixels,
+                                            pixel_map=self.pm)
+
+    def tearDown(self):
+        self.worker.close()
+
+    def test_colors(self):
+        self.worker.publish()
+        frame = self.worker.latest()
+        self.assertIsNone(frame.cells)
+        self.assertEqual(self.pm.ages.tolist(), self.grid)
+        self.assertTrue(frame.colors.changed[1:4, 2].all())
+
+        self.pm.show(frame.colors)
+        self.assertIs(self.pm.colors, frame.colors)
+        self.assertTrue(self.pm.redraw)
+
+    def test_skipped_changes(self):
+        self.state.conway[...] = 0
+        self.state.conway[0:2, 0:2] = 1
+        self.state.conway[4, 4] = 1
+        self.worker.publish()
+        self.worker.latest()
+
+        # Two generations finish before either is drawn; the lone cell dies in
+        # the first, so only the changes carried over show it.
+        self.worker.request(2)
+        self.worker.wait()
+        frame = self.worker.latest()
+        self.assertEqual(frame.generation, 3)
+        self.assertTrue(frame.colors.changed[4, 4])
+        self.assertTrue(frame.colors.changed[0:2, 0:2].all())
+        self.assertFalse(frame.colors.changed[2:4, 2:4].any())
+
+if __name__ == '__main__':
+    unittest.main()